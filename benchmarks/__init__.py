@@ -0,0 +1,4 @@
+"""
+性能計測用のベンチマークスクリプト群
+`python -m benchmarks.<モジュール名>` で実行する。
+"""
@@ -0,0 +1,100 @@
+"""
+A*の性能比較: コスト関数版 (astar) / コスト配列版 (astar_array) / CostGrid
+
+対角の2点間の長い経路に加えて、数マスだけ離れた2点間の短い経路も計測する。
+短い経路では、呼び出しごとにコスト配列全体を変換する astar_array と、
+マップが変わらない限り変換済みのコストを使い回す CostGrid の差が現れる。
+
+実行方法:
+    python -m benchmarks.bench_astar [幅x高さ ...]
+"""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.pathfinding import CostGrid, astar, astar_array
+from roguelike_rpg.domain.tile import FLOOR_ID
+
+DEFAULT_SIZES = ((80, 20), (500, 500), (2000, 2000))
+# 内側のタイルのうち壁にする割合
+WALL_RATIO = 0.2
+# 短い経路の、始点から終点までのx方向の距離
+SHORT_DISTANCE = 5
+
+
+def build_map(width: int, height: int) -> GameMap:
+    """
+    外周が壁で、内側に壁がまばらに散らばったマップを作る。
+    長い経路（対角の2点）と短い経路（中央の2点）の端点は必ず床にする。
+    """
+    rng = np.random.default_rng(width * height)
+    game_map = GameMap(width, height)
+    floor = np.zeros((width, height), dtype=bool)
+    floor[1:-1, 1:-1] = rng.random((width - 2, height - 2)) >= WALL_RATIO
+    # 始点と終点は必ず歩けるようにする
+    floor[1, 1] = floor[width - 2, height - 2] = True
+    middle_x, middle_y = width // 2, height // 2
+    floor[middle_x, middle_y] = floor[middle_x + SHORT_DISTANCE, middle_y] = True
+    game_map.set_tile_id(floor, FLOOR_ID)
+    return game_map
+
+
+def run(width: int, height: int) -> None:
+    """指定された大きさのマップで、長い経路と短い経路の探索を計測して表示する。"""
+    game_map = build_map(width, height)
+    walkable = game_map.walkable
+    grid = CostGrid()
+    grid.update(game_map)
+    middle_x, middle_y = width // 2, height // 2
+    cases = (
+        ("long", (1, 1), (width - 2, height - 2)),
+        ("short", (middle_x, middle_y), (middle_x + SHORT_DISTANCE, middle_y)),
+    )
+    repeat = 1 if width * height > 1_000_000 else 3
+    for label, start, end in cases:
+
+        def with_cost_func():
+            return astar(
+                game_map,
+                start=start,
+                end=end,
+                cost_func=lambda x, y: 1.0 if walkable[x, y] else float("inf"),
+            )
+
+        def with_cost_array():
+            return astar_array(walkable, start=start, end=end)
+
+        def with_cost_grid():
+            grid.update(game_map)
+            return grid.find_path(start, end)
+
+        path = with_cost_grid()
+        assert path == with_cost_array() == with_cost_func(), "経路が一致しません"
+        func_time = measure(with_cost_func, repeat=repeat)
+        array_time = measure(with_cost_array, repeat=repeat)
+        grid_time = measure(with_cost_grid, repeat=repeat)
+        print(
+            f"{width:>5}x{height:<5} {label:<5} "
+            f"path: {len(path) if path else 0:5} | "
+            f"astar: {func_time * 1000:10.2f} ms | "
+            f"astar_array: {array_time * 1000:10.2f} ms | "
+            f"CostGrid: {grid_time * 1000:10.2f} ms "
+            f"({func_time / grid_time:6.1f}x)"
+        )
+
+
+def main() -> None:
+    sizes = [tuple(int(v) for v in arg.split("x")) for arg in sys.argv[1:]] or list(
+        DEFAULT_SIZES
+    )
+    for width, height in sizes:
+        run(width, height)
+
+
+if __name__ == "__main__":
+    main()
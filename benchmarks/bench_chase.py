@@ -0,0 +1,95 @@
+"""
+敵の追跡処理の性能比較: 敵ごとのA*探索 / 共有ダイクストラマップ
+
+実行方法:
+    python -m benchmarks.bench_chase [敵の数 ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.dijkstra import DijkstraMap
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.pathfinding import astar
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+DEFAULT_COUNTS = (50, 500, 5000)
+MAP_WIDTH = 160
+MAP_HEIGHT = 100
+# 敵AIの視界の範囲（この範囲内の敵だけがプレイヤーを追跡する）
+SIGHT_RADIUS = 8
+# 内側のタイルのうち壁にする割合
+WALL_RATIO = 0.2
+
+
+def build_map(rng: random.Random) -> GameMap:
+    """外周が壁で、内側に壁がまばらに散らばったマップを作る。"""
+    game_map = GameMap(MAP_WIDTH, MAP_HEIGHT)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    for x in range(1, MAP_WIDTH - 1):
+        for y in range(1, MAP_HEIGHT - 1):
+            if rng.random() < WALL_RATIO:
+                game_map.tiles[x, y] = WALL_TILE
+    return game_map
+
+
+def place_enemies(
+    game_map: GameMap, player: tuple[int, int], count: int, rng: random.Random
+) -> list[tuple[int, int]]:
+    """プレイヤーの視界内の歩行可能なタイルに、敵を（重複を許して）配置する。"""
+    px, py = player
+    candidates = [
+        (x, y)
+        for x in range(px - SIGHT_RADIUS, px + SIGHT_RADIUS + 1)
+        for y in range(py - SIGHT_RADIUS, py + SIGHT_RADIUS + 1)
+        if game_map.walkable[x, y] and (x, y) != player
+    ]
+    return [rng.choice(candidates) for _ in range(count)]
+
+
+def run(count: int) -> None:
+    """指定された敵の数で、1ターン分の追跡処理を計測して表示する。"""
+    rng = random.Random(count)
+    game_map = build_map(rng)
+    player = (MAP_WIDTH // 2, MAP_HEIGHT // 2)
+    game_map.tiles[player] = FLOOR_TILE
+    enemies = place_enemies(game_map, player, count, rng)
+    walkable = game_map.walkable
+
+    def per_enemy_astar() -> None:
+        for start in enemies:
+            astar(
+                game_map,
+                start=start,
+                end=player,
+                cost_func=lambda x, y: 1.0 if walkable[x, y] else float("inf"),
+            )
+
+    def shared_dijkstra() -> None:
+        # プレイヤーが毎ターン移動する想定で、距離場の再計算も計測に含める
+        chase_map = DijkstraMap()
+        chase_map.update(game_map, player)
+        for start in enemies:
+            chase_map.next_step(*start)
+
+    astar_time = measure(per_enemy_astar, repeat=1 if count > 500 else 3)
+    dijkstra_time = measure(shared_dijkstra)
+    print(
+        f"{count:>6,} enemies | A* per enemy: {astar_time * 1000:9.2f} ms | "
+        f"Dijkstra map: {dijkstra_time * 1000:8.2f} ms "
+        f"({astar_time / dijkstra_time:5.1f}x)"
+    )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_COUNTS)
+    print(f"map: {MAP_WIDTH}x{MAP_HEIGHT}, sight radius: {SIGHT_RADIUS}")
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+大勢の敵がプレイヤーを追跡するときのストレステスト:
+敵ごとの経路探索 / 共有ダイクストラマップ / 予約表による協調経路探索
+
+「無駄なターン」は、追跡中（視界内で隣接していない）の敵が移動できなかった
+ターンの数。「再計画」は、敵ごとの経路探索では経路キャッシュのミス
+（経路を計算し直した回数）、協調経路探索では計画した移動先が実行時に
+塞がれていた回数を表す。
+
+実行方法:
+    python -m benchmarks.bench_cooperative [敵の数 ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from roguelike_rpg.application.enemy_ai_service import (
+    SIGHT_RADIUS,
+    plan_enemy_moves,
+    process_enemy_turn,
+)
+from roguelike_rpg.domain.dijkstra import DijkstraMap
+from roguelike_rpg.domain.ecs.components import HealthComponent, PositionComponent
+from roguelike_rpg.domain.ecs.world import World
+from roguelike_rpg.domain.factories import create_enemy, create_player
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.path_cache import PathCache
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+DEFAULT_COUNTS = (50, 150, 250)
+ROOM_SIZE = 41
+TURNS = 20
+MODES = ("astar+cache", "flow field", "cooperative")
+ENEMY_DATA = {
+    "name": "Goblin",
+    "char": "g",
+    "fg_color": [0, 255, 0],
+    "max_hp": 10,
+    "defense": 0,
+    "power": 0,
+}
+
+
+def build_room() -> GameMap:
+    """柱が並んだ正方形の部屋を作る。"""
+    game_map = GameMap(ROOM_SIZE, ROOM_SIZE)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    game_map.tiles[5:-5:6, 5:-5:6] = WALL_TILE
+    return game_map
+
+
+def simulate(mode: str, count: int) -> tuple[int, int | None, float]:
+    """
+    指定された方式で TURNS ターン分の敵の行動を処理する。
+
+    Returns:
+        tuple[int, int | None, float]: 無駄なターン数、再計画の回数
+            （共有ダイクストラマップでは該当しないためNone）、1ターンの平均時間。
+    """
+    rng = random.Random(count)
+    game_map = build_room()
+    world = World(columnar=True)
+    center = ROOM_SIZE // 2
+    player = create_player(world, center, center)
+    world.get_component(player, HealthComponent).current_hp = 10**9
+    cells = [
+        (x, y)
+        for x in range(center - SIGHT_RADIUS, center + SIGHT_RADIUS + 1)
+        for y in range(center - SIGHT_RADIUS, center + SIGHT_RADIUS + 1)
+        if game_map.walkable[x, y] and max(abs(x - center), abs(y - center)) > 1
+    ]
+    enemies = [
+        create_enemy(world, x, y, ENEMY_DATA) for x, y in rng.sample(cells, count)
+    ]
+
+    chase_map = DijkstraMap()
+    path_cache = PathCache()
+    player_pos = world.get_component(player, PositionComponent)
+    wasted = blocked = 0
+    elapsed = 0.0
+    for turn in range(TURNS):
+        # プレイヤーは左右に1歩ずつ行き来する
+        player_pos.x = center + (turn % 2)
+
+        before = {}
+        for enemy in enemies:
+            pos = world.get_component(enemy, PositionComponent)
+            distance = max(abs(pos.x - player_pos.x), abs(pos.y - player_pos.y))
+            if 1 < distance <= SIGHT_RADIUS:
+                before[enemy] = (pos.x, pos.y)
+
+        start = time.perf_counter()
+        order, planned_moves = enemies, None
+        if mode == "cooperative":
+            plan = plan_enemy_moves(world, enemies, player, game_map, chase_map)
+            order, planned_moves = plan.order, plan.moves
+            order = order + [e for e in enemies if e not in plan.moves]
+        for enemy in order:
+            process_enemy_turn(
+                world,
+                enemy,
+                player,
+                game_map,
+                chase_map=chase_map if mode == "flow field" else None,
+                path_cache=path_cache if mode == "astar+cache" else None,
+                planned_moves=planned_moves,
+            )
+        elapsed += time.perf_counter() - start
+
+        for enemy, position in before.items():
+            pos = world.get_component(enemy, PositionComponent)
+            if (pos.x, pos.y) == position:
+                wasted += 1
+                if planned_moves and planned_moves.get(enemy) is not None:
+                    blocked += 1
+
+    replans = {"astar+cache": path_cache.misses, "cooperative": blocked}.get(mode)
+    return wasted, replans, elapsed / TURNS
+
+
+def run(count: int) -> None:
+    """指定された敵の数で、各方式を実行して結果を表示する。"""
+    print(f"--- {count} enemies, {TURNS} turns ---")
+    for mode in MODES:
+        wasted, replans, per_turn = simulate(mode, count)
+        print(
+            f"{mode:<12} wasted turns: {wasted:6} | "
+            f"replans: {'-' if replans is None else replans:>6} | "
+            f"{per_turn * 1000:8.2f} ms/turn"
+        )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_COUNTS)
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
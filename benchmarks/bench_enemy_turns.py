@@ -0,0 +1,114 @@
+"""
+敵のターン処理の性能比較: 1体ずつの処理 / NumPyによる事前振り分け / 休眠
+
+大きなマップに敵を散らばらせ、プレイヤーの視界内にいる一部の敵だけが
+行動する状況で、1ターン分の処理時間を計測する。
+休眠を用いる場合は、起きている敵と順番の回ってきた休眠中の敵だけを処理する。
+
+実行方法:
+    python -m benchmarks.bench_enemy_turns [敵の数 ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.application.dormancy_service import DormancyScheduler
+from roguelike_rpg.application.enemy_ai_service import (
+    classify_enemies,
+    process_enemy_turn,
+)
+from roguelike_rpg.application.services import attack_all
+from roguelike_rpg.domain.dijkstra import DijkstraMap
+from roguelike_rpg.domain.ecs.components import (
+    AwakeComponent,
+    EnemyComponent,
+    HealthComponent,
+    PositionComponent,
+)
+from roguelike_rpg.domain.ecs.world import World
+from roguelike_rpg.domain.factories import create_enemy, create_player
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.tile import FLOOR_TILE
+
+DEFAULT_COUNTS = (1_000, 10_000, 50_000)
+MAP_SIZE = 400
+ENEMY_DATA = {
+    "name": "Goblin",
+    "char": "g",
+    "fg_color": [0, 255, 0],
+    "max_hp": 10,
+    "defense": 0,
+    "power": 0,
+}
+
+
+def run(count: int) -> None:
+    """指定された敵の数で、2つの処理方法を計測して表示する。"""
+    rng = random.Random(count)
+    game_map = GameMap(MAP_SIZE, MAP_SIZE)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    world = World(columnar=True)
+    center = MAP_SIZE // 2
+    player = create_player(world, center, center)
+    world.get_component(player, HealthComponent).current_hp = 10**9
+    for _ in range(count):
+        create_enemy(
+            world,
+            rng.randrange(1, MAP_SIZE - 1),
+            rng.randrange(1, MAP_SIZE - 1),
+            ENEMY_DATA,
+        )
+    chase_map = DijkstraMap()
+    chase_map.update(game_map, (center, center))
+    query = (EnemyComponent, PositionComponent, HealthComponent)
+
+    # 敵は移動しないよう、移動先を常に「待機」にした計画を渡す
+    def per_enemy() -> None:
+        for enemy in world.get_entities_with(*query):
+            health = world.get_component(enemy, HealthComponent)
+            if health and health.current_hp > 0:
+                process_enemy_turn(world, enemy, player, game_map, planned_moves=wait)
+
+    def pre_pass() -> None:
+        buckets = classify_enemies(world, list(world.get_entities_with(*query)), player)
+        attack_all(world, buckets.attack, player)
+        for enemy in buckets.chase + buckets.confused:
+            process_enemy_turn(world, enemy, player, game_map, planned_moves=wait)
+
+    scheduler = DormancyScheduler()
+    scheduler.register_floor(world)
+
+    def dormancy() -> None:
+        scheduler.wake_near(world, center, center)
+        enemies = list(world.get_entities_with(AwakeComponent, *query))
+        buckets = classify_enemies(world, enemies + scheduler.due(), player)
+        attack_all(world, buckets.attack, player)
+        for enemy in buckets.chase + buckets.confused:
+            process_enemy_turn(world, enemy, player, game_map, planned_moves=wait)
+        scheduler.rest(world, buckets.idle, player)
+
+    wait = dict.fromkeys(world.get_entities_with(*query))
+    active = classify_enemies(world, list(world.get_entities_with(*query)), player)
+    per_enemy_time = measure(per_enemy)
+    pre_pass_time = measure(pre_pass)
+    dormancy_time = measure(dormancy)
+    print(
+        f"{count:>7,} enemies ({len(active.chase)} chasing, "
+        f"{len(active.attack)} attacking) | per enemy: "
+        f"{per_enemy_time * 1000:8.2f} ms | pre-pass: {pre_pass_time * 1000:8.2f} ms "
+        f"| dormancy: {dormancy_time * 1000:8.2f} ms "
+        f"({per_enemy_time / dormancy_time:5.1f}x)"
+    )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_COUNTS)
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+大きなマップでの長い経路探索の性能比較: A* / HPA*
+
+実行方法:
+    python -m benchmarks.bench_hpa [幅x高さ ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.hpa import HierarchicalPathfinder
+from roguelike_rpg.domain.pathfinding import astar_array
+from roguelike_rpg.domain.tile import FLOOR_ID, FLOOR_TILE, WALL_ID, WALL_TILE
+
+DEFAULT_SIZES = ((80, 20), (300, 300), (800, 800))
+CLUSTER_SIZE = 16
+# 部屋の一辺の長さ（壁を含む）
+ROOM_SIZE = 12
+# 壁に開ける扉の数（部屋の一辺あたり）
+DOORS_PER_WALL = 2
+
+
+def build_map(width: int, height: int) -> GameMap:
+    """
+    格子状に並んだ部屋からなるマップを作る。部屋の間の壁には
+    ランダムな位置に扉が開いている。
+    """
+    rng = np.random.default_rng(width * height)
+    floor = np.ones((width, height), dtype=bool)
+    floor[::ROOM_SIZE, :] = False
+    floor[:, ::ROOM_SIZE] = False
+    floor[-1, :] = floor[:, -1] = False
+    for x in range(0, width - 1, ROOM_SIZE):
+        for y in range(0, height - 1, ROOM_SIZE):
+            # 端の部屋は小さいため、扉の位置は部屋の内側に収める
+            room_width = min(ROOM_SIZE, width - 1 - x)
+            room_height = min(ROOM_SIZE, height - 1 - y)
+            for _ in range(DOORS_PER_WALL):
+                if x > 0 and room_height > 1:
+                    floor[x, y + rng.integers(1, room_height)] = True
+                if y > 0 and room_width > 1:
+                    floor[x + rng.integers(1, room_width), y] = True
+    game_map = GameMap(width, height)
+    game_map.set_tile_id(slice(None), np.where(floor, FLOOR_ID, WALL_ID))
+    return game_map
+
+
+def run(width: int, height: int) -> None:
+    """対角の2点間の経路探索と、タイル変更後の再構築を計測して表示する。"""
+    game_map = build_map(width, height)
+    start, end = (1, 1), (width - 2, height - 2)
+    game_map.tiles[end] = FLOOR_TILE
+
+    begin = time.perf_counter()
+    hpa = HierarchicalPathfinder(game_map, cluster_size=CLUSTER_SIZE)
+    build_time = time.perf_counter() - begin
+
+    astar_path = astar_array(game_map.walkable, start, end)
+    hpa_path = hpa.find_path(start, end)
+    astar_time = measure(lambda: astar_array(game_map.walkable, start, end), repeat=1)
+    hpa_time = measure(lambda: hpa.find_path(start, end))
+
+    # マップ中央のタイルを1つ変更し、影響するクラスタだけが再構築されることを確認する
+    builds = hpa.cluster_builds
+    center = (width // 2, height // 2)
+    game_map.tiles[center] = WALL_TILE if game_map.walkable[center] else FLOOR_TILE
+    begin = time.perf_counter()
+    hpa.find_path(start, end)
+    update_time = time.perf_counter() - begin - hpa_time
+
+    print(
+        f"{width:>4}x{height:<4} path: A* {len(astar_path):5} / "
+        f"HPA* {len(hpa_path):5} | A*: {astar_time * 1000:9.2f} ms | "
+        f"HPA* query: {hpa_time * 1000:7.2f} ms ({astar_time / hpa_time:5.1f}x) | "
+        f"build: {build_time * 1000:8.2f} ms | "
+        f"tile change: {hpa.cluster_builds - builds} cluster(s), "
+        f"{max(update_time, 0) * 1000:.2f} ms"
+    )
+
+
+def main() -> None:
+    sizes = [tuple(int(v) for v in arg.split("x")) for arg in sys.argv[1:]] or list(
+        DEFAULT_SIZES
+    )
+    for width, height in sizes:
+        run(width, height)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+一様コストの広い部屋での経路探索の性能比較: A* / ジャンプポイントサーチ
+
+実行方法:
+    python -m benchmarks.bench_jps [部屋の大きさ ...]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.pathfinding import UniformCost, astar, astar_array, jps
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+DEFAULT_SIZES = (40, 100, 300)
+# 柱を置く間隔
+PILLAR_SPACING = 7
+
+
+def build_room(size: int) -> GameMap:
+    """外周が壁で、柱が等間隔に並んだ正方形の大部屋を作る。"""
+    game_map = GameMap(size, size)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    game_map.tiles[
+        PILLAR_SPACING:-1:PILLAR_SPACING, PILLAR_SPACING:-1:PILLAR_SPACING
+    ] = WALL_TILE
+    # 部屋の途中に、端だけ通れる仕切りを置く
+    game_map.tiles[size // 2, 1 : size - 3] = WALL_TILE
+    return game_map
+
+
+def run(size: int) -> None:
+    """指定された大きさの部屋で、対角の2点間の経路探索を計測して表示する。"""
+    game_map = build_room(size)
+    cost = UniformCost(game_map.walkable)
+    start, end = (1, 1), (size - 2, 2)
+
+    astar_path = astar(game_map, start, end, cost)
+    stats: dict = {}
+    jps_path = jps(game_map, start, end, cost, stats)
+    assert len(jps_path) == len(astar_path), "経路の長さが一致しません"
+
+    astar_time = measure(lambda: astar(game_map, start, end, cost))
+    array_time = measure(lambda: astar_array(game_map.walkable, start, end))
+    jps_time = measure(lambda: jps(game_map, start, end, cost))
+    print(
+        f"{size:>4}x{size:<4} path: {len(jps_path):4} | "
+        f"astar: {astar_time * 1000:8.2f} ms | "
+        f"astar_array: {array_time * 1000:8.2f} ms | "
+        f"jps: {jps_time * 1000:8.2f} ms ({astar_time / jps_time:5.1f}x, "
+        f"{stats['expanded']} nodes expanded)"
+    )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)
+    for size in sizes:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+マップ生成の性能計測: 長方形の部屋 / BSPによる部屋と通路 / セルオートマトンの洞窟
+
+マップの大きさごとに、BSPと洞窟のタイルの配置（レイアウト）だけの時間と、
+敵・アイテムの配置まで含めた generate_map 全体の時間を計測する。
+
+実行方法:
+    python -m benchmarks.bench_mapgen [幅x高さ ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.bsp import generate_bsp
+from roguelike_rpg.domain.cave import generate_cave
+from roguelike_rpg.domain.ecs.world import World
+from roguelike_rpg.domain.mapgen import MapGenerator, generate_map
+from roguelike_rpg.infrastructure.data_loader import load_json_data
+
+DEFAULT_SIZES = ((80, 20), (200, 200), (1000, 1000))
+
+
+def run(width: int, height: int) -> None:
+    """指定された大きさのマップで、生成時間を計測して表示する。"""
+    enemy_data = load_json_data("assets/enemies.json")
+    item_data = load_json_data("assets/items.json")
+    rng = random.Random(width * height)
+
+    def bsp_layout() -> None:
+        generate_bsp(width, height, rng)
+
+    def cave_layout() -> None:
+        generate_cave(width, height, rng)
+
+    def full(generator: MapGenerator) -> None:
+        generate_map(
+            world=World(columnar=True),
+            map_width=width,
+            map_height=height,
+            dungeon_level=1,
+            max_enemies_per_room=2,
+            max_items_per_room=2,
+            enemy_data=enemy_data,
+            item_data=item_data,
+            generator=generator,
+        )
+
+    bsp_layout_time = measure(bsp_layout)
+    cave_layout_time = measure(cave_layout)
+    full_times = {
+        generator: measure(lambda: full(generator)) for generator in MapGenerator
+    }
+    print(
+        f"{width:>5}x{height:<5} | layout BSP: {bsp_layout_time * 1000:7.2f} ms, "
+        f"cave: {cave_layout_time * 1000:7.2f} ms | generate_map "
+        + ", ".join(
+            f"{generator.name.lower()}: {elapsed * 1000:7.2f} ms"
+            for generator, elapsed in full_times.items()
+        )
+    )
+
+
+def main() -> None:
+    sizes = [tuple(map(int, arg.split("x"))) for arg in sys.argv[1:]]
+    for width, height in sizes or DEFAULT_SIZES:
+        run(width, height)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+敵の知覚の性能比較: 敵ごとの視線判定 / プレイヤーの視界の配列参照
+
+プレイヤーの周囲に散らばった敵それぞれについて、プレイヤーが見えるかどうかを
+判定する。敵ごとの視線判定はブレゼンハムの直線上のタイルを1つずつ調べ、
+視界の配列参照はシャドウキャスティングで視界を1回計算してから添字参照する。
+
+実行方法:
+    python -m benchmarks.bench_perception [敵の数 ...]
+"""
+
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+from benchmarks.bench_astar import build_map
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.application.enemy_ai_service import SIGHT_RADIUS
+from roguelike_rpg.domain.fov import FieldOfView
+
+DEFAULT_COUNTS = (10, 100, 1_000)
+MAP_SIZE = 80
+
+
+def line_of_sight(transparent: np.ndarray, start: tuple, end: tuple) -> bool:
+    """ブレゼンハムの直線上に視線を遮るタイルがないかどうかを返す。"""
+    (x0, y0), (x1, y1) = start, end
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+    error = dx + dy
+    while (x0, y0) != (x1, y1):
+        if (x0, y0) != start and not transparent[x0, y0]:
+            return False
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x0 += sx
+        if doubled <= dx:
+            error += dx
+            y0 += sy
+    return True
+
+
+def run(count: int) -> None:
+    """指定された数の敵で、2つの方法を計測して表示する。"""
+    game_map = build_map(MAP_SIZE, MAP_SIZE)
+    transparent = game_map.transparent
+    center = (MAP_SIZE // 2, MAP_SIZE // 2)
+    rng = np.random.default_rng(count)
+    xs = rng.integers(center[0] - SIGHT_RADIUS, center[0] + SIGHT_RADIUS + 1, count)
+    ys = rng.integers(center[1] - SIGHT_RADIUS, center[1] + SIGHT_RADIUS + 1, count)
+    enemies = list(zip(xs.tolist(), ys.tolist()))
+
+    def per_enemy() -> list[bool]:
+        return [line_of_sight(transparent, enemy, center) for enemy in enemies]
+
+    def shared_fov() -> np.ndarray:
+        # ターンごとに視点が動いた場合を想定し、毎回視界を計算し直す
+        fov = FieldOfView()
+        fov.update(game_map, center, SIGHT_RADIUS)
+        return fov.visible[xs, ys]
+
+    per_enemy_time = measure(per_enemy)
+    shared_time = measure(shared_fov)
+    agreement = np.mean(np.array(per_enemy()) == shared_fov())
+    print(
+        f"{count:>6,} enemies | per-enemy LOS: {per_enemy_time * 1000:7.3f} ms | "
+        f"shared FOV: {shared_time * 1000:7.3f} ms "
+        f"({per_enemy_time / shared_time:5.1f}x, {agreement:.0%} agree)"
+    )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_COUNTS)
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+フロア移動の性能計測: その場での生成 / 次のフロアの先行生成
+
+マップの大きさごとに、階段を下りる（next_floor）のにかかる時間を、
+先行生成を行わない場合と行う場合で比較する。先行生成を行う場合は、
+各フロアでプレイヤーが考えている時間として THINK_TIME だけ待ってから下りる。
+先行生成のヒット・ミスの回数と、計画を受け取るまでの平均時間も表示する。
+
+実行方法:
+    python -m benchmarks.bench_prefetch [幅x高さ ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from roguelike_rpg.application.game_loop import GameLoop
+
+DEFAULT_SIZES = ((80, 20), (200, 200), (400, 400))
+# 下りる階層の数
+FLOORS = 5
+# 各フロアで、下りるまでに待つ時間（秒）
+THINK_TIME = 0.2
+SEED = 1
+
+
+def descend(game_loop: GameLoop, think_time: float) -> float:
+    """FLOORS 回下り、1回の next_floor にかかった平均時間（秒）を返す。"""
+    total = 0.0
+    for _ in range(FLOORS):
+        time.sleep(think_time)
+        start = time.perf_counter()
+        game_loop.next_floor()
+        total += time.perf_counter() - start
+    game_loop.prefetcher.close()
+    return total / FLOORS
+
+
+def run(width: int, height: int) -> None:
+    """指定された大きさのマップで、フロア移動の時間を計測して表示する。"""
+    synchronous = GameLoop(width, height, seed=SEED, prefetch=False)
+    prefetched = GameLoop(width, height, seed=SEED)
+    sync_time = descend(synchronous, 0.0)
+    prefetch_time = descend(prefetched, THINK_TIME)
+    print(
+        f"{width:>5}x{height:<5} | next_floor sync: {sync_time * 1000:8.2f} ms | "
+        f"prefetch: {prefetch_time * 1000:8.2f} ms | "
+        f"{prefetched.prefetcher.report()}"
+    )
+
+
+def main() -> None:
+    sizes = [tuple(map(int, arg.split("x"))) for arg in sys.argv[1:]]
+    for width, height in sizes or DEFAULT_SIZES:
+        run(width, height)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+World.query と get_entities_with + get_component の性能比較
+
+実行方法:
+    python -m benchmarks.bench_query [エンティティ数 ...]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from benchmarks.bench_world_storage import measure, populate
+from roguelike_rpg.domain.ecs.components import (
+    HealthComponent,
+    PositionComponent,
+    RenderableComponent,
+)
+from roguelike_rpg.domain.ecs.storage import StorageMode
+from roguelike_rpg.domain.ecs.world import World
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def run(count: int) -> None:
+    """指定されたエンティティ数で、2つの走査方法を計測して表示する。"""
+    print(f"--- {count:,} entities ---")
+    for mode in StorageMode:
+        world = World(storage_mode=mode)
+        populate(world, count)
+        types = (PositionComponent, RenderableComponent, HealthComponent)
+
+        def lookup() -> None:
+            for entity in world.get_entities_with(*types):
+                pos = world.get_component(entity, PositionComponent)
+                renderable = world.get_component(entity, RenderableComponent)
+                health = world.get_component(entity, HealthComponent)
+                (pos, renderable, health)
+
+        def query() -> None:
+            for entity, pos, renderable, health in world.query(*types):
+                (pos, renderable, health)
+
+        # ビューの初回作成は計測から除く
+        lookup()
+        lookup_time = measure(lookup)
+        query_time = measure(query)
+        print(
+            f"{mode.name:<10} get_entities_with+get_component: "
+            f"{lookup_time * 1000:8.2f} ms | query: {query_time * 1000:8.2f} ms "
+            f"({lookup_time / query_time:4.1f}x)"
+        )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)
+    for count in sizes:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
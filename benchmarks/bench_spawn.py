@@ -0,0 +1,95 @@
+"""
+出現の抽選の性能計測: random.choice + list.remove / 入れ替えでの取り出し + エイリアス法
+
+1つの部屋（配置候補のタイル数）に多数の敵とアイテムを配置する処理について、
+従来の方式（タイルを random.choice で選んで list.remove で削除し、
+アイテムのカテゴリのキーを毎回リストに直す）と、TileSampler と
+SpawnTable による方式の時間を比較する。エンティティの生成は含めない。
+
+実行方法:
+    python -m benchmarks.bench_spawn [タイル数 ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from typing import Any
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.spawn import SpawnTable, TileSampler
+from roguelike_rpg.infrastructure.data_loader import load_json_data
+
+DEFAULT_TILE_COUNTS = (1_000, 10_000, 100_000)
+# 配置する敵とアイテムの数（それぞれ、タイル数の半分まで）
+SPAWN_COUNT = 1_000
+
+
+def spawn_with_list(
+    tiles: list[tuple[int, int]],
+    enemy_data: dict[str, Any],
+    item_data: dict[str, Any],
+    count: int,
+) -> None:
+    """従来の方式で、敵とアイテムの配置先と種類を選ぶ。"""
+    enemy_types = list(enemy_data.keys())
+    item_categories = [key for key in item_data.keys() if key != "treasure"]
+    for _ in range(count):
+        position = random.choice(tiles)
+        tiles.remove(position)
+        enemy_data[random.choice(enemy_types)]
+    for _ in range(count):
+        category_items = item_data[random.choice(item_categories)]
+        category_items[random.choice(list(category_items.keys()))]
+        position = random.choice(tiles)
+        tiles.remove(position)
+
+
+def spawn_with_tables(
+    tiles: list[tuple[int, int]],
+    enemy_table: SpawnTable,
+    item_table: SpawnTable,
+    count: int,
+) -> None:
+    """TileSampler と出現表で、敵とアイテムの配置先と種類を選ぶ。"""
+    sampler = TileSampler(tiles)
+    enemies = enemy_table.for_level(20)
+    items = item_table.for_level(20)
+    for _ in range(count):
+        sampler.take()
+        enemies.sample()
+    for _ in range(count):
+        sampler.take()
+        items.sample()
+
+
+def run(tile_count: int) -> None:
+    """指定されたタイル数の部屋で各方式を計測し、結果を表示する。"""
+    enemy_data = load_json_data("assets/enemies.json")
+    item_data = load_json_data("assets/items.json")
+    enemy_table = SpawnTable.from_enemies(enemy_data)
+    item_table = SpawnTable.from_items(item_data)
+    tiles = [(index, 0) for index in range(tile_count)]
+    count = min(SPAWN_COUNT, tile_count // 2)
+
+    list_time = measure(
+        lambda: spawn_with_list(list(tiles), enemy_data, item_data, count)
+    )
+    table_time = measure(
+        lambda: spawn_with_tables(list(tiles), enemy_table, item_table, count)
+    )
+    print(
+        f"{tile_count:>9,} tiles | choice+remove: {list_time * 1000:9.2f} ms | "
+        f"sampler+alias: {table_time * 1000:7.2f} ms | "
+        f"speedup: {list_time / table_time:7.1f}x"
+    )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]]
+    for tile_count in counts or DEFAULT_TILE_COUNTS:
+        run(tile_count)
+
+
+if __name__ == "__main__":
+    main()
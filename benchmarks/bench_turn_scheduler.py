@@ -0,0 +1,77 @@
+"""
+行動順の決め方の性能比較: エネルギーの全走査 / 優先度付きキュー
+
+速さの異なる多数のアクターを、プレイヤーの行動10回分の時間だけ進める。
+エネルギー方式は単位時間ごとに全アクターのエネルギーを加算して行動の可否を調べ、
+優先度付きキュー方式は行動の時刻が来たアクターだけを取り出す。
+
+実行方法:
+    python -m benchmarks.bench_turn_scheduler [アクターの数 ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+
+from benchmarks.bench_world_storage import measure
+from roguelike_rpg.domain.turn_scheduler import (
+    ACTION_COST,
+    TurnScheduler,
+    action_delay,
+)
+
+DEFAULT_COUNTS = (1_000, 10_000)
+SPEEDS = (50, 75, 100, 150, 200)
+PLAYER_TURNS = 10
+# エネルギー方式で1回に加算する時間の刻み
+# すべての速さで1回の加算量が整数になり、行動回数が厳密に一致する最大の刻み
+ENERGY_TICK = 4
+
+
+def run(count: int) -> None:
+    """指定された数のアクターで、2つの方式を計測して表示する。"""
+    rng = random.Random(count)
+    speeds = [rng.choice(SPEEDS) for _ in range(count)]
+    until = ACTION_COST * PLAYER_TURNS
+
+    def energy_scan() -> int:
+        energy = [0] * count
+        actions = 0
+        for _ in range(until // ENERGY_TICK):
+            for actor in range(count):
+                energy[actor] += speeds[actor] * ENERGY_TICK // 100
+                if energy[actor] >= ACTION_COST:
+                    energy[actor] -= ACTION_COST
+                    actions += 1
+        return actions
+
+    def priority_queue() -> int:
+        scheduler = TurnScheduler()
+        for actor in range(count):
+            scheduler.schedule(actor, action_delay(speeds[actor]))
+        actions = 0
+        while actors := scheduler.pop_due(until):
+            actions += len(actors)
+            for actor in actors:
+                scheduler.schedule(actor, action_delay(speeds[actor]))
+        return actions
+
+    assert energy_scan() == priority_queue()
+    scan_time = measure(energy_scan)
+    queue_time = measure(priority_queue)
+    print(
+        f"{count:>7,} actors | energy scan: {scan_time * 1000:8.2f} ms | "
+        f"priority queue: {queue_time * 1000:8.2f} ms "
+        f"({scan_time / queue_time:4.1f}x)"
+    )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_COUNTS)
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Worldの格納方式（辞書の辞書 / アーキタイプ）とクエリビューの性能比較
+
+実行方法:
+    python -m benchmarks.bench_world_storage [エンティティ数 ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable
+
+from roguelike_rpg.domain.ecs.components import (
+    AttackPowerComponent,
+    DefenseComponent,
+    EnemyComponent,
+    HealthComponent,
+    ItemComponent,
+    NameComponent,
+    PositionComponent,
+    RenderableComponent,
+)
+from roguelike_rpg.domain.ecs.storage import StorageMode
+from roguelike_rpg.domain.ecs.world import World
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def populate(world: World, count: int) -> None:
+    """ゲーム中に近い比率で、敵・アイテム・その他のエンティティを生成する。"""
+    for i in range(count):
+        x, y = i % 200, i // 200
+        if i % 4 == 0:
+            world.create_entity(
+                ItemComponent(),
+                NameComponent(name="item"),
+                PositionComponent(x=x, y=y),
+                RenderableComponent(char="!", fg=(255, 0, 255), bg=(0, 0, 0)),
+            )
+        elif i % 4 == 1:
+            # 位置を持たない（インベントリ内の）アイテム
+            world.create_entity(ItemComponent(), NameComponent(name="item"))
+        else:
+            world.create_entity(
+                EnemyComponent(),
+                NameComponent(name="enemy"),
+                PositionComponent(x=x, y=y),
+                RenderableComponent(char="g", fg=(0, 255, 0), bg=(0, 0, 0)),
+                HealthComponent(max_hp=10, current_hp=10),
+                AttackPowerComponent(power=3),
+                DefenseComponent(defense=0),
+            )
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """関数を複数回実行し、最短の実行時間（秒）を返す。"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count: int) -> None:
+    """指定されたエンティティ数で各格納方式を計測し、結果を表示する。"""
+    print(f"--- {count:,} entities ---")
+    for mode, cache in [
+        (mode, cache) for cache in (False, True) for mode in StorageMode
+    ]:
+        world = World(storage_mode=mode, cache_queries=cache)
+        build = measure(
+            lambda: populate(World(storage_mode=mode, cache_queries=cache), count),
+            repeat=1,
+        )
+        populate(world, count)
+        label = f"{mode.name}{'+VIEW' if cache else ''}"
+
+        def query_enemies() -> None:
+            for _ in world.get_entities_with(PositionComponent, EnemyComponent):
+                pass
+
+        def query_renderables() -> None:
+            for _ in world.get_entities_with(PositionComponent, RenderableComponent):
+                pass
+
+        def query_single() -> None:
+            for _ in world.get_entities_with(ItemComponent):
+                pass
+
+        enemies = measure(query_enemies)
+        renderables = measure(query_renderables)
+        single = measure(query_single)
+        print(
+            f"{label:<15} build: {build * 1000:9.2f} ms | "
+            f"(Position, Enemy): {enemies * 1000:8.2f} ms | "
+            f"(Position, Renderable): {renderables * 1000:8.2f} ms | "
+            f"(Item): {single * 1000:8.2f} ms"
+        )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES)
+    for count in sizes:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# roguelike_rpg/application/dormancy_service.py
+"""
+敵の休眠（AIの詳細度）を管理するアプリケーションサービス
+プレイヤーから遠い敵を休眠させて毎ターンの処理から外し、プレイヤーの接近や
+物音によって起こす。休眠中の敵は間引かれた頻度でのみ処理されるため、
+1ターンの処理量はフロア全体の敵の数ではなく、起きている敵の数に比例する。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from roguelike_rpg.application.enemy_ai_service import SIGHT_RADIUS
+from roguelike_rpg.domain.ecs.components import (
+    AwakeComponent,
+    EnemyComponent,
+    PositionComponent,
+)
+from roguelike_rpg.domain.ecs.entity import entity_index
+
+if TYPE_CHECKING:
+    from roguelike_rpg.domain.ecs.world import Entity, World
+
+# プレイヤーの周囲で敵を起こす半径（ユークリッド距離）
+# 視界（チェビシェフ距離 SIGHT_RADIUS）の四隅まで含むように、√2倍より大きくとる
+WAKE_RADIUS = SIGHT_RADIUS * 3 // 2
+# 起きている敵が休眠に入るプレイヤーとの距離（チェビシェフ距離）
+# チェビシェフ距離がこれを超えれば、ユークリッド距離も起こす半径を超えている
+SLEEP_RADIUS = WAKE_RADIUS
+# 休眠に入るまでに、遠く離れたまま過ごすターン数
+# 境界付近で起床と休眠を毎ターン繰り返さないようにする
+TURNS_BEFORE_SLEEP = 3
+# 休眠中の敵を処理する間隔（ターン数）
+DORMANT_TICK_INTERVAL = 4
+# 戦闘やアイテムの使用による物音が届く半径
+NOISE_RADIUS = 16
+
+
+class DormancyScheduler:
+    """
+    敵の起床と休眠を管理する。
+
+    起きている敵は AwakeComponent を持ち、毎ターン処理される。
+    休眠中の敵は DORMANT_TICK_INTERVAL 個の組に分けて保持され、各ターンには
+    そのうちの1組だけが due で返される。つまり休眠中の敵は interval ターンに
+    1度だけ処理される。
+
+    Attributes:
+        interval (int): 休眠中の敵を処理する間隔。
+        turn (int): due が呼ばれた回数（経過ターン数）。
+        wakes (int): 敵を起こした回数。
+        sleeps (int): 敵を休眠させた回数。
+    """
+
+    def __init__(self, interval: int = DORMANT_TICK_INTERVAL):
+        self.interval = interval
+        self.turn = 0
+        self.wakes = 0
+        self.sleeps = 0
+        # 休眠中の敵を、処理するターンの組ごとに保持する
+        self._slots: list[set["Entity"]] = [set() for _ in range(interval)]
+
+    def __len__(self) -> int:
+        """休眠中の敵の数を返す。"""
+        return sum(len(slot) for slot in self._slots)
+
+    def __contains__(self, entity: object) -> bool:
+        """敵が休眠中かどうかを返す。"""
+        return entity in self._slot_of(entity)
+
+    def _slot_of(self, entity: "Entity") -> set["Entity"]:
+        """敵が休眠中に属する組を返す。"""
+        return self._slots[entity_index(entity) % self.interval]
+
+    def register_floor(self, world: "World") -> None:
+        """
+        新しいフロアの敵を登録する。起きていない敵はすべて休眠させる。
+        以前のフロアの敵の情報は破棄される。
+
+        Args:
+            world (World): ワールド。
+        """
+        self.clear()
+        for enemy in list(world.get_entities_with(EnemyComponent)):
+            if not world.has_any(enemy, AwakeComponent):
+                self._slot_of(enemy).add(enemy)
+
+    def clear(self) -> None:
+        """すべての休眠中の敵を忘れる（フロアの移動時など）。"""
+        for slot in self._slots:
+            slot.clear()
+
+    def forget(self, entity: "Entity") -> None:
+        """削除された敵を休眠中の組から取り除く。"""
+        self._slot_of(entity).discard(entity)
+
+    def wake(self, world: "World", entities: Iterable["Entity"]) -> list["Entity"]:
+        """
+        休眠中の敵を起こす。休眠中でない敵は無視する。
+
+        Args:
+            world (World): ワールド。
+            entities (Iterable[Entity]): 起こす敵。
+
+        Returns:
+            list[Entity]: 実際に起こした敵。
+        """
+        woken = []
+        for entity in entities:
+            slot = self._slot_of(entity)
+            if entity in slot:
+                slot.remove(entity)
+                world.add_component(entity, AwakeComponent())
+                woken.append(entity)
+        self.wakes += len(woken)
+        return woken
+
+    def wake_near(
+        self, world: "World", x: int, y: int, radius: float = WAKE_RADIUS
+    ) -> list["Entity"]:
+        """
+        指定された座標の周囲で休眠中の敵を起こす。
+        空間索引を用いるため、処理量は範囲の広さにのみ比例する。
+        プレイヤーの接近による起床と、物音による起床の両方に用いる。
+
+        Args:
+            world (World): ワールド。
+            x (int): 中心のx座標。
+            y (int): 中心のy座標。
+            radius (float): 起こす範囲の半径（ユークリッド距離）。
+
+        Returns:
+            list[Entity]: 起こした敵。
+        """
+        return self.wake(world, world.entities_in_radius(x, y, radius))
+
+    def due(self) -> list["Entity"]:
+        """
+        このターンに処理する休眠中の敵を返し、ターンを1つ進める。
+
+        Returns:
+            list[Entity]: このターンに処理の順番が回ってきた休眠中の敵。
+        """
+        slot = self._slots[self.turn % self.interval]
+        self.turn += 1
+        return list(slot)
+
+    def rest(
+        self, world: "World", idle: Iterable["Entity"], player: "Entity"
+    ) -> list["Entity"]:
+        """
+        このターン何もしなかった起きている敵のうち、プレイヤーから SLEEP_RADIUS
+        より遠くで TURNS_BEFORE_SLEEP ターン過ごした敵を休眠させる。
+        休眠中の敵は無視する。
+
+        Args:
+            world (World): ワールド。
+            idle (Iterable[Entity]): このターン何もしなかった敵。
+            player (Entity): プレイヤー。
+
+        Returns:
+            list[Entity]: 休眠させた敵。
+        """
+        awake = [enemy for enemy in idle if enemy not in self]
+        player_pos = world.get_component(player, PositionComponent)
+        if not awake or not player_pos:
+            return []
+
+        xs = world.gather(awake, PositionComponent, "x")
+        ys = world.gather(awake, PositionComponent, "y")
+        distance = np.maximum(np.abs(xs - player_pos.x), np.abs(ys - player_pos.y))
+        slept = []
+        for enemy, far in zip(awake, (distance > SLEEP_RADIUS).tolist()):
+            state = world.get_component(enemy, AwakeComponent)
+            if state is None:
+                continue
+            state.idle_turns = state.idle_turns + 1 if far else 0
+            if state.idle_turns >= TURNS_BEFORE_SLEEP:
+                world.remove_component(enemy, AwakeComponent)
+                self._slot_of(enemy).add(enemy)
+                slept.append(enemy)
+        self.sleeps += len(slept)
+        return slept
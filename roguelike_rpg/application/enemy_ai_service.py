@@ -6,27 +6,59 @@
 from __future__ import annotations
 
 import random
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from roguelike_rpg.application.services import attack, get_blocking_enemy_at
+from roguelike_rpg.domain.cooperative import (
+    DEFAULT_WINDOW,
+    CooperativePlan,
+    plan_cooperative,
+)
 from roguelike_rpg.domain.ecs.components import (
     ConfusionComponent,
+    HealthComponent,
     NameComponent,
     PositionComponent,
 )
-from roguelike_rpg.domain.pathfinding import astar
+from roguelike_rpg.domain.pathfinding import UniformCost, find_path
 
 if TYPE_CHECKING:
+    from roguelike_rpg.domain.dijkstra import DijkstraMap
+    from roguelike_rpg.domain.ecs.command_buffer import CommandBuffer
     from roguelike_rpg.domain.ecs.world import Entity, World
     from roguelike_rpg.domain.game_map import GameMap
+    from roguelike_rpg.domain.path_cache import PathCache
+
+# 敵の視界の範囲
+SIGHT_RADIUS = 8
 
 
 def process_enemy_turn(
-    world: "World", enemy: "Entity", player: "Entity", game_map: "GameMap"
+    world: "World",
+    enemy: "Entity",
+    player: "Entity",
+    game_map: "GameMap",
+    commands: "CommandBuffer | None" = None,
+    chase_map: "DijkstraMap | None" = None,
+    path_cache: "PathCache | None" = None,
+    planned_moves: "dict[Entity, tuple[int, int] | None] | None" = None,
+    visible: "np.ndarray | None" = None,
 ) -> list[str]:
     """
     一体の敵のターンを処理し、行動を実行する。
     混乱している場合は、ランダムに移動する。
+    commands が渡された場合、コンポーネントの削除などの構造変更は
+    コマンドバッファに記録され、呼び出し側の同期点で適用される。
+    chase_map が渡された場合、敵ごとのA*探索の代わりに、全ての敵で共有する
+    プレイヤーへの距離場を下る方向へ移動する。
+    path_cache が渡された場合、敵ごとの経路を前回のターンから再利用する。
+    planned_moves に敵が含まれている場合、経路探索を行わず、plan_enemy_moves で
+    まとめて計画された移動先に進む（None なら待機する）。
+    visible が渡された場合、プレイヤーの視界（GameMap.visible）に入っていない
+    タイルにいる敵は、壁越しにプレイヤーに気づくことはない。
     """
     logs = []
     enemy_pos = world.get_component(enemy, PositionComponent)
@@ -41,17 +73,17 @@ def process_enemy_turn(
     if confusion:
         confusion.duration -= 1
         if confusion.duration <= 0:
-            world.remove_component(enemy, ConfusionComponent)
+            if commands is not None:
+                commands.remove_component(enemy, ConfusionComponent)
+            else:
+                world.remove_component(enemy, ConfusionComponent)
             logs.append(f"{enemy_name.name}は正気に戻った！")
             return logs
         else:
             # ランダムな方向に移動
             dx, dy = random.choice([(-1, 0), (1, 0), (0, -1), (0, 1)])
             dest_x, dest_y = enemy_pos.x + dx, enemy_pos.y + dy
-            if (
-                game_map.in_bounds(dest_x, dest_y)
-                and game_map.tiles[dest_x, dest_y].walkable
-            ):
+            if game_map.in_bounds(dest_x, dest_y) and game_map.walkable[dest_x, dest_y]:
                 if not get_blocking_enemy_at(world, dest_x, dest_y):
                     enemy_pos.x = dest_x
                     enemy_pos.y = dest_y
@@ -59,14 +91,15 @@ def process_enemy_turn(
             return logs
 
     # 通常のAI処理
-    # 視界の範囲
-    SIGHT_RADIUS = 8
     # プレイヤーとの距離を計算（チェビシェフ距離）
     distance = max(abs(enemy_pos.x - player_pos.x), abs(enemy_pos.y - player_pos.y))
 
     # プレイヤーが視界外なら何もしない
     if distance > SIGHT_RADIUS:
         return logs
+    # 隣接していない敵は、視線が通っていなければプレイヤーに気づかない
+    if distance > 1 and visible is not None and not visible[enemy_pos.x, enemy_pos.y]:
+        return logs
 
     # プレイヤーが隣接している場合、攻撃する
     if distance <= 1.5:  # 8方向隣接
@@ -74,18 +107,16 @@ def process_enemy_turn(
         return logs
 
     # プレイヤーが視界内にいる場合、追跡する
-    # A*でプレイヤーへの経路を探索
-    path = astar(
-        game_map,
-        start=(enemy_pos.x, enemy_pos.y),
-        end=(player_pos.x, player_pos.y),
-        # 移動コスト：歩けるなら1、無理なら無限大
-        cost_func=lambda x, y: 1.0 if game_map.tiles[x, y].walkable else float("inf"),
-    )
+    if planned_moves is not None and enemy in planned_moves:
+        next_step = planned_moves[enemy]
+    else:
+        next_step = _next_chase_step(
+            world, enemy, game_map, enemy_pos, player_pos, chase_map, path_cache
+        )
 
     # 経路が見つかり、移動可能な場合
-    if path and len(path) > 1:
-        next_x, next_y = path[1]  # 経路の次のステップ
+    if next_step:
+        next_x, next_y = next_step
 
         # 次のステップに他の敵がいないか確認
         if get_blocking_enemy_at(world, next_x, next_y):
@@ -97,3 +128,160 @@ def process_enemy_turn(
         enemy_pos.y = next_y
 
     return logs
+
+
+@dataclass
+class EnemyBuckets:
+    """
+    このターンの行動の種類ごとに振り分けた敵。各リストは元の順序を保つ。
+
+    Attributes:
+        idle (list[Entity]): プレイヤーが視界外か、視線が通らないため何もしない敵。
+        attack (list[Entity]): プレイヤーに隣接していて攻撃する敵。
+        chase (list[Entity]): プレイヤーが視界内にいて追跡する敵。
+        confused (list[Entity]): 混乱している敵。
+    """
+
+    idle: "list[Entity]" = field(default_factory=list)
+    attack: "list[Entity]" = field(default_factory=list)
+    chase: "list[Entity]" = field(default_factory=list)
+    confused: "list[Entity]" = field(default_factory=list)
+
+
+def classify_enemies(
+    world: "World",
+    enemies: "list[Entity]",
+    player: "Entity",
+    visible: "np.ndarray | None" = None,
+) -> EnemyBuckets:
+    """
+    すべての敵の生死・プレイヤーとの距離・隣接・混乱をNumPyでまとめて判定し、
+    このターンの行動の種類ごとに振り分ける。HPが0以下の敵はどこにも含まれない。
+    振り分けは process_enemy_turn の判定と同じ規則に従う。
+    敵はすべて PositionComponent と HealthComponent を持っている必要がある。
+
+    Args:
+        world (World): ワールド。
+        enemies (list[Entity]): 振り分ける敵。
+        player (Entity): プレイヤー。
+        visible (np.ndarray | None): プレイヤーの視界。渡された場合、視界に入って
+            いないタイルにいる敵は追跡せずに何もしない。
+
+    Returns:
+        EnemyBuckets: 行動の種類ごとの敵。
+    """
+    buckets = EnemyBuckets()
+    player_pos = world.get_component(player, PositionComponent)
+    if not enemies or not player_pos:
+        return buckets
+
+    xs = world.gather(enemies, PositionComponent, "x")
+    ys = world.gather(enemies, PositionComponent, "y")
+    alive = world.gather(enemies, HealthComponent, "current_hp") > 0
+    # プレイヤーとの距離（チェビシェフ距離）
+    distance = np.maximum(np.abs(xs - player_pos.x), np.abs(ys - player_pos.y))
+    confused_entities = set(world.get_entities_with(ConfusionComponent))
+    confused = np.fromiter(
+        (enemy in confused_entities for enemy in enemies),
+        dtype=bool,
+        count=len(enemies),
+    )
+
+    # 視線の判定は視界の配列を1回参照するだけで済む
+    in_sight = distance <= SIGHT_RADIUS
+    if visible is not None:
+        in_sight &= visible[xs, ys]
+
+    active = alive & ~confused
+    masks = {
+        "confused": alive & confused,
+        "attack": active & (distance <= 1),
+        "chase": active & (distance > 1) & in_sight,
+        "idle": active & (distance > 1) & ~in_sight,
+    }
+    for name, mask in masks.items():
+        setattr(buckets, name, [enemies[i] for i in np.flatnonzero(mask).tolist()])
+    return buckets
+
+
+def plan_enemy_moves(
+    world: "World",
+    enemies: "list[Entity]",
+    player: "Entity",
+    game_map: "GameMap",
+    distance_map: "DijkstraMap",
+    window: int = DEFAULT_WINDOW,
+    buckets: EnemyBuckets | None = None,
+) -> CooperativePlan:
+    """
+    プレイヤーを追跡する敵の移動を、予約表を用いてまとめて計画する。
+    追跡しない敵（視界外・隣接・混乱中）は動かない障害物として扱う。
+    計画の order の順に敵を行動させると、先に動いた敵が空けたマスに
+    後の敵が入れるため、互いの移動がぶつからない。
+
+    Args:
+        world (World): ワールド。
+        enemies (list[Entity]): 行動する敵。
+        player (Entity): 追跡の目標となるプレイヤー。
+        game_map (GameMap): 対象のマップ。
+        distance_map (DijkstraMap): プレイヤーへの距離場（探索のヒューリスティック）。
+        window (int): 何ターン先まで経路を予約するか。
+        buckets (EnemyBuckets | None): classify_enemies による振り分けの結果。
+            渡されなければ enemies を振り分ける。
+
+    Returns:
+        CooperativePlan: 追跡する敵ごとの次の位置と行動順。
+    """
+    player_pos = world.get_component(player, PositionComponent)
+    distance_map.update(game_map, (player_pos.x, player_pos.y))
+    if buckets is None:
+        buckets = classify_enemies(world, enemies, player)
+
+    chasers = set(buckets.chase)
+    agents: dict[Entity, tuple[int, int]] = {}
+    obstacles: list[tuple[int, int]] = []
+    for enemy in enemies:
+        pos = world.get_component(enemy, PositionComponent)
+        if not pos:
+            continue
+        if enemy in chasers:
+            agents[enemy] = (pos.x, pos.y)
+        else:
+            obstacles.append((pos.x, pos.y))
+    return plan_cooperative(game_map, distance_map, agents, obstacles, window)
+
+
+def _next_chase_step(
+    world: "World",
+    enemy: "Entity",
+    game_map: "GameMap",
+    enemy_pos: PositionComponent,
+    player_pos: PositionComponent,
+    chase_map: "DijkstraMap | None",
+    path_cache: "PathCache | None",
+) -> tuple[int, int] | None:
+    """プレイヤーを追跡する敵が次に進むタイルを返す。経路がなければNone。"""
+    start = (enemy_pos.x, enemy_pos.y)
+    goal = (player_pos.x, player_pos.y)
+
+    if chase_map is not None:
+        # 距離場はプレイヤーかマップが変わったときだけ再計算される
+        chase_map.update(game_map, goal)
+        return chase_map.next_step(*start)
+
+    if path_cache is not None:
+        # 前回の経路を再利用し、他の敵に塞がれたタイルがあれば計算し直す
+        return path_cache.next_step(
+            enemy,
+            game_map,
+            start,
+            goal,
+            is_blocked=lambda x, y: get_blocking_enemy_at(world, x, y) is not None,
+        )
+
+    # プレイヤーへの経路を探索
+    # 移動コストは一様（歩けるなら1、無理なら無限大）なので、JPSが選ばれる
+    path = find_path(game_map, start, goal, UniformCost(game_map.walkable))
+    if path and len(path) > 1:
+        return path[1]  # 経路の次のステップ
+    return None
@@ -0,0 +1,157 @@
+# roguelike_rpg/application/floor_prefetch.py
+"""
+次のフロアの先行生成を行うアプリケーションサービス
+フロアに入った時点で、次のフロアの計画（マップと配置するエンティティの一覧）を
+ワーカースレッドで生成し始める。階段を下りたときには、でき上がった計画を
+ワールドに配置するだけで済む。各フロアは階層ごとに決まるシードから生成されるため、
+先行生成したフロアとその場で生成したフロアは同じものになる。
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from roguelike_rpg.domain.mapgen import FloorPlan
+
+
+def floor_seed(seed: int, dungeon_level: int) -> int:
+    """
+    ゲームのシードと階層から、その階層のフロアを生成する乱数のシードを求める。
+    文字列から乱数生成器を初期化するため、実行ごとのハッシュの違いに左右されない。
+
+    Args:
+        seed (int): ゲーム全体のシード。
+        dungeon_level (int): 階層。
+
+    Returns:
+        int: その階層のフロアの乱数のシード。
+    """
+    return random.Random(f"{seed}:{dungeon_level}").getrandbits(64)
+
+
+class FloorPrefetcher:
+    """
+    フロアの計画を1つ先まで、ワーカースレッドで生成しておく。
+
+    計画を受け取るときに先行生成が終わっていればヒット、終わっていなければミスとする。
+    ミスの場合、生成中であればその完了を待ち、まだ始まっていなければ取り消して
+    その場で生成する。先行生成を無効にした場合は、常にその場で生成する（ミス）。
+
+    Attributes:
+        hits (int): 先行生成が終わっていた回数。
+        misses (int): 先行生成が終わっていなかった回数。
+        hit_time (float): ヒットしたときに計画を受け取るまでの時間の合計（秒）。
+        miss_time (float): ミスしたときに計画を受け取るまでの時間の合計（秒）。
+        last_wait (float): 最後に計画を受け取るまでの時間（秒）。
+    """
+
+    def __init__(self, plan: Callable[[int], "FloorPlan"], background: bool = True):
+        """
+        Args:
+            plan (Callable[[int], FloorPlan]): 階層を受け取ってフロアの計画を返す関数。
+                ワーカースレッドから呼ばれるため、ワールドに触れてはならない。
+            background (bool): Falseの場合、先行生成を行わない。
+        """
+        self._plan = plan
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-prefetch")
+            if background
+            else None
+        )
+        # 先行生成中の (階層, 計画)
+        self._pending: tuple[int, Future["FloorPlan"]] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+        self.last_wait = 0.0
+
+    def prefetch(self, dungeon_level: int) -> None:
+        """
+        指定された階層のフロアの生成をワーカースレッドで始める。
+        以前に先行生成していた別の階層の計画は破棄される。
+
+        Args:
+            dungeon_level (int): 先行生成する階層。
+        """
+        if self._executor is None:
+            return
+        self._discard_pending()
+        future = self._executor.submit(self._plan, dungeon_level)
+        self._pending = (dungeon_level, future)
+
+    def is_ready(self, dungeon_level: int) -> bool:
+        """指定された階層のフロアの先行生成が終わっているかどうかを返す。"""
+        return (
+            self._pending is not None
+            and self._pending[0] == dungeon_level
+            and self._pending[1].done()
+        )
+
+    def take(self, dungeon_level: int) -> "FloorPlan":
+        """
+        指定された階層のフロアの計画を返す。先行生成が終わっていればその計画を、
+        そうでなければ完了を待つか、その場で生成した計画を返す。
+
+        Args:
+            dungeon_level (int): 階層。
+
+        Returns:
+            FloorPlan: フロアの計画。
+        """
+        start = time.perf_counter()
+        plan = None
+        ready = False
+        if self._pending is not None and self._pending[0] == dungeon_level:
+            future = self._pending[1]
+            self._pending = None
+            ready = future.done()
+            # 生成中であれば、最初からやり直すより完了を待つ方が早い
+            if ready or not future.cancel():
+                plan = future.result()
+        else:
+            self._discard_pending()
+        if plan is None:
+            plan = self._plan(dungeon_level)
+
+        self.last_wait = time.perf_counter() - start
+        if ready:
+            self.hits += 1
+            self.hit_time += self.last_wait
+        else:
+            self.misses += 1
+            self.miss_time += self.last_wait
+        return plan
+
+    def report(self) -> str:
+        """ヒットとミスの回数と、計画を受け取るまでの平均時間を表す文字列を返す。"""
+
+        def average(total: float, count: int) -> float:
+            return total / count * 1000 if count else 0.0
+
+        return (
+            f"prefetch hits: {self.hits} "
+            f"(avg {average(self.hit_time, self.hits):.2f} ms), "
+            f"misses: {self.misses} "
+            f"(avg {average(self.miss_time, self.misses):.2f} ms)"
+        )
+
+    def close(self) -> None:
+        """
+        先行生成を取りやめ、ワーカースレッドを終了させる。
+        生成中の計画があれば、その完了を待ってから戻る。
+        """
+        self._discard_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _discard_pending(self) -> None:
+        """先行生成中の計画を破棄する（生成中のものは完了後に捨てられる）。"""
+        if self._pending is not None:
+            self._pending[1].cancel()
+            self._pending = None
@@ -3,50 +3,115 @@
 ゲームのメインループと状態管理
 """
 
+import random
 from typing import Any
 
-from roguelike_rpg.application.enemy_ai_service import process_enemy_turn
+from roguelike_rpg.application.dormancy_service import (
+    NOISE_RADIUS,
+    DormancyScheduler,
+)
+from roguelike_rpg.application.enemy_ai_service import (
+    SIGHT_RADIUS,
+    EnemyBuckets,
+    classify_enemies,
+    plan_enemy_moves,
+    process_enemy_turn,
+)
+from roguelike_rpg.application.floor_prefetch import FloorPrefetcher, floor_seed
 from roguelike_rpg.application.game_state import GameState
 from roguelike_rpg.application.services import (
+    attack_all,
     descend_stairs,
     move_player,
     pickup_item,
+    remove_stale_items,
     toggle_equipment,
     use_item,
 )
+from roguelike_rpg.domain.dijkstra import DijkstraMap
+from roguelike_rpg.domain.ecs.command_buffer import CommandBuffer
 from roguelike_rpg.domain.ecs.components import (
+    AwakeComponent,
     ConsumableComponent,
     EnemyComponent,
     EquippableComponent,
     HealthComponent,
     InventoryComponent,
     PositionComponent,
+    SpeedComponent,
 )
 from roguelike_rpg.domain.ecs.world import World
 from roguelike_rpg.domain.factories import create_player
-from roguelike_rpg.domain.mapgen import generate_map
+from roguelike_rpg.domain.mapgen import (
+    FloorPlan,
+    MapGenerator,
+    build_floor,
+    plan_floor,
+)
 from roguelike_rpg.domain.message_log import MessageLog
+from roguelike_rpg.domain.path_cache import PathCache
+from roguelike_rpg.domain.spawn import SpawnTable
+from roguelike_rpg.domain.turn_scheduler import (
+    NORMAL_SPEED,
+    TurnScheduler,
+    action_delay,
+)
 from roguelike_rpg.infrastructure.data_loader import load_json_data
 
+# 洞窟のフロアを生成する間隔（階層数）
+CAVE_FLOOR_INTERVAL = 3
+
 
 class GameLoop:
     """
     ゲームのメインループを管理し、ゲームの全体的な状態を保持する。
     """
 
-    def __init__(self, map_width: int, map_height: int):
+    def __init__(
+        self,
+        map_width: int,
+        map_height: int,
+        use_flow_field: bool = True,
+        cooperative: bool = True,
+        map_generator: MapGenerator | None = None,
+        seed: int | None = None,
+        prefetch: bool = True,
+    ):
         """
         GameLoopのコンストラクタ。
         ゲームの初期状態（ワールド、マップ、プレイヤー）をセットアップする。
+        use_flow_field がFalseの場合、敵は共有の距離場の代わりに、
+        敵ごとにキャッシュされた経路でプレイヤーを追跡する。
+        cooperative がTrueの場合、追跡する敵の移動は予約表を用いて
+        まとめて計画され、互いの移動先がぶつからないようになる。
+        map_generator はフロアの生成方式で、省略した場合は複数の部屋と通路の
+        フロアを基本とし、CAVE_FLOOR_INTERVAL 階ごとに洞窟のフロアを生成する。
+        各フロアは seed と階層から決まる乱数で生成される（seed の省略時はランダム）。
+        prefetch がTrueの場合、次のフロアはワーカースレッドで先に生成しておく。
         """
         # 定数
-        MAX_ENEMIES_PER_ROOM = 2
-        MAX_ITEMS_PER_ROOM = 2
         ENEMY_DATA_PATH = "assets/enemies.json"
         ITEM_DATA_PATH = "assets/items.json"
 
         # ゲームの状態を保持する属性
-        self.world = World()
+        # 位置やHPなどの数値コンポーネントはNumPy配列にまとめて保持する
+        self.world = World(columnar=True)
+        # 敵のターン中の構造変更を記録し、ターン終了時にまとめて適用する
+        self.commands = CommandBuffer(self.world)
+        # 全ての敵で共有する、プレイヤーへの距離場
+        self.chase_map = DijkstraMap()
+        self.use_flow_field = use_flow_field
+        self.cooperative = cooperative
+        self.map_generator = map_generator
+        self.map_width = map_width
+        self.map_height = map_height
+        self.seed = random.getrandbits(64) if seed is None else seed
+        # 距離場を使わない場合の、敵ごとの経路キャッシュ
+        self.path_cache = PathCache()
+        # プレイヤーから遠い敵を休眠させ、毎ターンの処理から外す
+        self.dormancy = DormancyScheduler()
+        # 起きている敵を、次に行動する時刻の順に取り出すスケジューラ
+        self.scheduler = TurnScheduler()
         self.message_log = MessageLog()
         self.game_state = GameState.PLAYERS_TURN
         self.dungeon_level = 1
@@ -57,23 +122,26 @@ class GameLoop:
         # データをロード
         self.enemy_data: dict[str, Any] = load_json_data(ENEMY_DATA_PATH)
         self.item_data: dict[str, Any] = load_json_data(ITEM_DATA_PATH)
+        # 階層ごとの出現表は、データの読み込み時に一度だけ作って全フロアで使い回す
+        self.enemy_table = SpawnTable.from_enemies(self.enemy_data)
+        self.item_table = SpawnTable.from_items(self.item_data)
+
+        # 次のフロアを先に生成しておくためのワーカー
+        self.prefetcher = FloorPrefetcher(self._plan_floor, background=prefetch)
 
         # マップを生成し、敵とアイテムを配置
-        self.game_map, player_start_pos = generate_map(
-            world=self.world,
-            map_width=map_width,
-            map_height=map_height,
-            dungeon_level=self.dungeon_level,
-            max_enemies_per_room=MAX_ENEMIES_PER_ROOM,
-            max_items_per_room=MAX_ITEMS_PER_ROOM,
-            enemy_data=self.enemy_data,
-            item_data=self.item_data,
+        self.game_map, player_start_pos = build_floor(
+            self.world, self._plan_floor(self.dungeon_level)
         )
 
         # プレイヤーをマップの安全な開始位置に配置
         self.player = create_player(
             self.world, player_start_pos[0], player_start_pos[1]
         )
+        # 敵は休眠した状態で配置され、プレイヤーが近づくと起きる
+        self.dormancy.register_floor(self.world)
+        self.update_fov()
+        self.prefetcher.prefetch(self.dungeon_level + 1)
 
         self.message_log.add_message("ダンジョンへようこそ！")
 
@@ -197,6 +265,12 @@ class GameLoop:
                 )
                 for log in logs:
                     self.message_log.add_message(log)
+                # 狙った場所の物音で、周囲の休眠中の敵が起きる
+                self._wake(
+                    self.dormancy.wake_near(
+                        self.world, *self.targeting_cursor, NOISE_RADIUS
+                    )
+                )
 
                 self.item_to_use = None
                 self.targeting_cursor = None
@@ -209,35 +283,200 @@ class GameLoop:
             self.message_log.add_message("ターゲット選択をキャンセルした。")
 
     def process_enemy_turns(self) -> None:
-        """全ての敵のターンを処理し、プレイヤーのターンに戻す。"""
-        enemies = list(self.world.get_entities_with(EnemyComponent))
-        for enemy in enemies:
-            enemy_health = self.world.get_component(enemy, HealthComponent)
-            if enemy_health and enemy_health.current_hp > 0:
-                enemy_action_logs = process_enemy_turn(
-                    self.world, enemy, self.player, self.game_map
-                )
-                for log in enemy_action_logs:
-                    self.message_log.add_message(log)
+        """
+        プレイヤーの1回の行動に要する時間だけゲームの時刻を進め、その間に行動の
+        時刻が来た敵を、時刻の順に行動させてからプレイヤーのターンに戻す。
+        速い敵はこの間に複数回行動し、遅い敵は行動しないこともある。
+        処理するのは起きている敵と、このターンに順番が回ってきた休眠中の敵だけである。
+        """
+        self.update_fov()
+        player_pos = self.world.get_component(self.player, PositionComponent)
+        if player_pos:
+            # プレイヤーの周囲の休眠中の敵を起こす
+            self._wake(self.dormancy.wake_near(self.world, player_pos.x, player_pos.y))
+        # 順番が回ってきた休眠中の敵のうち、行動する敵（混乱中など）は起こす
+        dormant = classify_enemies(self.world, self.dormancy.due(), self.player)
+        self._wake(
+            self.dormancy.wake(
+                self.world, dormant.attack + dormant.chase + dormant.confused
+            )
+        )
 
+        # プレイヤーが次に行動する時刻までに、行動の時刻が来た敵だけを取り出す
+        player_speed = self.world.get_component(self.player, SpeedComponent)
+        horizon = self.scheduler.time + action_delay(
+            player_speed.speed if player_speed else NORMAL_SPEED
+        )
+        idle: dict[Any, None] = {}
+        while enemies := self.scheduler.pop_due(horizon):
+            buckets = self._process_enemy_batch(enemies)
+            idle.update(dict.fromkeys(buckets.idle))
+            for enemy in enemies:
+                self.scheduler.schedule(enemy, self._action_delay(enemy))
+            # 同期点: 同じ時刻の行動で記録された構造変更をまとめて適用する
+            self.commands.flush()
+        self.scheduler.advance_to(horizon)
+
+        # 遠く離れたまま何もしなかった敵を休眠させる
+        for enemy in self.dormancy.rest(self.world, list(idle), self.player):
+            self.scheduler.remove(enemy)
         self._cleanup_dead_entities()
+        # 同期点: このターンに記録された構造変更をまとめて適用する
+        self.commands.flush()
 
         self.check_game_over()
         if self.game_state != GameState.GAME_OVER:
             self.game_state = GameState.PLAYERS_TURN
 
+    def _process_enemy_batch(self, enemies: list[Any]) -> EnemyBuckets:
+        """
+        同じ時刻に行動する敵をまとめて処理する。
+
+        Args:
+            enemies (list[Entity]): このバッチで行動する敵。
+
+        Returns:
+            EnemyBuckets: 行動の種類ごとに振り分けた敵。
+        """
+        enemies = [
+            enemy
+            for enemy in enemies
+            if self.world.is_alive(enemy)
+            and self.world.get_component(enemy, PositionComponent)
+            and self.world.get_component(enemy, HealthComponent)
+        ]
+        # 敵はプレイヤーの視界（update_fov で更新済み）に入っているときだけ
+        # プレイヤーに気づく
+        player_pos = self.world.get_component(self.player, PositionComponent)
+        visible = self.game_map.visible
+        # 事前処理: 敵をまとめて判定し、行動の種類ごとに振り分ける
+        # 視界外の敵（idle）はこのターン何もしないため、個別の処理を行わない
+        buckets = classify_enemies(self.world, enemies, self.player, visible)
+
+        # 隣接している敵の攻撃はまとめて処理する
+        if buckets.attack:
+            for log in attack_all(self.world, buckets.attack, self.player):
+                self.message_log.add_message(log)
+            # 戦闘の物音で、周囲の休眠中の敵が起きる
+            self._wake(
+                self.dormancy.wake_near(
+                    self.world, player_pos.x, player_pos.y, NOISE_RADIUS
+                )
+            )
+
+        # 追跡する敵だけが経路探索の段階に進む
+        chasers = buckets.chase
+        planned_moves = None
+        if self.cooperative and chasers:
+            # 追跡する敵の移動をまとめて計画し、計画の優先度の順に行動させる
+            # このバッチで行動しない起きている敵も、障害物として扱う
+            awake = list(
+                self.world.get_entities_with(
+                    EnemyComponent, AwakeComponent, PositionComponent, HealthComponent
+                )
+            )
+            plan = plan_enemy_moves(
+                self.world,
+                awake,
+                self.player,
+                self.game_map,
+                self.chase_map,
+                buckets=buckets,
+            )
+            planned_moves = plan.moves
+            chasers = plan.order
+
+        for enemy in chasers + buckets.confused:
+            enemy_action_logs = process_enemy_turn(
+                self.world,
+                enemy,
+                self.player,
+                self.game_map,
+                self.commands,
+                self.chase_map if self.use_flow_field else None,
+                self.path_cache,
+                planned_moves,
+                visible,
+            )
+            for log in enemy_action_logs:
+                self.message_log.add_message(log)
+        return buckets
+
+    def _wake(self, enemies: list[Any]) -> None:
+        """起きた敵を、現在の時刻から1回の行動の時間の後に行動するよう登録する。"""
+        for enemy in enemies:
+            self.scheduler.schedule(enemy, self._action_delay(enemy))
+
+    def close(self) -> None:
+        """
+        先行生成を取りやめ、ワーカースレッドを終了させる。
+        GameLoop を使い終えたら必ず呼び出すこと（with 文でも使える）。
+        """
+        self.prefetcher.close()
+
+    def __enter__(self) -> "GameLoop":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _action_delay(self, entity: Any) -> int:
+        """エンティティが1回の行動に要する時間を返す。"""
+        speed = self.world.get_component(entity, SpeedComponent)
+        return action_delay(speed.speed if speed else NORMAL_SPEED)
+
+    def _plan_floor(self, dungeon_level: int) -> FloorPlan:
+        """
+        指定された階層のフロアの計画を作る。深い階層ほど部屋ごとの敵とアイテムが増える。
+        乱数はゲームのシードと階層から決まるため、いつ呼んでも同じ計画になる。
+        ワーカースレッドからも呼ばれるため、ワールドやゲームの状態には触れない。
+        """
+        return plan_floor(
+            map_width=self.map_width,
+            map_height=self.map_height,
+            dungeon_level=dungeon_level,
+            max_enemies_per_room=2 + dungeon_level // 2,
+            max_items_per_room=2 + dungeon_level // 3,
+            enemy_data=self.enemy_data,
+            item_data=self.item_data,
+            generator=self._generator_for(dungeon_level),
+            enemy_table=self.enemy_table,
+            item_table=self.item_table,
+            rng=random.Random(floor_seed(self.seed, dungeon_level)),
+        )
+
+    def _generator_for(self, dungeon_level: int) -> MapGenerator:
+        """指定された階層のフロアの生成方式を返す。"""
+        if self.map_generator is not None:
+            return self.map_generator
+        if dungeon_level % CAVE_FLOOR_INTERVAL == 0:
+            return MapGenerator.CAVE
+        return MapGenerator.BSP
+
+    def update_fov(self) -> None:
+        """
+        プレイヤーの視界を更新する。視界はマップに保持され、描画と敵の知覚に用いられる。
+        プレイヤーが動くかマップが変わったときだけ再計算される。
+        """
+        player_pos = self.world.get_component(self.player, PositionComponent)
+        if player_pos:
+            self.game_map.update_fov((player_pos.x, player_pos.y), SIGHT_RADIUS)
+
     def _cleanup_dead_entities(self) -> None:
-        """HPが0以下のエンティティをワールドから削除し、キルカウントを更新する。"""
-        dead_entities = []
-        for entity in self.world.get_entities_with(HealthComponent):
-            if self.world.get_component(entity, HealthComponent).current_hp <= 0:
-                if entity != self.player:
-                    dead_entities.append(entity)
-
-        for entity in dead_entities:
-            if self.world.get_component(entity, EnemyComponent):
-                self.kill_count += 1
-            self.world.delete_entity(entity)
+        """
+        HPが0以下のエンティティの削除をコマンドバッファに記録し、キルカウントを更新する。
+        """
+        entities = list(self.world.get_entities_with(HealthComponent))
+        # HPをまとめて取得し、倒れたエンティティを一括で判定する
+        current_hp = self.world.gather(entities, HealthComponent, "current_hp")
+        for entity, hp in zip(entities, current_hp):
+            if hp <= 0 and entity != self.player:
+                if self.world.has_any(entity, EnemyComponent):
+                    self.kill_count += 1
+                self.commands.delete_entity(entity)
+                self.path_cache.forget(entity)
+                self.dormancy.forget(entity)
+                self.scheduler.remove(entity)
 
     def check_game_over(self) -> None:
         """プレイヤーが死亡したかチェックし、ゲームの状態を更新する。"""
@@ -251,30 +490,28 @@ class GameLoop:
         self.dungeon_level += 1
         self.message_log.add_message("あなたはより深い階層へと下りていった...")
 
-        # プレイヤー以外のすべてのエンティティを削除
-        for entity in list(self.world.get_entities_with(PositionComponent)):
-            if entity != self.player:
-                self.world.delete_entity(entity)
-
-        # 新しいマップを生成（難易度上昇）
-        max_enemies_per_room = 2 + self.dungeon_level // 2
-        max_items_per_room = 2 + self.dungeon_level // 3
-
-        self.game_map, player_start_pos = generate_map(
-            world=self.world,
-            map_width=self.game_map.width,
-            map_height=self.game_map.height,
-            dungeon_level=self.dungeon_level,
-            max_enemies_per_room=max_enemies_per_room,
-            max_items_per_room=max_items_per_room,
-            enemy_data=self.enemy_data,
-            item_data=self.item_data,
+        # プレイヤー以外のすべてのエンティティをまとめて削除
+        self.world.delete_entities(
+            entity
+            for entity in self.world.get_entities_with(PositionComponent)
+            if entity != self.player
         )
+        # 削除されたエンティティへの参照がインベントリ等に残らないようにする
+        remove_stale_items(self.world, self.player)
+        self.path_cache.clear()
+        self.scheduler.clear()
+
+        # 新しいマップを生成（先行生成が終わっていれば、それを配置するだけで済む）
+        plan = self.prefetcher.take(self.dungeon_level)
+        self.game_map, player_start_pos = build_floor(self.world, plan)
 
         # プレイヤーを新しい位置に配置
         player_pos = self.world.get_component(self.player, PositionComponent)
         if player_pos:
             player_pos.x, player_pos.y = player_start_pos
+        self.dormancy.register_floor(self.world)
+        self.update_fov()
+        self.prefetcher.prefetch(self.dungeon_level + 1)
 
         # ゲーム状態をプレイヤーのターンに戻す
         self.game_state = GameState.PLAYERS_TURN
@@ -8,6 +8,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from roguelike_rpg.domain.ecs.components import (
     AttackPowerComponent,
     ConfusionComponent,
@@ -35,9 +37,8 @@ from roguelike_rpg.application.game_state import GameState
 
 def get_blocking_enemy_at(world: World, x: int, y: int) -> Entity | None:
     """指定された位置にいる、移動を妨げる敵エンティティを取得する。"""
-    for entity in world.get_entities_with(PositionComponent, EnemyComponent):
-        pos = world.get_component(entity, PositionComponent)
-        if pos and pos.x == x and pos.y == y:
+    for entity in world.entities_at(x, y):
+        if world.has_any(entity, EnemyComponent):
             return entity
     return None
 
@@ -79,6 +80,47 @@ def attack(world: World, attacker: Entity, defender: Entity) -> list[str]:
     return logs
 
 
+def attack_all(world: World, attackers: list[Entity], defender: Entity) -> list[str]:
+    """
+    複数の攻撃者が1体の防御者を順に攻撃する処理をまとめて行い、ログを返す。
+    攻撃力は配列としてまとめて取得し、ダメージと防御者のHPの推移を一括で計算する。
+    結果とログは、attackers の順に attack を呼び出した場合と同じになる。
+    攻撃者はすべて NameComponent と AttackPowerComponent を持っている必要がある。
+
+    Args:
+        world (World): 現在のECSワールド。
+        attackers (list[Entity]): 攻撃するエンティティ（攻撃する順）。
+        defender (Entity): 攻撃されるエンティティ。
+
+    Returns:
+        list[str]: 攻撃結果のログメッセージ。
+    """
+    defender_name = world.get_component(defender, NameComponent)
+    defender_defense = world.get_component(defender, DefenseComponent)
+    defender_health = world.get_component(defender, HealthComponent)
+    if not (attackers and defender_name and defender_defense and defender_health):
+        return []
+
+    # ダメージ計算（0以下のダメージは通らない）
+    damage = world.gather(attackers, AttackPowerComponent, "power").astype(int)
+    damage -= defender_defense.defense
+    hp_after = defender_health.current_hp - np.cumsum(np.maximum(damage, 0))
+    defender_health.current_hp = int(hp_after[-1])
+
+    logs = []
+    for attacker, hit, hp in zip(attackers, damage.tolist(), hp_after.tolist()):
+        attacker_name = world.get_component(attacker, NameComponent).name
+        if hit > 0:
+            logs.append(
+                f"{attacker_name}は{defender_name.name}に{hit}のダメージを与えた！"
+            )
+            if hp <= 0:
+                logs.append(f"{defender_name.name}は倒れた！")
+        else:
+            logs.append(f"{attacker_name}の攻撃は{defender_name.name}に効かなかった。")
+    return logs
+
+
 def descend_stairs(world: World, actor: Entity) -> bool:
     """
     アクタが階段の上にいるかどうかを判定する。
@@ -94,9 +136,8 @@ def descend_stairs(world: World, actor: Entity) -> bool:
     if not actor_pos:
         return False
 
-    for stairs_entity in world.get_entities_with(StairsComponent, PositionComponent):
-        stairs_pos = world.get_component(stairs_entity, PositionComponent)
-        if stairs_pos and stairs_pos.x == actor_pos.x and stairs_pos.y == actor_pos.y:
+    for entity in world.entities_at(actor_pos.x, actor_pos.y):
+        if world.has_any(entity, StairsComponent):
             return True
 
     return False
@@ -123,7 +164,7 @@ def move_player(
         return logs
 
     # 移動先のタイルが歩行可能かチェック
-    if not game_map.tiles[dest_x, dest_y].walkable:
+    if not game_map.walkable[dest_x, dest_y]:
         return logs
 
     # 移動先に敵エンティティがいないかチェック
@@ -152,10 +193,9 @@ def pickup_item(world: World, actor: Entity) -> list[str]:
 
     # アクタの足元にあるアイテムを探す
     item_to_pickup = None
-    for item_entity in world.get_entities_with(ItemComponent, PositionComponent):
-        item_pos = world.get_component(item_entity, PositionComponent)
-        if item_pos and item_pos.x == actor_pos.x and item_pos.y == actor_pos.y:
-            item_to_pickup = item_entity
+    for entity in world.entities_at(actor_pos.x, actor_pos.y):
+        if world.has_any(entity, ItemComponent):
+            item_to_pickup = entity
             break
 
     if not item_to_pickup:
@@ -236,24 +276,23 @@ def use_item(
             radius = effect.get("radius", 3)
             damage = effect.get("amount", 12)
             logs.append("火球が炸裂し、周囲を炎に包んだ！")
-            for enemy in world.get_entities_with(
-                EnemyComponent, PositionComponent, HealthComponent
-            ):
-                pos = world.get_component(enemy, PositionComponent)
-                distance = (
-                    (pos.x - target_xy[0]) ** 2 + (pos.y - target_xy[1]) ** 2
-                ) ** 0.5
-                if distance <= radius:
-                    enemy_name = world.get_component(enemy, NameComponent).name
-                    enemy_health = world.get_component(enemy, HealthComponent)
+            # 空間索引から爆発の範囲内にいるエンティティだけを取り出す
+            for entity in world.entities_in_radius(target_xy[0], target_xy[1], radius):
+                if not world.has_any(entity, EnemyComponent):
+                    continue
+                enemy_health = world.get_component(entity, HealthComponent)
+                enemy_name = world.get_component(entity, NameComponent)
+                if enemy_health and enemy_name:
                     enemy_health.current_hp -= damage
-                    logs.append(f"{enemy_name}は{damage}のダメージを受けた！")
+                    logs.append(f"{enemy_name.name}は{damage}のダメージを受けた！")
             consumed = True
 
     if consumed:
         inventory = world.get_component(user, InventoryComponent)
         if inventory:
             inventory.items.remove(item_entity)
+        # 使い切ったアイテムはワールドから削除し、IDを再利用できるようにする
+        world.delete_entity(item_entity)
 
     return logs
 
@@ -279,6 +318,25 @@ def calculate_score(game_loop: "GameLoop") -> int:
     return score
 
 
+def remove_stale_items(world: World, actor: Entity) -> None:
+    """
+    インベントリと装備スロットから、既に削除されたアイテムへの参照を取り除く。
+
+    Args:
+        world (World): 現在のECSワールド。
+        actor (Entity): インベントリ・装備を持つアクタのエンティティ。
+    """
+    inventory = world.get_component(actor, InventoryComponent)
+    if inventory:
+        inventory.items[:] = [item for item in inventory.items if world.is_alive(item)]
+
+    equipment = world.get_component(actor, EquipmentComponent)
+    if equipment:
+        for slot, item in equipment.slots.items():
+            if item is not None and not world.is_alive(item):
+                equipment.slots[slot] = None
+
+
 def toggle_equipment(world: World, actor: Entity, item_entity: Entity) -> list[str]:
     """
     指定されたアイテムを装備、または装備解除する。
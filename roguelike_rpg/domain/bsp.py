@@ -0,0 +1,155 @@
+# roguelike_rpg/domain/bsp.py
+"""
+二分空間分割（BSP）による部屋と通路のレイアウト生成
+マップを再帰的に2分割し、分割の末端（葉）ごとに部屋を1つ置いて、
+兄弟の部分木どうしを通路でつなぐ。部屋と通路の掘削はNumPyのスライス代入で行う。
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from itertools import product
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# これより小さい領域は分割しない（分割後の各領域の最小の幅・高さ）
+MIN_LEAF_SIZE = 10
+# 部屋の最小の幅・高さ
+MIN_ROOM_SIZE = 4
+
+
+@dataclass(frozen=True)
+class Room:
+    """
+    長方形の部屋。範囲は [x1, x2) x [y1, y2) の半開区間で表す。
+
+    Attributes:
+        x1 (int): 左端のx座標。
+        y1 (int): 上端のy座標。
+        x2 (int): 右端の次のx座標。
+        y2 (int): 下端の次のy座標。
+    """
+
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        """部屋の中心の座標を返す。"""
+        return (self.x1 + self.x2) // 2, (self.y1 + self.y2) // 2
+
+    @property
+    def slices(self) -> Tuple[slice, slice]:
+        """マップの配列から部屋の範囲を取り出す添字を返す。"""
+        return slice(self.x1, self.x2), slice(self.y1, self.y2)
+
+    def tiles(self) -> List[Tuple[int, int]]:
+        """部屋のすべてのタイルの座標を返す（敵やアイテムの配置候補）。"""
+        return list(product(range(self.x1, self.x2), range(self.y1, self.y2)))
+
+
+def generate_bsp(
+    width: int, height: int, rng: Optional[random.Random] = None
+) -> Tuple[np.ndarray, List[Room]]:
+    """
+    BSPで部屋と通路を配置し、床にするタイルのマスクと部屋の一覧を返す。
+    マップの外周は必ず壁のまま残る。すべての部屋は通路でつながっている。
+
+    Args:
+        width (int): マップの幅。
+        height (int): マップの高さ。
+        rng (Optional[random.Random]): 乱数生成器。省略時は random モジュールの
+            状態から作った生成器を使う（random.seed で再現できる）。
+
+    Returns:
+        Tuple[np.ndarray, List[Room]]: 床にするタイルの (width, height) のブール配列と、
+            部屋の一覧（分割木の左から右の順）。
+    """
+    rng = rng or random.Random(random.getrandbits(64))
+    floor = np.zeros((width, height), dtype=bool)
+    rooms: List[Room] = []
+    _build(floor, rooms, 1, 1, width - 1, height - 1, rng)
+    return floor, rooms
+
+
+def _build(
+    floor: np.ndarray,
+    rooms: List[Room],
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+    rng: random.Random,
+) -> Room:
+    """
+    領域 [x1, x2) x [y1, y2) を分割して部屋と通路を掘り、
+    他の部分木と通路でつなぐための代表の部屋を返す。
+    """
+    width, height = x2 - x1, y2 - y1
+    can_split_x = width >= 2 * MIN_LEAF_SIZE
+    can_split_y = height >= 2 * MIN_LEAF_SIZE
+    if not (can_split_x or can_split_y):
+        room = _carve_room(floor, x1, y1, x2, y2, rng)
+        rooms.append(room)
+        return room
+
+    # 長い方の辺を分割する（同程度ならランダム）
+    if can_split_x and can_split_y:
+        split_x = width > height * 1.25 or (
+            height <= width * 1.25 and rng.random() < 0.5
+        )
+    else:
+        split_x = can_split_x
+
+    if split_x:
+        cut = x1 + rng.randrange(MIN_LEAF_SIZE, width - MIN_LEAF_SIZE + 1)
+        first = _build(floor, rooms, x1, y1, cut, y2, rng)
+        second = _build(floor, rooms, cut, y1, x2, y2, rng)
+    else:
+        cut = y1 + rng.randrange(MIN_LEAF_SIZE, height - MIN_LEAF_SIZE + 1)
+        first = _build(floor, rooms, x1, y1, x2, cut, rng)
+        second = _build(floor, rooms, x1, cut, x2, y2, rng)
+
+    _carve_tunnel(floor, first.center, second.center, rng)
+    return first if rng.random() < 0.5 else second
+
+
+def _carve_room(
+    floor: np.ndarray, x1: int, y1: int, x2: int, y2: int, rng: random.Random
+) -> Room:
+    """
+    葉の領域の中にランダムな大きさの部屋を掘る。
+    隣の領域の部屋とつながらないよう、右端と下端の1列は壁として残す。
+    """
+    room_width = _room_size(x2 - x1 - 1, rng)
+    room_height = _room_size(y2 - y1 - 1, rng)
+    left = x1 + rng.randrange(x2 - x1 - room_width)
+    top = y1 + rng.randrange(y2 - y1 - room_height)
+    room = Room(left, top, left + room_width, top + room_height)
+    floor[room.slices] = True
+    return room
+
+
+def _room_size(available: int, rng: random.Random) -> int:
+    """使える幅 available の中で、部屋の幅（または高さ）をランダムに決める。"""
+    if available <= MIN_ROOM_SIZE:
+        return max(available, 1)
+    return rng.randrange(MIN_ROOM_SIZE, available + 1)
+
+
+def _carve_tunnel(
+    floor: np.ndarray,
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    rng: random.Random,
+) -> None:
+    """2点間をL字の通路でつなぐ。横と縦の通路をそれぞれ1回のスライス代入で掘る。"""
+    (x1, y1), (x2, y2) = start, end
+    # 曲がり角を (x2, y1) にするか (x1, y2) にするかをランダムに決める
+    corner_x, corner_y = (x2, y1) if rng.random() < 0.5 else (x1, y2)
+    floor[min(x1, x2) : max(x1, x2) + 1, corner_y] = True
+    floor[corner_x, min(y1, y2) : max(y1, y2) + 1] = True
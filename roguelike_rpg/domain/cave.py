@@ -0,0 +1,143 @@
+# roguelike_rpg/domain/cave.py
+"""
+セルオートマトンによる洞窟の生成
+ランダムに壁を散らしたマップを、「周囲に壁が多ければ壁、少なければ床」という
+規則で数回平滑化して洞窟の形を作る。周囲の壁の数はマップ全体をずらした配列の
+足し合わせで一度に数える。最後に連結成分を求め、最大の洞窟だけを残す。
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 初期状態で壁にするタイルの割合
+INITIAL_WALL_RATIO = 0.45
+# 平滑化の回数
+SMOOTHING_STEPS = 5
+# 自分を含む周囲3x3の壁の数がこれ以上なら壁にする
+WALL_THRESHOLD = 5
+
+
+def generate_cave(
+    width: int, height: int, rng: Optional[random.Random] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    洞窟を生成し、床にするタイルのマスクと、敵やアイテムを配置できるタイルの
+    マスクを返す。床はすべて1つにつながっており、マップの外周は必ず壁になる。
+    配置できるタイルは、周囲8方向がすべて床である開けたタイルである
+    （そのようなタイルがなければ床全体）。
+
+    Args:
+        width (int): マップの幅。
+        height (int): マップの高さ。
+        rng (Optional[random.Random]): 乱数生成器。省略時は random モジュールの
+            状態から作った生成器を使う（random.seed で再現できる）。
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 床のマスクと配置できるタイルのマスク
+            （いずれも (width, height) のブール配列）。
+    """
+    rng = rng or random.Random(random.getrandbits(64))
+    noise = np.random.default_rng(rng.getrandbits(64))
+    wall = noise.random((width, height)) < INITIAL_WALL_RATIO
+    _fill_border(wall)
+    for _ in range(SMOOTHING_STEPS):
+        wall = neighbor_count(wall) >= WALL_THRESHOLD
+        _fill_border(wall)
+
+    floor = largest_component(~wall)
+    # 周囲3x3がすべて床なら、壁の数は0
+    spawnable = floor & (neighbor_count(~floor) == 0)
+    if not spawnable.any():
+        spawnable = floor.copy()
+    return floor, spawnable
+
+
+def _fill_border(wall: np.ndarray) -> None:
+    """マップの外周を壁にする。"""
+    wall[0, :] = wall[-1, :] = True
+    wall[:, 0] = wall[:, -1] = True
+
+
+def neighbor_count(mask: np.ndarray) -> np.ndarray:
+    """
+    各タイルについて、自分を含む周囲3x3のうち mask が True のタイルの数を数える。
+    マップの外は True として数える（外周付近は壁に囲まれているとみなす）。
+
+    Args:
+        mask (np.ndarray): (width, height) のブール配列。
+
+    Returns:
+        np.ndarray: 各タイルの数を格納した (width, height) の配列。
+    """
+    width, height = mask.shape
+    padded = np.pad(mask, 1, constant_values=True).astype(np.uint8)
+    counts = np.zeros((width, height), dtype=np.uint8)
+    for dx in range(3):
+        for dy in range(3):
+            counts += padded[dx : dx + width, dy : dy + height]
+    return counts
+
+
+def largest_component(mask: np.ndarray) -> np.ndarray:
+    """
+    8方向の隣接でつながったタイルの連結成分のうち、最大のものだけを残す。
+
+    各列（x方向の並び）の連続した区間（ラン）を配列演算でまとめて求め、
+    隣り合う行のランどうしの重なりを二分探索で列挙して、Union-Findで
+    ランを併合する。Pythonのループはタイル数ではなく、ランの重なりの数しか回らない。
+
+    Args:
+        mask (np.ndarray): (width, height) のブール配列。
+
+    Returns:
+        np.ndarray: 最大の連結成分だけが True のブール配列。
+    """
+    width, height = mask.shape
+    # 行（y）ごとに、x方向のランの始点と終点（終点は含まない）を求める
+    rows = np.zeros((height, width + 2), dtype=np.int8)
+    rows[:, 1:-1] = mask.T
+    edges = np.diff(rows, axis=1)
+    run_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    if len(starts) == 0:
+        return np.zeros_like(mask)
+
+    # 行の番号を上位に持たせた、すべてのランにわたって単調増加するキー
+    stride = width + 2
+    start_keys = run_rows * stride + starts
+    end_keys = run_rows * stride + ends
+    # 各ランと8方向で接する、1つ前の行のランの範囲 [low, high)
+    previous = (run_rows - 1) * stride
+    low = np.searchsorted(end_keys, previous + starts - 1, side="right")
+    high = np.searchsorted(start_keys, previous + ends + 1, side="left")
+    counts = np.maximum(high - low, 0)
+    runs = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    touching = np.repeat(low, counts) + offsets
+
+    parent = list(range(len(starts)))
+
+    def find(run: int) -> int:
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    for a, b in zip(runs.tolist(), touching.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+
+    roots = np.array([find(run) for run in range(len(starts))])
+    sizes = np.bincount(roots, weights=ends - starts)
+    keep = roots == np.argmax(sizes)
+
+    # 残すランを、始点に+1・終点に-1を置いた累積和でタイルに塗り戻す
+    painted = np.zeros((height, width + 1), dtype=np.int32)
+    np.add.at(painted, (run_rows[keep], starts[keep]), 1)
+    np.add.at(painted, (run_rows[keep], ends[keep]), -1)
+    return (np.cumsum(painted, axis=1)[:, :width] > 0).T
@@ -0,0 +1,222 @@
+# roguelike_rpg/domain/cooperative.py
+"""
+予約表を用いた協調経路探索（Windowed Hierarchical Cooperative A*）
+複数のエンティティが同じ目標を追跡するとき、優先度の高い順に時空間
+(x, y, t) でのA*探索を行い、決まった経路を予約表に書き込む。後から探索する
+エンティティは予約済みのマスを避けるため、互いの移動先がぶつからない。
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .dijkstra import NEIGHBORS, UNREACHABLE
+
+if TYPE_CHECKING:
+    from .dijkstra import DijkstraMap
+    from .game_map import GameMap
+
+Point = Tuple[int, int]
+
+# 既定の探索の時間窓（何ターン先までの経路を予約するか）
+DEFAULT_WINDOW = 8
+# エージェント1体あたりの、時空間探索で展開するノード数の上限
+DEFAULT_MAX_EXPANSIONS = 48
+# 待機を含む1ターンの行動 (8方向の移動と、その場での待機)
+ACTIONS: Tuple[Point, ...] = NEIGHBORS + ((0, 0),)
+
+
+class ReservationTable:
+    """
+    時空間のマスの予約表。
+    (x, y, t) の予約は「時刻 t にそのマスを占有する」ことを表す。
+    すれ違い（2体が同じ時刻に互いのマスへ移動する）を防ぐため、
+    マス間の移動も予約する。
+
+    Attributes:
+        static (Set[Point]): すべての時刻で占有されているマス。
+    """
+
+    def __init__(self, static: Iterable[Point] = ()):
+        self.static: Set[Point] = set(static)
+        self._cells: Set[Tuple[int, int, int]] = set()
+        self._edges: Set[Tuple[Point, Point, int]] = set()
+
+    def reserve(self, x: int, y: int, t: int) -> None:
+        """時刻 t のマス (x, y) を予約する。"""
+        self._cells.add((x, y, t))
+
+    def is_free(self, x: int, y: int, t: int) -> bool:
+        """時刻 t にマス (x, y) が空いているかどうかを返す。"""
+        return (x, y) not in self.static and (x, y, t) not in self._cells
+
+    def crosses(self, origin: Point, destination: Point, t: int) -> bool:
+        """時刻 t から t+1 への移動が、予約済みの移動とすれ違うかどうかを返す。"""
+        return (destination, origin, t) in self._edges
+
+    def reserve_path(self, path: List[Point], until: int) -> None:
+        """
+        経路を予約する。path[t] が時刻 t の位置で、経路の終点は時刻 until まで
+        占有し続ける。
+        """
+        for t, (x, y) in enumerate(path):
+            self._cells.add((x, y, t))
+            if t > 0:
+                self._edges.add((path[t - 1], (x, y), t - 1))
+        last_x, last_y = path[-1]
+        for t in range(len(path), until + 1):
+            self._cells.add((last_x, last_y, t))
+
+
+@dataclass
+class CooperativePlan:
+    """
+    協調経路探索の結果。
+
+    Attributes:
+        moves (Dict[Hashable, Optional[Point]]): エージェントごとの次の位置。
+            待機する場合はNone。
+        order (List[Hashable]): 行動させるべき順序（優先度の高い順）。
+        paths (Dict[Hashable, List[Point]]): エージェントごとの予約した経路。
+        expanded (int): 時空間探索で展開したノードの総数。
+    """
+
+    moves: Dict[Hashable, Optional[Point]] = field(default_factory=dict)
+    order: List[Hashable] = field(default_factory=list)
+    paths: Dict[Hashable, List[Point]] = field(default_factory=dict)
+    expanded: int = 0
+
+
+def plan_cooperative(
+    game_map: "GameMap",
+    distance_map: "DijkstraMap",
+    agents: Dict[Hashable, Point],
+    obstacles: Iterable[Point] = (),
+    window: int = DEFAULT_WINDOW,
+    max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+) -> CooperativePlan:
+    """
+    目標に隣接するまで追跡する複数のエージェントの移動を、まとめて計画する。
+
+    目標に近いエージェントから順に、時間窓 window の範囲で時空間A*を行う。
+    ヒューリスティックには distance_map の距離（他のエージェントを無視した
+    真の距離）を用いるため、探索は目標に向かってほぼ一直線に進む。
+    探索が済んだ経路は予約表に書き込まれ、後のエージェントはそれを避ける。
+
+    Args:
+        game_map (GameMap): 対象のマップ。
+        distance_map (DijkstraMap): 目標への距離場（更新済みであること）。
+        agents (Dict[Hashable, Point]): エージェントとその現在位置。
+        obstacles (Iterable[Point]): 動かないエンティティなど、常に塞がれたマス。
+        window (int): 何ターン先まで経路を予約するか。
+        max_expansions (int): エージェント1体あたりの展開ノード数の上限。
+            群衆の後方で目標に近づけないエージェントの探索を打ち切るために用いる。
+
+    Returns:
+        CooperativePlan: 各エージェントの次の位置と行動順。
+    """
+    # 探索中の参照を速くするため、配列をPythonのリストに変換しておく
+    distances = distance_map.distances.tolist()
+    walkable = game_map.walkable.tolist()
+    table = ReservationTable(obstacles)
+    # 目標そのもの（プレイヤーの位置）には入れない
+    table.static.add(distance_map.goal)
+
+    plan = CooperativePlan()
+    plan.order = sorted(
+        agents, key=lambda agent: distances[agents[agent][0]][agents[agent][1]]
+    )
+    # まだ計画していない（行動順が後の）エージェントの現在位置。
+    # 行動順が後のエージェントはまだ動いていないため、次のターンには入れない
+    waiting = set(agents.values())
+    for agent in plan.order:
+        start = agents[agent]
+        waiting.discard(start)
+        table.reserve(*start, 0)
+        path, expanded = _space_time_astar(
+            walkable, distances, table, start, window, waiting, max_expansions
+        )
+        plan.expanded += expanded
+        table.reserve_path(path, window)
+        plan.paths[agent] = path
+        plan.moves[agent] = path[1] if len(path) > 1 and path[1] != start else None
+    return plan
+
+
+def _space_time_astar(
+    walkable: List[List[bool]],
+    distances: List[List[int]],
+    table: ReservationTable,
+    start: Point,
+    window: int,
+    waiting: Set[Point],
+    max_expansions: int,
+) -> Tuple[List[Point], int]:
+    """
+    予約表を避けながら、時空間で目標に隣接するマスへの経路を探索する。
+    時間窓の終わりまでに隣接できなければ、窓の終わりで最も目標に近い経路を返す。
+    展開ノード数が上限に達した場合は、それまでに見つけた中で最も目標に近い
+    （同じ近さなら最も先の時刻まで予約できる）ノードへの経路を返す。
+
+    Returns:
+        Tuple[List[Point], int]: 時刻ごとの位置の列と、展開したノード数。
+    """
+    width, height = len(walkable), len(walkable[0])
+
+    def heuristic(x: int, y: int) -> int:
+        # 目標に隣接するまでの歩数
+        return max(distances[x][y] - 1, 0)
+
+    start_node = (start[0], start[1], 0)
+    g_score = {start_node: 0}
+    came_from: Dict[Tuple[int, int, int], Tuple[int, int, int]] = {}
+    closed = set()
+    open_nodes = [(heuristic(*start), 0, start_node)]
+    expanded = 0
+    best = (heuristic(*start), 0, start_node)
+
+    def build_path(node: Tuple[int, int, int]) -> List[Point]:
+        path = [node[:2]]
+        while node in came_from:
+            node = came_from[node]
+            path.append(node[:2])
+        return path[::-1]
+
+    while open_nodes:
+        _, _, node = heapq.heappop(open_nodes)
+        if node in closed:
+            continue
+        x, y, t = node
+        if t == window or distances[x][y] <= 1:
+            return build_path(node), expanded
+        if expanded >= max_expansions:
+            return build_path(best[2]), expanded
+        closed.add(node)
+        expanded += 1
+        best = min(best, (heuristic(x, y), -t, node))
+
+        for dx, dy in ACTIONS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height) or not walkable[nx][ny]:
+                continue
+            if distances[nx][ny] == UNREACHABLE and (dx or dy):
+                continue
+            if not table.is_free(nx, ny, t + 1) or table.crosses((x, y), (nx, ny), t):
+                continue
+            if t == 0 and (nx, ny) in waiting:
+                continue
+            neighbor = (nx, ny, t + 1)
+            tentative_g_score = g_score[node] + 1
+            if tentative_g_score < g_score.get(neighbor, UNREACHABLE):
+                g_score[neighbor] = tentative_g_score
+                came_from[neighbor] = node
+                # 同じ f の場合は、時刻の進んだ（目標に近い）ノードを優先する
+                heapq.heappush(
+                    open_nodes,
+                    (tentative_g_score + heuristic(nx, ny), -(t + 1), neighbor),
+                )
+
+    # 予約で完全に囲まれている場合は、それまでで最良のノードまで進む
+    return build_path(best[2]), expanded
@@ -0,0 +1,194 @@
+# roguelike_rpg/domain/dijkstra.py
+"""
+ダイクストラマップ（距離場）
+目標地点からマップ上の全タイルまでの歩数を一度に計算し、
+各エンティティは距離が小さくなる方向へ1歩ずつ進むだけで目標を追跡できる。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .game_map import GameMap
+
+# 到達できないタイルの距離
+UNREACHABLE = np.iinfo(np.int32).max
+
+# 隣接タイルへの移動方向 (8方向)
+NEIGHBORS: Tuple[Tuple[int, int], ...] = (
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+)
+
+
+def compute_distance_field(walkable: np.ndarray, goal: Tuple[int, int]) -> np.ndarray:
+    """
+    目標地点から各タイルまでの最短歩数（8方向移動、コスト1）を計算する。
+    幅優先探索の前線をタイルの添字の配列として保持し、前線の8方向の隣接タイルを
+    配列演算でまとめて求めて1歩ずつ進める。処理量は到達できるタイルの数に比例し、
+    マップ全体の大きさと最大距離の積には比例しないため、通路の長い大きなマップでも速い。
+
+    Args:
+        walkable (np.ndarray): 各タイルが歩行可能かどうかの (width, height) 配列。
+        goal (Tuple[int, int]): 目標地点の座標 (x, y)。
+
+    Returns:
+        np.ndarray: 各タイルまでの歩数の (width, height) の int32 配列。
+                    到達できないタイルは UNREACHABLE。
+    """
+    width, height = walkable.shape
+    # 外周に歩行不可の枠を付けて平坦化し、隣接タイルの添字が端で折り返さないようにする
+    stride = height + 2
+    unvisited = np.zeros((width + 2) * stride, dtype=bool)
+    unvisited.reshape(width + 2, stride)[1:-1, 1:-1] = walkable
+    distances = np.full(unvisited.shape, UNREACHABLE, dtype=np.int32)
+    offsets = np.array([dx * stride + dy for dx, dy in NEIGHBORS], dtype=np.intp)
+
+    # 重複の除去に使う、各タイルに最後に書き込んだ候補の番号
+    owner = np.empty(unvisited.shape, dtype=np.intp)
+
+    frontier = np.array([(goal[0] + 1) * stride + goal[1] + 1], dtype=np.intp)
+    distances[frontier] = 0
+    unvisited[frontier] = False
+    step = 0
+    while len(frontier):
+        step += 1
+        reached = (frontier[:, None] + offsets).ravel()
+        reached = reached[unvisited[reached]]
+        # 複数の前線のタイルから同じタイルに届くため、タイルごとに1つの候補だけを残す
+        # （ソートせずに、各タイルへ最後に書き込まれた候補を残す）
+        order = np.arange(len(reached))
+        owner[reached] = order
+        reached = reached[owner[reached] == order]
+        distances[reached] = step
+        unvisited[reached] = False
+        frontier = reached
+    return distances.reshape(width + 2, stride)[1:-1, 1:-1].copy()
+
+
+def compute_distance_fields(
+    walkable: np.ndarray, goals: Sequence[Tuple[int, int]]
+) -> np.ndarray:
+    """
+    複数の目標地点それぞれについて、距離場をまとめて計算する。
+    すべての距離場を1つの3次元配列として同時に膨張させるため、
+    小さな範囲で多数の距離場が必要な場合に配列演算の呼び出し回数を抑えられる。
+
+    Args:
+        walkable (np.ndarray): 各タイルが歩行可能かどうかの (width, height) 配列。
+        goals (Sequence[Tuple[int, int]]): 目標地点の座標 (x, y) の並び。
+
+    Returns:
+        np.ndarray: 目標地点ごとの距離場を並べた (len(goals), width, height) の配列。
+    """
+    count = len(goals)
+    layers = np.arange(count)
+    goal_x = np.array([goal[0] for goal in goals], dtype=np.intp)
+    goal_y = np.array([goal[1] for goal in goals], dtype=np.intp)
+    shape = (count, *walkable.shape)
+
+    distances = np.full(shape, UNREACHABLE, dtype=np.int32)
+    distances[layers, goal_x, goal_y] = 0
+    # まだ距離が決まっていない歩行可能なタイル
+    unvisited = np.broadcast_to(walkable, shape).copy()
+    unvisited[layers, goal_x, goal_y] = False
+
+    frontier = np.zeros(shape, dtype=bool)
+    frontier[layers, goal_x, goal_y] = True
+    reached = np.empty_like(frontier)
+    step = 0
+    while True:
+        step += 1
+        # 前線を8方向に1タイル膨張させる（縦方向→横方向の順で膨張させる）
+        column = frontier.copy()
+        column[..., 1:] |= frontier[..., :-1]
+        column[..., :-1] |= frontier[..., 1:]
+        reached[...] = column
+        reached[:, 1:, :] |= column[:, :-1, :]
+        reached[:, :-1, :] |= column[:, 1:, :]
+        reached &= unvisited
+        if not reached.any():
+            return distances
+        distances[reached] = step
+        unvisited &= ~reached
+        frontier, reached = reached, frontier
+
+
+class DijkstraMap:
+    """
+    目標地点への距離場を保持し、目標地点かマップが変わったときだけ再計算する。
+
+    Attributes:
+        distances (Optional[np.ndarray]): 最後に計算した距離場。
+        goal (Optional[Tuple[int, int]]): 距離場の目標地点。
+        recomputations (int): 距離場を計算した回数。
+    """
+
+    def __init__(self) -> None:
+        self.distances: Optional[np.ndarray] = None
+        self.goal: Optional[Tuple[int, int]] = None
+        self.recomputations = 0
+        self._game_map: Optional["GameMap"] = None
+        self._map_version = -1
+
+    def update(self, game_map: "GameMap", goal: Tuple[int, int]) -> bool:
+        """
+        必要であれば距離場を再計算する。
+
+        Args:
+            game_map (GameMap): 対象のマップ。
+            goal (Tuple[int, int]): 目標地点の座標 (x, y)。
+
+        Returns:
+            bool: 再計算した場合はTrue、キャッシュを使った場合はFalse。
+        """
+        if (
+            self.distances is not None
+            and self._game_map is game_map
+            and self._map_version == game_map.version
+            and self.goal == goal
+        ):
+            return False
+
+        self.distances = compute_distance_field(game_map.walkable, goal)
+        self.goal = goal
+        self._game_map = game_map
+        self._map_version = game_map.version
+        self.recomputations += 1
+        return True
+
+    def distance(self, x: int, y: int) -> int:
+        """指定されたタイルから目標地点までの歩数を返す。"""
+        return int(self.distances[x, y])
+
+    def next_step(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        指定されたタイルから、目標地点へ1歩近づく隣接タイルを返す。
+
+        Args:
+            x (int): 現在のx座標。
+            y (int): 現在のy座標。
+
+        Returns:
+            Optional[Tuple[int, int]]: 次に進むタイルの座標。
+                                       目標地点にいるか到達できない場合はNone。
+        """
+        distances = self.distances
+        width, height = distances.shape
+        best = distances[x, y]
+        step = None
+        for dx, dy in NEIGHBORS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and distances[nx, ny] < best:
+                best = distances[nx, ny]
+                step = (nx, ny)
+        return step
@@ -0,0 +1,206 @@
+"""
+数値コンポーネントの列指向（Struct of Arrays）ストア
+頻繁に参照される数値コンポーネントのフィールドを、エンティティのスロット番号で
+添字付けされたNumPy配列にまとめて格納する。
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from .component import Component
+from .components import (
+    AttackPowerComponent,
+    DefenseComponent,
+    HealthComponent,
+    PositionComponent,
+)
+from .entity import Entity, entity_index
+
+# 列指向で格納するコンポーネント型と、そのフィールド名
+COLUMNAR_FIELDS: dict[type[Component], tuple[str, ...]] = {
+    PositionComponent: ("x", "y"),
+    HealthComponent: ("max_hp", "current_hp"),
+    AttackPowerComponent: ("power",),
+    DefenseComponent: ("defense",),
+}
+
+# 配列の初期容量
+INITIAL_CAPACITY = 64
+
+
+def _make_field_property(component_type: type[Component], field: str) -> property:
+    """プロキシの属性アクセスを、ストアの配列への読み書きに変換するプロパティを作る。"""
+
+    def getter(self):
+        if self._store is None:
+            return self._detached_values[field]
+        return int(self._store.arrays[component_type][field][self._slot])
+
+    def setter(self, value):
+        if self._store is None:
+            self._detached_values[field] = value
+        else:
+            self._store.arrays[component_type][field][self._slot] = value
+
+    return property(getter, setter)
+
+
+def _make_proxy_type(component_type: type[Component]) -> type[Component]:
+    """
+    コンポーネント型を継承し、フィールドを配列へのプロパティに置き換えた型を作る。
+    等価性は元の型と同じく値で比較し、通常のコンポーネントとも比較できる。
+    """
+    fields = COLUMNAR_FIELDS[component_type]
+
+    def __eq__(self, other):
+        if not isinstance(other, component_type):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in fields)
+
+    namespace: dict[str, object] = {
+        field: _make_field_property(component_type, field) for field in fields
+    }
+    namespace["component_type"] = component_type
+    namespace["__eq__"] = __eq__
+    namespace["__hash__"] = None
+    return type(f"Columnar{component_type.__name__}", (component_type,), namespace)
+
+
+def unwrap(component: Component) -> Component:
+    """
+    プロキシであれば、現在の値を持つ元の型の通常のコンポーネントに変換する。
+    プロキシでなければそのまま返す。
+
+    Args:
+        component (Component): 変換するコンポーネント。
+
+    Returns:
+        Component: 元の型のコンポーネント。
+    """
+    component_type = getattr(component, "component_type", None)
+    if component_type is None:
+        return component
+    return component_type(
+        **{
+            field: getattr(component, field)
+            for field in COLUMNAR_FIELDS[component_type]
+        }
+    )
+
+
+class ColumnStore:
+    """
+    COLUMNAR_FIELDS に登録されたコンポーネントを、フィールドごとの密な配列で
+    保持するストア。get_component で返されるのは、配列の1要素を読み書きする
+    プロキシであり、元のコンポーネント型のサブクラスとして振る舞う。
+
+    Attributes:
+        arrays (dict[type, dict[str, np.ndarray]]): 型・フィールドごとの値の配列。
+        present (dict[type, np.ndarray]): 各スロットがその型を持つかどうかの配列。
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._capacity = capacity
+        self.arrays: dict[type[Component], dict[str, np.ndarray]] = {
+            component_type: {
+                field: np.zeros(capacity, dtype=np.int32) for field in fields
+            }
+            for component_type, fields in COLUMNAR_FIELDS.items()
+        }
+        self.present: dict[type[Component], np.ndarray] = {
+            component_type: np.zeros(capacity, dtype=bool)
+            for component_type in COLUMNAR_FIELDS
+        }
+        self._proxy_types = {
+            component_type: _make_proxy_type(component_type)
+            for component_type in COLUMNAR_FIELDS
+        }
+
+    @staticmethod
+    def is_columnar(component_type: type[Component]) -> bool:
+        """指定された型が列指向で格納される型かどうかを返す。"""
+        return component_type in COLUMNAR_FIELDS
+
+    @staticmethod
+    def slot_of(entity: Entity) -> int:
+        """
+        エンティティに対応する配列のスロット番号を返す。
+        エンティティIDのインデックス部分を使うため、IDが再利用される限り
+        配列はエンティティの同時生存数に応じた大きさに保たれる。
+        """
+        return entity_index(entity)
+
+    def slots(self, entities: Iterable[Entity]) -> np.ndarray:
+        """エンティティの並びを、スロット番号の配列に変換する。"""
+        return np.fromiter((self.slot_of(e) for e in entities), dtype=np.intp)
+
+    def _ensure_capacity(self, slot: int) -> None:
+        """スロットが収まるように、すべての配列を倍々で拡張する。"""
+        if slot < self._capacity:
+            return
+        capacity = self._capacity
+        while capacity <= slot:
+            capacity *= 2
+        for component_type, fields in self.arrays.items():
+            for field, array in fields.items():
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[: self._capacity] = array
+                fields[field] = grown
+            present = np.zeros(capacity, dtype=bool)
+            present[: self._capacity] = self.present[component_type]
+            self.present[component_type] = present
+        self._capacity = capacity
+
+    def attach(self, entity: Entity, component: Component) -> Component:
+        """
+        コンポーネントの値を配列に書き込み、その要素を参照するプロキシを返す。
+
+        Args:
+            entity (Entity): コンポーネントを持つエンティティ。
+            component (Component): 列指向で格納するコンポーネント。
+
+        Returns:
+            Component: 配列の要素を読み書きするプロキシ。
+        """
+        component_type = type(component)
+        slot = self.slot_of(entity)
+        self._ensure_capacity(slot)
+        fields = self.arrays[component_type]
+        for field in COLUMNAR_FIELDS[component_type]:
+            fields[field][slot] = getattr(component, field)
+        self.present[component_type][slot] = True
+
+        proxy = object.__new__(self._proxy_types[component_type])
+        proxy._store = self
+        proxy._slot = slot
+        return proxy
+
+    def detach(self, entity: Entity, proxy: Component) -> None:
+        """
+        エンティティのスロットを空きにする。
+        取り外されたプロキシは、その時点の値の写しを保持する通常の値に戻る。
+
+        Args:
+            entity (Entity): コンポーネントを取り外すエンティティ。
+            proxy (Component): attach で返されたプロキシ。
+        """
+        component_type = proxy.component_type
+        slot = self.slot_of(entity)
+        proxy._detached_values = {
+            field: getattr(proxy, field) for field in COLUMNAR_FIELDS[component_type]
+        }
+        proxy._store = None
+        self.present[component_type][slot] = False
+
+    def column(self, component_type: type[Component], field: str) -> np.ndarray:
+        """
+        指定された型・フィールドの配列全体を返す（スロット番号で添字付けされる）。
+        返された配列への書き込みは、そのままコンポーネントの値に反映される。
+        容量の拡張で配列は作り直されるため、参照を保持せず都度取得すること。
+        位置の配列へ直接書き込んだ場合は、World.rebuild_spatial_index で
+        空間索引を更新する必要がある。
+        """
+        return self.arrays[component_type][field]
@@ -0,0 +1,93 @@
+"""
+ECSのコマンドバッファ
+システムの処理中に発生したワールドの構造変更（エンティティの生成・削除、
+コンポーネントの追加・削除）を記録し、同期点でまとめて適用する。
+"""
+
+from __future__ import annotations
+
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Any, Type
+
+from .component import Component
+from .entity import Entity
+
+if TYPE_CHECKING:
+    from .world import World
+
+
+class CommandType(Enum):
+    """コマンドバッファに記録される操作の種類"""
+
+    ADD_COMPONENTS = auto()  # コンポーネントの追加（エンティティ生成を含む）
+    REMOVE_COMPONENT = auto()  # コンポーネントの削除
+    DELETE_ENTITY = auto()  # エンティティの削除
+
+
+class CommandBuffer:
+    """
+    ワールドへの構造変更を記録し、flush で記録順に適用するバッファ。
+    システムはワールドのクエリを走査しながら安全に変更を記録できるため、
+    走査前に結果をリストへ複製する必要がない。
+    """
+
+    def __init__(self, world: "World"):
+        self._world = world
+        self._commands: list[tuple[CommandType, Entity, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def create_entity(self, *components: Component) -> Entity:
+        """
+        エンティティの生成を記録する。
+        IDはこの時点で割り当てられるが、コンポーネントは flush まで追加されない。
+
+        Args:
+            *components: エンティティに追加するコンポーネントの可変長引数。
+
+        Returns:
+            Entity: 割り当てられたエンティティのID。
+        """
+        entity = self._world.reserve_entity()
+        self._commands.append((CommandType.ADD_COMPONENTS, entity, components))
+        return entity
+
+    def add_component(self, entity: Entity, component: Component) -> None:
+        """エンティティへのコンポーネントの追加を記録する。"""
+        self._commands.append((CommandType.ADD_COMPONENTS, entity, (component,)))
+
+    def remove_component(self, entity: Entity, component_type: Type[Component]) -> None:
+        """エンティティからのコンポーネントの削除を記録する。"""
+        self._commands.append((CommandType.REMOVE_COMPONENT, entity, component_type))
+
+    def delete_entity(self, entity: Entity) -> None:
+        """エンティティの削除を記録する。"""
+        self._commands.append((CommandType.DELETE_ENTITY, entity, None))
+
+    def flush(self) -> None:
+        """
+        記録された変更を記録順にワールドへ適用し、バッファを空にする。
+        連続するエンティティ削除は World.delete_entities でまとめて適用する。
+        """
+        commands = self._commands
+        self._commands = []
+        pending_deletes: list[Entity] = []
+
+        for command_type, entity, payload in commands:
+            if command_type == CommandType.DELETE_ENTITY:
+                pending_deletes.append(entity)
+                continue
+            if pending_deletes:
+                self._world.delete_entities(pending_deletes)
+                pending_deletes = []
+            if not self._world.is_alive(entity):
+                # 記録後に削除されたエンティティへの変更は適用しない
+                continue
+            if command_type == CommandType.ADD_COMPONENTS:
+                self._world.add_components(entity, *payload)
+            elif command_type == CommandType.REMOVE_COMPONENT:
+                self._world.remove_component(entity, payload)
+
+        if pending_deletes:
+            self._world.delete_entities(pending_deletes)
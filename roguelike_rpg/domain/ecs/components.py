@@ -15,11 +15,29 @@ from .entity import Entity
 class PositionComponent(Component):
     """
     エンティティの位置情報（x, y座標）を管理するコンポーネント。
+    ワールドに追加されている間は、座標の変更がワールドの空間索引に通知される。
     """
 
     x: int
     y: int
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # ワールドが登録した通知先があれば、変更前後の座標を通知する
+        on_move = self.__dict__.get("_on_move")
+        if on_move is None or name not in ("x", "y"):
+            object.__setattr__(self, name, value)
+            return
+        old = (self.x, self.y)
+        object.__setattr__(self, name, value)
+        on_move(old, (self.x, self.y))
+
+    def __copy__(self) -> "PositionComponent":
+        # 複製にはワールドの通知先を引き継がない
+        return PositionComponent(self.x, self.y)
+
+    def __deepcopy__(self, memo: dict) -> "PositionComponent":
+        return PositionComponent(self.x, self.y)
+
 
 @dataclass
 class RenderableComponent(Component):
@@ -170,3 +188,26 @@ class EnemyComponent(Component):
     """
 
     pass
+
+
+@dataclass
+class AwakeComponent(Component):
+    """
+    敵が起きていて、毎ターン行動の判定を受けることを示すコンポーネント。
+    このコンポーネントを持たない敵は休眠中であり、間引かれた頻度でしか処理されない。
+
+    Attributes:
+        idle_turns (int): プレイヤーから遠く離れたまま過ごしたターン数。
+    """
+
+    idle_turns: int = 0
+
+
+@dataclass
+class SpeedComponent(Component):
+    """
+    エンティティの行動の速さを管理するコンポーネント。
+    100が標準の速さで、200なら標準の2倍の頻度で、50なら半分の頻度で行動する。
+    """
+
+    speed: int = 100
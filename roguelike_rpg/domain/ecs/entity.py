@@ -1,4 +1,3 @@
-# roguelike_rpg/domain/ecs/entity.py
 """
 ECSのエンティティ型を定義する
 """
@@ -6,4 +5,26 @@ ECSのエンティティ型を定義する
 from typing import NewType
 
 # エンティティは一意なIDを持つ。ここでは整数型として定義する。
+# IDの下位ビットは再利用されるインデックス、上位ビットはそのインデックスの世代を表す。
+# 削除されたエンティティのインデックスは再利用されるが、世代が進むため、
+# 削除前のIDを保持し続けている古いハンドルは新しいエンティティと区別できる。
 Entity = NewType("Entity", int)
+
+# インデックスに割り当てるビット数
+ENTITY_INDEX_BITS = 24
+ENTITY_INDEX_MASK = (1 << ENTITY_INDEX_BITS) - 1
+
+
+def make_entity(index: int, generation: int) -> Entity:
+    """インデックスと世代からエンティティIDを組み立てる。"""
+    return Entity((generation << ENTITY_INDEX_BITS) | index)
+
+
+def entity_index(entity: Entity) -> int:
+    """エンティティIDのインデックス部分を返す。"""
+    return entity & ENTITY_INDEX_MASK
+
+
+def entity_generation(entity: Entity) -> int:
+    """エンティティIDの世代部分を返す。"""
+    return entity >> ENTITY_INDEX_BITS
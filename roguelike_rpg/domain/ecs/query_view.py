@@ -0,0 +1,72 @@
+"""
+クエリビュー
+特定のコンポーネント構成を持つエンティティの集合を、Worldの変更に合わせて
+差分更新し続けるためのクラス。
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+from .component import Component
+from .entity import Entity
+
+
+class QueryView:
+    """
+    指定されたすべてのコンポーネント型を持つエンティティの集合（ライブビュー）。
+    Worldがコンポーネントの追加・削除のたびに更新するため、参照はO(1)で済む。
+
+    走査中にエンティティが追加・削除されても安全なように、走査中の集合を
+    変更する場合は集合を複製してから変更する（コピーオンライト）。
+    走査中のイテレータは変更前の集合をそのまま最後まで返す。
+
+    Attributes:
+        signature (tuple[type[Component], ...]): ビューの条件となるコンポーネント型。
+    """
+
+    def __init__(self, signature: tuple[type[Component], ...]):
+        self.signature = signature
+        self._members: set[Entity] = set()
+        # 現在の集合を走査中のイテレータの数
+        self._readers = 0
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, entity: object) -> bool:
+        return entity in self._members
+
+    def __iter__(self) -> Iterator[Entity]:
+        members = self._members
+        self._readers += 1
+        try:
+            yield from members
+        finally:
+            # 走査中に集合が差し替えられていれば、新しい集合の読み手ではない
+            if members is self._members:
+                self._readers -= 1
+
+    def _prepare_write(self) -> None:
+        """走査中の集合を変更しないよう、必要であれば集合を複製する。"""
+        if self._readers:
+            self._members = set(self._members)
+            self._readers = 0
+
+    def add(self, entity: Entity) -> None:
+        """エンティティをビューに追加する。"""
+        if entity not in self._members:
+            self._prepare_write()
+            self._members.add(entity)
+
+    def discard(self, entity: Entity) -> None:
+        """エンティティをビューから取り除く。含まれていなければ何もしない。"""
+        if entity in self._members:
+            self._prepare_write()
+            self._members.discard(entity)
+
+    def discard_many(self, entities: set[Entity]) -> None:
+        """複数のエンティティをまとめてビューから取り除く。"""
+        if not self._members.isdisjoint(entities):
+            self._prepare_write()
+            self._members.difference_update(entities)
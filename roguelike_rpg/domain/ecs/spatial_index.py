@@ -0,0 +1,96 @@
+"""
+エンティティの位置の空間索引
+座標 (x, y) をキーとして、そのタイルにいるエンティティの集合を保持する（空間ハッシュ）。
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from .entity import Entity
+
+Cell = tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    タイル座標からエンティティを引くための索引。
+    「(x, y) に何がいるか」をO(1)で、「半径r以内に何がいるか」を
+    範囲内のタイル数か占有タイル数の少ない方に比例する時間で答える。
+    """
+
+    def __init__(self):
+        # {(x, y): {Entity, ...}} 空になったタイルはキーごと削除する
+        self._cells: dict[Cell, set[Entity]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(cell) for cell in self._cells.values())
+
+    def insert(self, entity: Entity, x: int, y: int) -> None:
+        """エンティティを (x, y) に登録する。"""
+        cell = self._cells.get((x, y))
+        if cell is None:
+            self._cells[(x, y)] = {entity}
+        else:
+            cell.add(entity)
+
+    def remove(self, entity: Entity, x: int, y: int) -> None:
+        """(x, y) に登録されたエンティティを取り除く。"""
+        cell = self._cells.get((x, y))
+        if cell is None:
+            return
+        cell.discard(entity)
+        if not cell:
+            del self._cells[(x, y)]
+
+    def move(self, entity: Entity, old: Cell, new: Cell) -> None:
+        """エンティティの登録位置を old から new に移す。"""
+        if old == new:
+            return
+        self.remove(entity, *old)
+        self.insert(entity, *new)
+
+    def clear(self) -> None:
+        """すべての登録を取り除く。"""
+        self._cells.clear()
+
+    def rebuild(self, positions: Iterable[tuple[Entity, int, int]]) -> None:
+        """(entity, x, y) の並びから索引全体を作り直す。"""
+        self.clear()
+        for entity, x, y in positions:
+            self.insert(entity, x, y)
+
+    def at(self, x: int, y: int) -> tuple[Entity, ...]:
+        """(x, y) にいるエンティティを返す。"""
+        cell = self._cells.get((x, y))
+        return tuple(cell) if cell else ()
+
+    def in_radius(self, x: int, y: int, radius: float) -> list[Entity]:
+        """
+        (x, y) からのユークリッド距離が radius 以下のタイルにいるエンティティを返す。
+
+        Args:
+            x (int): 中心のx座標。
+            y (int): 中心のy座標。
+            radius (float): 半径。
+
+        Returns:
+            list[Entity]: 範囲内のエンティティのリスト。
+        """
+        reach = int(radius)
+        limit = radius * radius
+        found: list[Entity] = []
+        if (2 * reach + 1) ** 2 <= len(self._cells):
+            # 範囲が狭ければ、範囲内のタイルを順に調べる
+            for cx in range(x - reach, x + reach + 1):
+                for cy in range(y - reach, y + reach + 1):
+                    if (cx - x) ** 2 + (cy - y) ** 2 <= limit:
+                        cell = self._cells.get((cx, cy))
+                        if cell:
+                            found.extend(cell)
+        else:
+            # 範囲が広ければ、占有されているタイルだけを調べる
+            for (cx, cy), cell in self._cells.items():
+                if (cx - x) ** 2 + (cy - y) ** 2 <= limit:
+                    found.extend(cell)
+        return found
@@ -0,0 +1,352 @@
+"""
+コンポーネントの格納方式（ストレージ）
+Worldはここで定義されたストレージのいずれかにコンポーネントを格納する。
+"""
+
+from __future__ import annotations
+
+from enum import Enum, auto
+from typing import Iterable, Iterator, Type
+
+from .component import Component
+from .entity import Entity
+
+
+class StorageMode(Enum):
+    """Worldが使用するコンポーネント格納方式を表す列挙型"""
+
+    SPARSE = auto()  # コンポーネント型ごとに {Entity: Component} の辞書を持つ
+    ARCHETYPE = auto()  # 同じコンポーネント構成のエンティティを1つのテーブルにまとめる
+
+
+class SparseStorage:
+    """
+    コンポーネント型ごとに辞書を持つ格納方式。
+    追加・削除は高速だが、複数の型を指定した検索では集合の積を計算する必要がある。
+    エンティティごとに保持しているコンポーネント型の逆引き索引も持つため、
+    エンティティ単位の操作はそのエンティティのコンポーネント数に比例する時間で済む。
+    """
+
+    def __init__(self):
+        # {ComponentType: {Entity: ComponentInstance}}
+        self._components: dict[type[Component], dict[Entity, Component]] = {}
+        # {Entity: {ComponentType, ...}}
+        self._entity_types: dict[Entity, set[type[Component]]] = {}
+
+    def add(
+        self, entity: Entity, component_type: type[Component], component: Component
+    ) -> None:
+        """エンティティにコンポーネントを追加する（同じ型があれば置き換える）。"""
+        if component_type not in self._components:
+            self._components[component_type] = {}
+        self._components[component_type][entity] = component
+        self._entity_types.setdefault(entity, set()).add(component_type)
+
+    def add_many(
+        self, entity: Entity, components: dict[type[Component], Component]
+    ) -> None:
+        """エンティティに複数のコンポーネントをまとめて追加する。"""
+        for component_type, component in components.items():
+            self.add(entity, component_type, component)
+
+    def get(self, entity: Entity, component_type: Type[Component]) -> Component | None:
+        """エンティティの指定された型のコンポーネントを返す。なければNone。"""
+        return self._components.get(component_type, {}).get(entity)
+
+    def remove(self, entity: Entity, component_type: Type[Component]) -> None:
+        """エンティティから指定された型のコンポーネントを削除する。"""
+        types = self._entity_types.get(entity)
+        if types is None or component_type not in types:
+            return
+        del self._components[component_type][entity]
+        types.discard(component_type)
+        if not types:
+            del self._entity_types[entity]
+
+    def remove_entity(self, entity: Entity) -> None:
+        """エンティティが持つすべてのコンポーネントを削除する。"""
+        for component_type in self._entity_types.pop(entity, ()):
+            del self._components[component_type][entity]
+
+    def remove_entities(self, entities: set[Entity]) -> None:
+        """複数のエンティティが持つすべてのコンポーネントをまとめて削除する。"""
+        for entity in entities:
+            self.remove_entity(entity)
+
+    def component_types(self, entity: Entity) -> frozenset[type[Component]]:
+        """エンティティが持つコンポーネント型の集合を返す。"""
+        return frozenset(self._entity_types.get(entity, ()))
+
+    def query(
+        self, component_types: tuple[type, ...], entities: Iterable[Entity]
+    ) -> Iterator[tuple]:
+        """
+        指定されたすべての型を持つ entities について、
+        (entity, component1, component2, ...) のタプルを順に返す。
+        走査を始めた時点の写しを返すため、走査中の追加・削除の影響を受けない。
+        """
+        members = tuple(entities)
+        columns = [
+            list(map(self._components.get(t, {}).__getitem__, members))
+            for t in component_types
+        ]
+        return zip(members, *columns)
+
+    def entities_with(self, component_types: tuple[type, ...]) -> Iterator[Entity]:
+        """指定されたすべての型を持つエンティティを順に返す。"""
+        # 最初のコンポーネント型を持つエンティティの集合を取得
+        try:
+            entities = set(self._components[component_types[0]].keys())
+        except (KeyError, IndexError):
+            # 該当コンポーネントを持つエンティティが一つもなければ空を返す
+            return
+
+        # 残りのコンポーネント型についても集合をとり、積集合を計算
+        for component_type in component_types[1:]:
+            try:
+                entities.intersection_update(self._components[component_type].keys())
+            except KeyError:
+                # 途中で該当エンティティがなくなれば空を返す
+                return
+
+        # 結果の集合に含まれるエンティティを順に返す
+        yield from entities
+
+
+class Archetype:
+    """
+    同じコンポーネント構成（シグネチャ）を持つエンティティの集合を表すテーブル。
+    コンポーネントは型ごとの列（リスト）に、エンティティと同じ行番号で格納される。
+
+    Attributes:
+        signature (frozenset[type]): このアーキタイプが持つコンポーネント型の集合。
+        entities (list[Entity]): 行番号順に並んだエンティティのリスト。
+        rows (dict[Entity, int]): エンティティから行番号への対応表。
+        columns (dict[type, list[Component]]): コンポーネント型ごとの列。
+    """
+
+    def __init__(self, signature: frozenset[type[Component]]):
+        self.signature = signature
+        self.entities: list[Entity] = []
+        self.rows: dict[Entity, int] = {}
+        self.columns: dict[type[Component], list[Component]] = {
+            component_type: [] for component_type in signature
+        }
+
+    def append(self, entity: Entity, components: dict[type, Component]) -> None:
+        """
+        エンティティを末尾の行に追加する。
+
+        Args:
+            entity (Entity): 追加するエンティティ。
+            components (dict[type, Component]): シグネチャと同じ型を持つコンポーネント。
+        """
+        self.rows[entity] = len(self.entities)
+        self.entities.append(entity)
+        for component_type, column in self.columns.items():
+            column.append(components[component_type])
+
+    def pop(self, entity: Entity) -> dict[type, Component]:
+        """
+        エンティティの行を取り除き、そのコンポーネントを返す。
+        最後の行を空いた位置へ移動させる（swap-remove）ため、O(列数)で完了する。
+
+        Args:
+            entity (Entity): 取り除くエンティティ。
+
+        Returns:
+            dict[type, Component]: 取り除かれた行のコンポーネント。
+        """
+        row = self.rows.pop(entity)
+        last = len(self.entities) - 1
+        components = {}
+        for component_type, column in self.columns.items():
+            components[component_type] = column[row]
+            column[row] = column[last]
+            column.pop()
+
+        moved = self.entities[last]
+        self.entities[row] = moved
+        self.entities.pop()
+        if moved != entity:
+            self.rows[moved] = row
+        return components
+
+    def remove_many(self, entities: set[Entity]) -> None:
+        """
+        複数のエンティティの行を、残る行だけでテーブルを作り直すことで取り除く。
+
+        Args:
+            entities (set[Entity]): 取り除くエンティティの集合。
+        """
+        keep = [row for row, e in enumerate(self.entities) if e not in entities]
+        self.entities = [self.entities[row] for row in keep]
+        for component_type, column in self.columns.items():
+            self.columns[component_type] = [column[row] for row in keep]
+        self.rows = {entity: row for row, entity in enumerate(self.entities)}
+
+
+class ArchetypeStorage:
+    """
+    同じシグネチャを持つエンティティをアーキタイプにまとめて格納する方式。
+    複数の型を指定した検索では、条件を満たすアーキタイプだけを走査すればよく、
+    一時的な集合を作らない。その代わり、コンポーネントの追加・削除では
+    エンティティをアーキタイプ間で移動させる必要がある。
+    """
+
+    def __init__(self):
+        # {Signature: Archetype}
+        self._archetypes: dict[frozenset[type[Component]], Archetype] = {}
+        # エンティティが現在所属しているアーキタイプ
+        self._entity_archetype: dict[Entity, Archetype] = {}
+        # コンポーネント型から、その型を含むアーキタイプへの索引
+        self._archetypes_by_type: dict[type[Component], list[Archetype]] = {}
+        # 検索条件ごとの一致アーキタイプのキャッシュ
+        self._query_cache: dict[frozenset[type[Component]], list[Archetype]] = {}
+
+    def _get_or_create_archetype(
+        self, signature: frozenset[type[Component]]
+    ) -> Archetype:
+        """シグネチャに対応するアーキタイプを返す。なければ作成して索引に登録する。"""
+        archetype = self._archetypes.get(signature)
+        if archetype is not None:
+            return archetype
+
+        archetype = Archetype(signature)
+        self._archetypes[signature] = archetype
+        for component_type in signature:
+            self._archetypes_by_type.setdefault(component_type, []).append(archetype)
+        # 既存の検索キャッシュのうち、新しいアーキタイプが一致するものに追加
+        for query, matches in self._query_cache.items():
+            if query <= signature:
+                matches.append(archetype)
+        return archetype
+
+    def _move(
+        self,
+        entity: Entity,
+        components: dict[type, Component],
+    ) -> None:
+        """エンティティを、componentsの構成に対応するアーキタイプへ配置する。"""
+        if not components:
+            self._entity_archetype.pop(entity, None)
+            return
+        archetype = self._get_or_create_archetype(frozenset(components))
+        archetype.append(entity, components)
+        self._entity_archetype[entity] = archetype
+
+    def add(
+        self, entity: Entity, component_type: type[Component], component: Component
+    ) -> None:
+        """エンティティにコンポーネントを追加する（同じ型があれば置き換える）。"""
+        archetype = self._entity_archetype.get(entity)
+
+        # 同じ型を既に持っている場合は、その場で置き換えるだけでよい
+        if archetype is not None and component_type in archetype.signature:
+            archetype.columns[component_type][archetype.rows[entity]] = component
+            return
+
+        components = archetype.pop(entity) if archetype is not None else {}
+        components[component_type] = component
+        self._move(entity, components)
+
+    def add_many(
+        self, entity: Entity, components: dict[type[Component], Component]
+    ) -> None:
+        """
+        エンティティに複数のコンポーネントをまとめて追加する。
+        アーキタイプ間の移動は最後に一度だけ行う。
+        """
+        archetype = self._entity_archetype.get(entity)
+        merged = archetype.pop(entity) if archetype is not None else {}
+        merged.update(components)
+        self._move(entity, merged)
+
+    def get(self, entity: Entity, component_type: Type[Component]) -> Component | None:
+        """エンティティの指定された型のコンポーネントを返す。なければNone。"""
+        archetype = self._entity_archetype.get(entity)
+        if archetype is None:
+            return None
+        column = archetype.columns.get(component_type)
+        if column is None:
+            return None
+        return column[archetype.rows[entity]]
+
+    def remove(self, entity: Entity, component_type: Type[Component]) -> None:
+        """エンティティから指定された型のコンポーネントを削除する。"""
+        archetype = self._entity_archetype.get(entity)
+        if archetype is None or component_type not in archetype.signature:
+            return
+        components = archetype.pop(entity)
+        del components[component_type]
+        self._move(entity, components)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """エンティティが持つすべてのコンポーネントを削除する。"""
+        archetype = self._entity_archetype.pop(entity, None)
+        if archetype is not None:
+            archetype.pop(entity)
+
+    def remove_entities(self, entities: set[Entity]) -> None:
+        """
+        複数のエンティティをまとめて削除する。
+        アーキタイプの多くの行が削除される場合は、行を1つずつ取り除く代わりに
+        残る行だけでテーブルを1回で作り直す。
+        """
+        by_archetype: dict[int, tuple[Archetype, set[Entity]]] = {}
+        for entity in entities:
+            archetype = self._entity_archetype.pop(entity, None)
+            if archetype is not None:
+                by_archetype.setdefault(id(archetype), (archetype, set()))[1].add(
+                    entity
+                )
+
+        for archetype, removed in by_archetype.values():
+            if len(removed) * 4 >= len(archetype.entities):
+                archetype.remove_many(removed)
+            else:
+                for entity in removed:
+                    archetype.pop(entity)
+
+    def component_types(self, entity: Entity) -> frozenset[type[Component]]:
+        """エンティティが持つコンポーネント型の集合を返す。"""
+        archetype = self._entity_archetype.get(entity)
+        return archetype.signature if archetype is not None else frozenset()
+
+    def matching_archetypes(self, component_types: tuple[type, ...]) -> list[Archetype]:
+        """指定されたすべての型を含むアーキタイプのリストを返す。"""
+        query = frozenset(component_types)
+        matches = self._query_cache.get(query)
+        if matches is None:
+            # 候補が最も少ない型の索引から絞り込む
+            candidates = min(
+                (self._archetypes_by_type.get(t, []) for t in query),
+                key=len,
+                default=[],
+            )
+            matches = [a for a in candidates if query <= a.signature]
+            self._query_cache[query] = matches
+        return matches
+
+    def query(self, component_types: tuple[type, ...]) -> Iterator[tuple]:
+        """
+        指定されたすべての型を持つエンティティについて、
+        (entity, component1, component2, ...) のタプルを順に返す。
+        一致するアーキタイプの列をまとめて走査するため、エンティティごとの検索は不要。
+        """
+        for archetype in self.matching_archetypes(component_types):
+            if not archetype.entities:
+                continue
+            # 走査中の追加・削除で行が入れ替わっても安全なように、行の写しを走査する
+            yield from zip(
+                tuple(archetype.entities),
+                *[tuple(archetype.columns[t]) for t in component_types],
+            )
+
+    def entities_with(self, component_types: tuple[type, ...]) -> Iterable[Entity]:
+        """指定されたすべての型を持つエンティティを順に返す。"""
+        if not component_types:
+            return
+        for archetype in self.matching_archetypes(component_types):
+            # 走査中の追加・削除で行が入れ替わっても安全なように、行の写しを走査する
+            yield from tuple(archetype.entities)
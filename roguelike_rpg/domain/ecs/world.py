@@ -1,4 +1,3 @@
-# roguelike_rpg/domain/ecs/world.py
 """
 ECSのワールドクラス
 すべてのエンティティとコンポーネントを管理する。
@@ -6,10 +5,18 @@ ECSのワールドクラス
 
 from __future__ import annotations
 
-from typing import Iterable, Type, TypeVar
+from functools import partial
+from typing import Any, Iterable, Iterator, Type, TypeVar
 
+import numpy as np
+
+from .columnar import ColumnStore, unwrap
 from .component import Component
-from .entity import Entity
+from .components import PositionComponent
+from .entity import Entity, entity_generation, entity_index, make_entity
+from .query_view import QueryView
+from .spatial_index import SpatialIndex
+from .storage import ArchetypeStorage, SparseStorage, StorageMode
 
 # 型変数TをComponentのサブクラスに制約
 T = TypeVar("T", bound=Component)
@@ -18,14 +25,42 @@ T = TypeVar("T", bound=Component)
 class World:
     """
     エンティティとコンポーネントを管理するコンテナ。
+
+    Attributes:
+        storage_mode (StorageMode): コンポーネントの格納方式。
+        cache_queries (bool): get_entities_with の結果をクエリビューとして
+                              キャッシュし、差分更新するかどうか。
+        columns (ColumnStore | None): 数値コンポーネントの列指向ストア。
+                                      columnar=True の場合のみ作成される。
+        spatial (SpatialIndex): PositionComponentを持つエンティティの空間索引。
     """
 
-    def __init__(self):
-        # 次に生成するエンティティID
-        self._next_entity_id = 0
-        # コンポーネントを格納する辞書
-        # {ComponentType: {Entity: ComponentInstance}}
-        self._components: dict[type[Component], dict[Entity, Component]] = {}
+    def __init__(
+        self,
+        storage_mode: StorageMode = StorageMode.SPARSE,
+        cache_queries: bool = True,
+        columnar: bool = False,
+    ):
+        # インデックスごとの現在の世代（削除のたびに1つ進む）
+        self._generations: list[int] = []
+        # 削除されて再利用を待っているインデックス
+        self._free_indices: list[int] = []
+        # コンポーネントの格納先
+        self.storage_mode = storage_mode
+        if storage_mode == StorageMode.ARCHETYPE:
+            self._storage: SparseStorage | ArchetypeStorage = ArchetypeStorage()
+        else:
+            self._storage = SparseStorage()
+        # 登録済みのクエリビュー
+        # {frozenset[ComponentType]: QueryView}
+        self.cache_queries = cache_queries
+        self._views: dict[frozenset[type[Component]], QueryView] = {}
+        # コンポーネント型から、その型を条件に含むビューへの索引
+        self._views_by_type: dict[type[Component], list[QueryView]] = {}
+        # 位置・HP・攻撃力・防御力をNumPy配列で保持する列指向ストア
+        self.columns: ColumnStore | None = ColumnStore() if columnar else None
+        # 位置からエンティティを引くための空間索引
+        self.spatial = SpatialIndex()
 
     def create_entity(self, *components: Component) -> Entity:
         """
@@ -37,28 +72,61 @@ class World:
         Returns:
             Entity: 新しく生成されたエンティティのID。
         """
-        # 新しいエンティティIDを生成
-        entity = Entity(self._next_entity_id)
-        self._next_entity_id += 1
-        # 指定されたコンポーネントをエンティティに追加
-        for component in components:
-            self.add_component(entity, component)
+        entity = self.reserve_entity()
+        self.add_components(entity, *components)
         return entity
 
+    def reserve_entity(self) -> Entity:
+        """
+        コンポーネントを持たない新しいエンティティIDを割り当てる。
+        コンポーネントの追加を後回しにする場合（コマンドバッファなど）に用いる。
+
+        Returns:
+            Entity: 割り当てられたエンティティのID。
+        """
+        # 空いているインデックスがあれば再利用し、なければ新しく割り当てる
+        if self._free_indices:
+            index = self._free_indices.pop()
+        else:
+            index = len(self._generations)
+            self._generations.append(0)
+        return make_entity(index, self._generations[index])
+
+    def add_components(self, entity: Entity, *components: Component) -> None:
+        """
+        エンティティに複数のコンポーネントをまとめて追加する。
+
+        既に削除されたエンティティの古いハンドルが渡された場合は何もしない。
+
+        Args:
+            entity (Entity): コンポーネントを追加する対象のエンティティ。
+            *components: 追加するコンポーネントの可変長引数。
+        """
+        if not self.is_alive(entity):
+            return
+        prepared = dict(self._prepare_component(entity, c) for c in components)
+        self._storage.add_many(entity, prepared)
+        if PositionComponent in prepared:
+            self._track_position(entity, prepared[PositionComponent])
+        self._update_views_on_add(entity, prepared.keys())
+
     def add_component(self, entity: Entity, component: Component) -> None:
         """
         エンティティにコンポーネントを追加する。
 
+        既に削除されたエンティティの古いハンドルが渡された場合は何もしない。
+
         Args:
             entity (Entity): コンポーネントを追加する対象のエンティティ。
             component (Component): 追加するコンポーネントインスタンス。
         """
-        component_type = type(component)
-        # そのコンポーネント型の辞書がなければ初期化
-        if component_type not in self._components:
-            self._components[component_type] = {}
-        # エンティティIDをキーとしてコンポーネントを格納
-        self._components[component_type][entity] = component
+        if not self.is_alive(entity):
+            return
+        component_type, component = self._prepare_component(entity, component)
+        self._storage.add(entity, component_type, component)
+        if component_type is PositionComponent:
+            self._track_position(entity, component)
+        self._update_views_on_add(entity, (component_type,))
 
     def get_component(self, entity: Entity, component_type: Type[T]) -> T | None:
         """
@@ -71,7 +139,7 @@ class World:
         Returns:
             T | None: 見つかったコンポーネントインスタンス。見つからなければNone。
         """
-        return self._components.get(component_type, {}).get(entity)
+        return self._storage.get(entity, component_type)
 
     def remove_component(self, entity: Entity, component_type: Type[T]) -> None:
         """
@@ -81,26 +149,136 @@ class World:
             entity (Entity): コンポーネントを削除する対象のエンティティ。
             component_type (Type[T]): 削除するコンポーネントの型。
         """
-        if (
-            component_type in self._components
-            and entity in self._components[component_type]
-        ):
-            del self._components[component_type][entity]
+        if component_type is PositionComponent:
+            self._untrack_position(entity)
+        self._detach_columnar(entity, component_type)
+        self._storage.remove(entity, component_type)
+        for view in self._views_by_type.get(component_type, ()):
+            view.discard(entity)
 
     def delete_entity(self, entity: Entity) -> None:
         """
         エンティティとそれに関連するすべてのコンポーネントをワールドから削除する。
 
+        既に削除されたエンティティの古いハンドルが渡された場合は何もしない。
+
         Args:
             entity (Entity): 削除するエンティティ。
         """
-        for component_type in self._components:
-            if entity in self._components[component_type]:
-                del self._components[component_type][entity]
+        if not self.is_alive(entity):
+            return
+        # 逆引き索引により、エンティティが持つ型だけを処理する
+        for component_type in self._storage.component_types(entity):
+            if component_type is PositionComponent:
+                self._untrack_position(entity)
+            self._detach_columnar(entity, component_type)
+            for view in self._views_by_type.get(component_type, ()):
+                view.discard(entity)
+        self._storage.remove_entity(entity)
+        self._release(entity)
+
+    def delete_entities(self, entities: Iterable[Entity]) -> None:
+        """
+        複数のエンティティをまとめてワールドから削除する。
+        フロア全体のエンティティを消去する場合などに、1エンティティずつ削除するより
+        ビューやストレージの更新をまとめて行える。
+
+        Args:
+            entities (Iterable[Entity]): 削除するエンティティ。
+        """
+        removed = {entity for entity in entities if self.is_alive(entity)}
+        if not removed:
+            return
+        affected_types: set[type[Component]] = set()
+        for entity in removed:
+            types = self._storage.component_types(entity)
+            affected_types.update(types)
+            if PositionComponent in types:
+                self._untrack_position(entity)
+            if self.columns is not None:
+                for component_type in types:
+                    self._detach_columnar(entity, component_type)
+
+        affected_views = {
+            id(view): view
+            for component_type in affected_types
+            for view in self._views_by_type.get(component_type, ())
+        }
+        for view in affected_views.values():
+            view.discard_many(removed)
+        self._storage.remove_entities(removed)
+        for entity in removed:
+            self._release(entity)
+
+    def is_alive(self, entity: Entity) -> bool:
+        """
+        エンティティが生存しているか（削除済みの古いハンドルでないか）を判定する。
+        インベントリや装備スロットに残ったエンティティの参照の検証などに用いる。
+
+        Args:
+            entity (Entity): 判定するエンティティ。
+
+        Returns:
+            bool: 生存していればTrue、削除済みまたは未生成であればFalse。
+        """
+        index = entity_index(entity)
+        return (
+            entity >= 0
+            and index < len(self._generations)
+            and self._generations[index] == entity_generation(entity)
+        )
+
+    def _release(self, entity: Entity) -> None:
+        """削除されたエンティティの世代を進め、インデックスを再利用待ちにする。"""
+        index = entity_index(entity)
+        self._generations[index] += 1
+        self._free_indices.append(index)
+
+    def component_types(self, entity: Entity) -> frozenset[type[Component]]:
+        """
+        エンティティが持つコンポーネント型の集合を返す。
+
+        Args:
+            entity (Entity): 対象のエンティティ。
+
+        Returns:
+            frozenset[type[Component]]: コンポーネント型の集合。
+        """
+        return self._storage.component_types(entity)
+
+    def components_of(self, entity: Entity) -> dict[type[Component], Component]:
+        """
+        エンティティが持つすべてのコンポーネントを型をキーとする辞書で返す。
+
+        Args:
+            entity (Entity): 対象のエンティティ。
+
+        Returns:
+            dict[type[Component], Component]: {コンポーネント型: コンポーネント}
+        """
+        return {
+            component_type: self._storage.get(entity, component_type)
+            for component_type in self._storage.component_types(entity)
+        }
+
+    def has_any(self, entity: Entity, *component_types: Type[Component]) -> bool:
+        """
+        エンティティが指定された型のいずれかのコンポーネントを持つかを判定する。
+
+        Args:
+            entity (Entity): 対象のエンティティ。
+            *component_types: 判定するコンポーネント型の可変長引数。
+
+        Returns:
+            bool: いずれかを持っていればTrue。
+        """
+        return not self._storage.component_types(entity).isdisjoint(component_types)
 
     def get_entities_with(self, *component_types: Type[Component]) -> Iterable[Entity]:
         """
-        指定されたすべてのコンポーネント型を持つエンティティのジェネレータを返す。
+        指定されたすべてのコンポーネント型を持つエンティティのイテラブルを返す。
+        cache_queries が有効な場合は、同じ条件のクエリビューをそのまま返すため、
+        2回目以降の呼び出しでは検索処理が発生しない。
 
         Args:
             *component_types: 検索条件となるコンポーネント型の可変長引数。
@@ -108,20 +286,180 @@ class World:
         Returns:
             Iterable[Entity]: 条件に一致するエンティティIDのイテラブル。
         """
-        # 最初のコンポーネント型を持つエンティティの集合を取得
-        try:
-            entities = set(self._components[component_types[0]].keys())
-        except (KeyError, IndexError):
-            # 該当コンポーネントを持つエンティティが一つもなければ空を返す
+        if not component_types:
+            return iter(())
+        if self.cache_queries:
+            return self.view(*component_types)
+        return self._storage.entities_with(component_types)
+
+    def query(self, *component_types: Type[Component]) -> Iterator[tuple[Any, ...]]:
+        """
+        指定されたすべてのコンポーネント型を持つエンティティについて、
+        (entity, component1, component2, ...) のタプルを順に返す。
+        get_entities_with と get_component を組み合わせるより検索回数が少ない。
+
+        例:
+            for entity, pos, health in world.query(PositionComponent, HealthComponent):
+                ...
+
+        Args:
+            *component_types: 検索条件となり、取得もするコンポーネント型。
+
+        Returns:
+            Iterator[tuple]: (entity, component1, ...) のタプルのイテレータ。
+        """
+        if not component_types:
+            return iter(())
+        if isinstance(self._storage, ArchetypeStorage):
+            return self._storage.query(component_types)
+        return self._storage.query(
+            component_types, self.get_entities_with(*component_types)
+        )
+
+    def view(self, *component_types: Type[Component]) -> QueryView:
+        """
+        指定されたコンポーネント型の組み合わせに対するクエリビューを返す。
+        未登録の場合は現在のワールドから作成して登録し、以後は
+        add_component / remove_component / delete_entity のたびに差分更新する。
+
+        Args:
+            *component_types: ビューの条件となるコンポーネント型の可変長引数。
+
+        Returns:
+            QueryView: 条件に一致するエンティティのライブビュー。
+        """
+        key = frozenset(component_types)
+        view = self._views.get(key)
+        if view is None:
+            view = QueryView(tuple(component_types))
+            for entity in self._storage.entities_with(tuple(key)):
+                view.add(entity)
+            self._views[key] = view
+            for component_type in key:
+                self._views_by_type.setdefault(component_type, []).append(view)
+        return view
+
+    def gather(
+        self,
+        entities: Iterable[Entity],
+        component_type: Type[Component],
+        field: str,
+    ) -> np.ndarray:
+        """
+        複数のエンティティについて、コンポーネントのフィールド値を1つの配列に集める。
+        列指向ストアが有効な場合は配列の添字参照だけで済む。
+        すべてのエンティティが指定された型のコンポーネントを持っている必要がある。
+
+        Args:
+            entities (Iterable[Entity]): 値を集めるエンティティ。
+            component_type (Type[Component]): 対象のコンポーネント型。
+            field (str): 対象のフィールド名。
+
+        Returns:
+            np.ndarray: entities と同じ順序で並んだフィールド値の配列。
+        """
+        if self.columns is not None and self.columns.is_columnar(component_type):
+            slots = self.columns.slots(entities)
+            return self.columns.column(component_type, field)[slots]
+        return np.array(
+            [
+                getattr(self._storage.get(entity, component_type), field)
+                for entity in entities
+            ]
+        )
+
+    def _prepare_component(
+        self, entity: Entity, component: Component
+    ) -> tuple[type[Component], Component]:
+        """
+        格納するコンポーネントの型と実体を返す。
+        他のエンティティから取得したプロキシは、元の型の値に戻してから格納する。
+        他のエンティティに追加済みの位置は、複製してから格納する。
+        列指向ストアの対象であれば、値を配列に書き込んだプロキシを実体とする。
+        """
+        component = unwrap(component)
+        component_type = type(component)
+        if component_type is PositionComponent:
+            # 位置を置き換える場合は、古い位置を空間索引から外しておく
+            self._untrack_position(entity)
+            if component.__dict__.get("_on_move") is not None:
+                # 他のエンティティが使っている位置は、通知先を奪わないよう複製する
+                component = PositionComponent(component.x, component.y)
+        if self.columns is not None and self.columns.is_columnar(component_type):
+            # 同じ型を置き換える場合は、古いプロキシを配列から切り離しておく
+            self._detach_columnar(entity, component_type)
+            component = self.columns.attach(entity, component)
+        return component_type, component
+
+    def entities_at(self, x: int, y: int) -> tuple[Entity, ...]:
+        """
+        指定された座標にいるエンティティを空間索引から取得する。
+
+        Args:
+            x (int): x座標。
+            y (int): y座標。
+
+        Returns:
+            tuple[Entity, ...]: その座標にいるエンティティ。
+        """
+        return self.spatial.at(x, y)
+
+    def entities_in_radius(self, x: int, y: int, radius: float) -> list[Entity]:
+        """
+        指定された座標からの距離が radius 以下のエンティティを空間索引から取得する。
+
+        Args:
+            x (int): 中心のx座標。
+            y (int): 中心のy座標。
+            radius (float): 半径（ユークリッド距離）。
+
+        Returns:
+            list[Entity]: 範囲内のエンティティ。
+        """
+        return self.spatial.in_radius(x, y, radius)
+
+    def rebuild_spatial_index(self) -> None:
+        """
+        空間索引を現在のPositionComponentから作り直す。
+        列指向ストアの位置配列へ直接書き込んだ場合など、
+        コンポーネントを経由せずに座標を変更した後に呼び出す。
+        """
+        self.spatial.rebuild(
+            (entity, pos.x, pos.y) for entity, pos in self.query(PositionComponent)
+        )
+
+    def _track_position(self, entity: Entity, position: Component) -> None:
+        """位置を空間索引に登録し、以後の座標の変更を索引に反映させる。"""
+        self.spatial.insert(entity, position.x, position.y)
+        position._on_move = partial(self.spatial.move, entity)
+
+    def _untrack_position(self, entity: Entity) -> None:
+        """エンティティの現在の位置を空間索引から外し、変更の通知を止める。"""
+        position = self._storage.get(entity, PositionComponent)
+        if position is None:
             return
+        self.spatial.remove(entity, position.x, position.y)
+        position._on_move = None
 
-        # 残りのコンポーネント型についても集合をとり、積集合を計算
-        for component_type in component_types[1:]:
-            try:
-                entities.intersection_update(self._components[component_type].keys())
-            except KeyError:
-                # 途中で該当エンティティがなくなれば空を返す
-                return
+    def _detach_columnar(self, entity: Entity, component_type: type[Component]) -> None:
+        """列指向ストアに格納されたコンポーネントを配列から切り離す。"""
+        if self.columns is None or not self.columns.is_columnar(component_type):
+            return
+        proxy = self._storage.get(entity, component_type)
+        if proxy is not None:
+            self.columns.detach(entity, proxy)
 
-        # 結果の集合に含まれるエンティティを順に返す
-        yield from entities
+    def _update_views_on_add(
+        self, entity: Entity, added_types: Iterable[type[Component]]
+    ) -> None:
+        """追加されたコンポーネント型を条件に含むビューに、エンティティを反映する。"""
+        checked: set[int] = set()
+        for component_type in added_types:
+            for view in self._views_by_type.get(component_type, ()):
+                if id(view) in checked or entity in view:
+                    continue
+                checked.add(id(view))
+                if all(
+                    self._storage.get(entity, t) is not None for t in view.signature
+                ):
+                    view.add(entity)
@@ -20,6 +20,7 @@ from .ecs.components import (
     PlayerComponent,
     PositionComponent,
     RenderableComponent,
+    SpeedComponent,
     StairsComponent,
     TreasureComponent,
 )
@@ -50,6 +51,7 @@ def create_player(world: World, x: int, y: int) -> Entity:
         DefenseComponent(defense=2),
         InventoryComponent(items=[]),
         EquipmentComponent(slots={slot: None for slot in EquipmentSlot}),
+        SpeedComponent(),
     ]
 
     # ワールドにコンポーネント群を渡してエンティティを生成
@@ -82,6 +84,8 @@ def create_enemy(world: World, x: int, y: int, enemy_data: dict[str, Any]) -> En
         HealthComponent(max_hp=enemy_data["max_hp"], current_hp=enemy_data["max_hp"]),
         AttackPowerComponent(power=enemy_data["power"]),
         DefenseComponent(defense=enemy_data["defense"]),
+        # 速さの指定がない敵は標準の速さで行動する
+        SpeedComponent(speed=enemy_data.get("speed", SpeedComponent.speed)),
     ]
 
     # ワールドにコンポーネント群を渡してエンティティを生成
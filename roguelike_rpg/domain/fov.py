@@ -0,0 +1,169 @@
+# roguelike_rpg/domain/fov.py
+"""
+視界（Field of View）の計算
+再帰的シャドウキャスティングにより、視点から見えるタイルを求める。
+視点の周囲を8つの八分円に分け、各八分円を視点から近い行の順に走査しながら、
+視線を遮るタイルが作る影の範囲（傾きの区間）を次の行へ受け渡していく。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .game_map import GameMap
+
+# 各八分円の、(列, 行) からマップ上の (dx, dy) への変換係数 (xx, xy, yx, yy)
+OCTANTS: Tuple[Tuple[int, int, int, int], ...] = (
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0),
+    (-1, 0, 0, 1),
+    (-1, 0, 0, -1),
+    (0, -1, -1, 0),
+    (0, 1, -1, 0),
+    (1, 0, 0, -1),
+)
+
+
+def compute_fov(
+    transparent: np.ndarray, origin: Tuple[int, int], radius: int
+) -> np.ndarray:
+    """
+    視点から見えるタイルを計算する。
+    視界の範囲はチェビシェフ距離で radius 以内の正方形である。
+    視線を遮るタイル（壁など）そのものは見えるタイルに含まれる。
+
+    Args:
+        transparent (np.ndarray): 各タイルが視線を通すかどうかの (width, height) 配列。
+        origin (Tuple[int, int]): 視点の座標 (x, y)。
+        radius (int): 視界の半径（チェビシェフ距離）。
+
+    Returns:
+        np.ndarray: 各タイルが見えるかどうかの (width, height) の bool 配列。
+    """
+    visible = np.zeros(transparent.shape, dtype=bool)
+    ox, oy = origin
+    visible[ox, oy] = True
+    for octant in OCTANTS:
+        _cast_light(transparent, visible, ox, oy, 1, 1.0, 0.0, radius, octant)
+    return visible
+
+
+def _cast_light(
+    transparent: np.ndarray,
+    visible: np.ndarray,
+    ox: int,
+    oy: int,
+    row: int,
+    start: float,
+    end: float,
+    radius: int,
+    octant: Tuple[int, int, int, int],
+) -> None:
+    """
+    1つの八分円の中で、傾き start から end までの区間を row 行目から走査する。
+    視線を遮るタイルに当たると、その手前までの区間を再帰的に走査し、
+    残りの区間で走査を続ける。
+    """
+    if start < end:
+        return
+    xx, xy, yx, yy = octant
+    width, height = transparent.shape
+    for distance in range(row, radius + 1):
+        dy = -distance
+        blocked = False
+        new_start = start
+        for dx in range(-distance, 1):
+            # タイルの左端と右端の傾き
+            left_slope = (dx - 0.5) / (dy + 0.5)
+            right_slope = (dx + 0.5) / (dy - 0.5)
+            if start < right_slope:
+                continue
+            if end > left_slope:
+                break
+
+            x = ox + dx * xx + dy * xy
+            y = oy + dx * yx + dy * yy
+            # マップの外は視線を遮るタイルとして扱う
+            inside = 0 <= x < width and 0 <= y < height
+            if inside:
+                visible[x, y] = True
+            opaque = not inside or not transparent[x, y]
+            if blocked:
+                if opaque:
+                    new_start = right_slope
+                    continue
+                blocked = False
+                start = new_start
+            elif opaque and distance < radius:
+                blocked = True
+                _cast_light(
+                    transparent,
+                    visible,
+                    ox,
+                    oy,
+                    distance + 1,
+                    start,
+                    left_slope,
+                    radius,
+                    octant,
+                )
+                new_start = right_slope
+        if blocked:
+            break
+
+
+class FieldOfView:
+    """
+    視点からの視界を保持し、視点かマップが変わったときだけ再計算する。
+
+    Attributes:
+        visible (Optional[np.ndarray]): 最後に計算した、各タイルが見えるかどうかの配列。
+        origin (Optional[Tuple[int, int]]): 視界の視点。
+        radius (int): 視界の半径（チェビシェフ距離）。
+        recomputations (int): 視界を計算した回数。
+    """
+
+    def __init__(self) -> None:
+        self.visible: Optional[np.ndarray] = None
+        self.origin: Optional[Tuple[int, int]] = None
+        self.radius = 0
+        self.recomputations = 0
+        self._game_map: Optional["GameMap"] = None
+        self._map_version = -1
+
+    def update(self, game_map: "GameMap", origin: Tuple[int, int], radius: int) -> bool:
+        """
+        必要であれば視界を再計算する。
+
+        Args:
+            game_map (GameMap): 対象のマップ。
+            origin (Tuple[int, int]): 視点の座標 (x, y)。
+            radius (int): 視界の半径（チェビシェフ距離）。
+
+        Returns:
+            bool: 再計算した場合はTrue、キャッシュを使った場合はFalse。
+        """
+        if (
+            self.visible is not None
+            and self._game_map is game_map
+            and self._map_version == game_map.version
+            and self.origin == origin
+            and self.radius == radius
+        ):
+            return False
+
+        self.visible = compute_fov(game_map.transparent, origin, radius)
+        self.origin = origin
+        self.radius = radius
+        self._game_map = game_map
+        self._map_version = game_map.version
+        self.recomputations += 1
+        return True
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """指定されたタイルが視点から見えるかどうかを返す。"""
+        return bool(self.visible[x, y])
@@ -1,23 +1,71 @@
-# roguelike_rpg/domain/game_map.py
 """
 ゲームマップの状態を管理するクラス
 """
 
 from __future__ import annotations
 
+from typing import Any
+
 import numpy as np
 
-from .tile import WALL_TILE
+from .dijkstra import UNREACHABLE, compute_distance_field
+from .fov import FieldOfView
+from .tile import TILE_PALETTE, WALL_ID, Tile, palette_array, register_tile
+
+
+class TileGrid:
+    """
+    GameMapのタイルを Tile オブジェクトとして読み書きするためのアクセサ。
+    実際のデータは GameMap のタイルID配列と属性配列に格納されている。
+
+        game_map.tiles[x, y]          -> Tile
+        game_map.tiles[x1:x2, y] = FLOOR_TILE
+    """
+
+    def __init__(self, game_map: "GameMap"):
+        self._game_map = game_map
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._game_map.tile_ids.shape
+
+    def __getitem__(self, key: Any) -> Tile | np.ndarray:
+        ids = self._game_map.tile_ids[key]
+        if np.ndim(ids) == 0:
+            return TILE_PALETTE[int(ids)]
+        # 範囲指定の場合は Tile のオブジェクト配列を返す
+        palette = np.empty(len(TILE_PALETTE), dtype=object)
+        palette[:] = TILE_PALETTE
+        return palette[ids]
+
+    def __setitem__(self, key: Any, tile: Tile) -> None:
+        self._game_map.set_tile_id(key, register_tile(tile))
 
 
 class GameMap:
     """
     ゲームマップのタイル情報と、マップ上のエンティティを管理する。
+    タイルはパレットのIDとして保持し、歩行可能・視線透過の属性は
+    マップ全体のブール配列として併せて保持する。
 
     Attributes:
         width (int): マップの幅。
         height (int): マップの高さ。
-        tiles (np.ndarray): マップのタイル情報を格納する2次元配列。
+        tile_ids (np.ndarray): タイルのパレットIDを格納する (width, height) の配列。
+        walkable (np.ndarray): 各タイルが歩行可能かどうかのブール配列。
+        transparent (np.ndarray): 各タイルが視線を透過するかどうかのブール配列。
+        tiles (TileGrid): タイルを Tile オブジェクトとして読み書きするアクセサ。
+        version (int): タイルが書き換えられるたびに増える番号（キャッシュの判定用）。
+        visible_bits (np.ndarray): プレイヤーから現在見えているタイルのビットマスク。
+        explored_bits (np.ndarray): プレイヤーが一度でも見たタイルのビットマスク。
+        fov (FieldOfView): プレイヤーの視界。再計算の要否はこれが判定する。
+        player_start (tuple[int, int] | None): フロアでのプレイヤーの開始位置。
+        start_distances (np.ndarray | None): 開始位置から各タイルまでの歩数の距離場。
+            到達できないタイルは UNREACHABLE。マップの生成時に一度だけ計算され、
+            階段の配置や到達できるかどうかの判定に再利用される。
+
+    ビットマスクはタイル8個を1バイトに詰めた uint8 配列であり、ブール配列の
+    1/8の大きさで済むため、多数のフロアの状態を保持し続けることができる。
     """
 
     def __init__(self, width: int, height: int):
@@ -25,9 +73,113 @@ class GameMap:
         self.width = width
         self.height = height
         # 指定された幅と高さで、壁タイルで満たされた2次元配列を初期化
-        self.tiles: np.ndarray[np.object_] = np.full(
-            (width, height), fill_value=WALL_TILE, order="F"
+        self.tile_ids: np.ndarray = np.full(
+            (width, height), fill_value=WALL_ID, dtype=np.uint8, order="F"
         )
+        self.walkable: np.ndarray = np.zeros((width, height), dtype=bool, order="F")
+        self.transparent: np.ndarray = np.zeros((width, height), dtype=bool, order="F")
+        self.tiles = TileGrid(self)
+        self.version = 0
+        mask_size = (width * height + 7) // 8
+        self.visible_bits: np.ndarray = np.zeros(mask_size, dtype=np.uint8)
+        self.explored_bits: np.ndarray = np.zeros(mask_size, dtype=np.uint8)
+        self.fov = FieldOfView()
+        self.player_start: tuple[int, int] | None = None
+        self.start_distances: np.ndarray | None = None
+
+    def set_tile_id(self, key: Any, tile_id: int | np.ndarray) -> None:
+        """
+        指定された範囲のタイルIDを書き換え、属性配列も更新する。
+
+        Args:
+            key (Any): NumPyの添字（座標、スライス、ブール配列など）。
+            tile_id (int | np.ndarray): 書き込むタイルID。
+        """
+        self.tile_ids[key] = tile_id
+        ids = self.tile_ids[key]
+        self.walkable[key] = palette_array("walkable")[ids]
+        self.transparent[key] = palette_array("transparent")[ids]
+        self.version += 1
+
+    def update_fov(self, origin: tuple[int, int], radius: int) -> bool:
+        """
+        視点からの視界を計算し、見えているタイルと探索済みのタイルを更新する。
+        視界のキャッシュは FieldOfView に任せ、再計算されたときだけビットマスクを
+        詰め直す。視点・半径・タイルのいずれも変わっていなければ何もしない。
+        探索済みのタイルには、新たに見えたタイルが追加されていく。
+
+        Args:
+            origin (tuple[int, int]): 視点（プレイヤーの位置）の座標 (x, y)。
+            radius (int): 視界の半径（チェビシェフ距離）。
+
+        Returns:
+            bool: 再計算した場合はTrue、前回の視界をそのまま使った場合はFalse。
+        """
+        if not self.fov.update(self, origin, radius):
+            return False
+        self.visible_bits = np.packbits(self.fov.visible)
+        self.explored_bits |= self.visible_bits
+        return True
+
+    def set_player_start(self, origin: tuple[int, int]) -> np.ndarray:
+        """
+        プレイヤーの開始位置を設定し、そこから各タイルまでの距離場を計算して保持する。
+        距離場は現在のタイルに対して計算されるため、タイルを掘り終えてから呼ぶこと。
+
+        Args:
+            origin (tuple[int, int]): プレイヤーの開始位置の座標 (x, y)。
+
+        Returns:
+            np.ndarray: 開始位置から各タイルまでの歩数の (width, height) の配列。
+        """
+        self.player_start = origin
+        self.start_distances = compute_distance_field(self.walkable, origin)
+        return self.start_distances
+
+    def is_reachable(self, x: int, y: int) -> bool:
+        """指定されたタイルにプレイヤーの開始位置から歩いて行けるかどうかを返す。"""
+        return (
+            self.start_distances is not None
+            and self.start_distances[x, y] != UNREACHABLE
+        )
+
+    @property
+    def visible(self) -> np.ndarray:
+        """現在見えているタイルを (width, height) のブール配列で返す。"""
+        return self._unpack(self.visible_bits)
+
+    @property
+    def explored(self) -> np.ndarray:
+        """探索済みのタイルを (width, height) のブール配列で返す。"""
+        return self._unpack(self.explored_bits)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """指定されたタイルが現在見えているかどうかを返す。"""
+        return self._bit(self.visible_bits, x, y)
+
+    def is_explored(self, x: int, y: int) -> bool:
+        """指定されたタイルが探索済みかどうかを返す。"""
+        return self._bit(self.explored_bits, x, y)
+
+    def _unpack(self, bits: np.ndarray) -> np.ndarray:
+        """ビットマスクを (width, height) のブール配列に展開する。"""
+        count = self.width * self.height
+        return (
+            np.unpackbits(bits, count=count).view(bool).reshape(self.width, self.height)
+        )
+
+    def _bit(self, bits: np.ndarray, x: int, y: int) -> bool:
+        """ビットマスクから1タイル分のビットを読み出す。"""
+        index = x * self.height + y
+        return bool(bits[index >> 3] >> (7 - (index & 7)) & 1)
+
+    def glyphs(self) -> np.ndarray:
+        """マップ全体のタイル文字を (width, height) の配列で返す。"""
+        return palette_array("char")[self.tile_ids]
+
+    def colors(self) -> np.ndarray:
+        """マップ全体のタイル文字色を (width, height, 3) の配列で返す。"""
+        return palette_array("color")[self.tile_ids]
 
     def in_bounds(self, x: int, y: int) -> bool:
         """
@@ -0,0 +1,424 @@
+# roguelike_rpg/domain/hpa.py
+"""
+階層的経路探索（HPA*）
+マップを一定の大きさのクラスタに分割し、クラスタ間の出入口（エントランス）と
+その間の距離を事前に計算しておく。経路探索は、まず出入口をノードとする
+抽象グラフ上で行い、その後、経路が通るクラスタの中だけで詳細な経路を求める。
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .dijkstra import UNREACHABLE, compute_distance_field, compute_distance_fields
+from .pathfinding import astar_array
+
+if TYPE_CHECKING:
+    from .game_map import GameMap
+
+Point = Tuple[int, int]
+Cluster = Tuple[int, int]
+# クラスタの境界を表すキー (種類, cx, cy)
+#   "v": (cx, cy) と (cx + 1, cy) の間の縦の境界
+#   "h": (cx, cy) と (cx, cy + 1) の間の横の境界
+#   "d": (cx, cy) の右下の角と (cx + 1, cy + 1) の左上の角
+#   "a": (cx, cy) の右上の角と (cx + 1, cy - 1) の左下の角
+BorderKey = Tuple[str, int, int]
+
+# 既定のクラスタの一辺の長さ
+DEFAULT_CLUSTER_SIZE = 10
+# この長さ以上の出入口には、両端に2つの遷移を置く
+MIN_WIDE_ENTRANCE = 6
+
+
+class HierarchicalPathfinder:
+    """
+    GameMapをクラスタに分割し、HPA*で経路を探索する。
+    移動のルールは astar と同じ（8方向、斜めのコストも1、角のすり抜け可）。
+    返される経路は最短経路に近いが、最短であることは保証されない。
+
+    タイルの変更は invalidate で通知するか、sync でマップとの差分から検出する。
+    変更されたクラスタ（境界上のタイルであれば、その境界に接するクラスタ）だけが
+    次の探索の前に再構築される。
+
+    Attributes:
+        game_map (GameMap): 対象のマップ。
+        cluster_size (int): クラスタの一辺の長さ。
+        cluster_builds (int): クラスタ内の距離を計算した回数の累計。
+    """
+
+    def __init__(self, game_map: "GameMap", cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        self.game_map = game_map
+        self.cluster_size = cluster_size
+        self.cluster_builds = 0
+        self._columns = -(-game_map.width // cluster_size)
+        self._rows = -(-game_map.height // cluster_size)
+        # 境界ごとの遷移（隣り合うクラスタの、隣接する2つのタイルの組）
+        self._borders: Dict[BorderKey, List[Tuple[Point, Point]]] = {}
+        # ノードごとの、別のクラスタにある隣接ノード
+        self._inter: Dict[Point, Set[Point]] = {}
+        # クラスタごとの、ノードからクラスタ内の他のノードまでの距離
+        self._intra: Dict[Cluster, Dict[Point, Dict[Point, int]]] = {}
+        # クラスタごとの、遷移に使われているタイル（抽象グラフのノード）
+        self._intra_nodes: Dict[Cluster, List[Point]] = {}
+        self._walkable = game_map.walkable.copy()
+        self._version = game_map.version
+        self._dirty_borders: Set[BorderKey] = set(self._all_borders())
+        self._dirty_clusters: Set[Cluster] = {
+            (cx, cy) for cx in range(self._columns) for cy in range(self._rows)
+        }
+        self._refresh()
+
+    # --- クラスタと境界 ---
+
+    def cluster_of(self, x: int, y: int) -> Cluster:
+        """タイルが属するクラスタを返す。"""
+        return x // self.cluster_size, y // self.cluster_size
+
+    def _bounds(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """クラスタの範囲 (x0, y0, x1, y1) を返す（x1, y1 は含まない）。"""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return (
+            x0,
+            y0,
+            min(x0 + size, self.game_map.width),
+            min(y0 + size, self.game_map.height),
+        )
+
+    def _all_borders(self) -> Iterator[BorderKey]:
+        for cx in range(self._columns):
+            for cy in range(self._rows):
+                if cx + 1 < self._columns:
+                    yield ("v", cx, cy)
+                    if cy + 1 < self._rows:
+                        yield ("d", cx, cy)
+                    if cy > 0:
+                        yield ("a", cx, cy)
+                if cy + 1 < self._rows:
+                    yield ("h", cx, cy)
+
+    def _borders_of_tile(self, x: int, y: int) -> Iterator[BorderKey]:
+        """タイルが関わる境界を列挙する。"""
+        cx, cy = self.cluster_of(x, y)
+        x0, y0, x1, y1 = self._bounds((cx, cy))
+        left, right = x == x0, x == x1 - 1
+        top, bottom = y == y0, y == y1 - 1
+        candidates: List[BorderKey] = []
+        if left:
+            candidates.append(("v", cx - 1, cy))
+        if right:
+            candidates.append(("v", cx, cy))
+        if top:
+            candidates.append(("h", cx, cy - 1))
+        if bottom:
+            candidates.append(("h", cx, cy))
+        if right and bottom:
+            candidates.append(("d", cx, cy))
+        if left and top:
+            candidates.append(("d", cx - 1, cy - 1))
+        if right and top:
+            candidates.append(("a", cx, cy))
+        if left and bottom:
+            candidates.append(("a", cx - 1, cy + 1))
+        # マップの端など、存在しない境界は除く
+        return (key for key in candidates if key in self._borders)
+
+    @staticmethod
+    def _border_clusters(key: BorderKey) -> Tuple[Cluster, Cluster]:
+        kind, cx, cy = key
+        if kind == "v":
+            return (cx, cy), (cx + 1, cy)
+        if kind == "h":
+            return (cx, cy), (cx, cy + 1)
+        if kind == "d":
+            return (cx, cy), (cx + 1, cy + 1)
+        return (cx, cy), (cx + 1, cy - 1)
+
+    def _find_transitions(self, key: BorderKey) -> List[Tuple[Point, Point]]:
+        """
+        境界をまたいで移動できるタイルの組を求める。
+        両側が歩けるタイルの連続した区間（出入口）ごとに、短ければ中央に1つ、
+        長ければ両端に2つの遷移を置く。斜めにしか通れない箇所や、
+        クラスタの角同士の接続はそれぞれ1つの遷移とする。
+        """
+        walkable = self._walkable
+        kind = key[0]
+        a, b = self._border_clusters(key)
+        ax0, ay0, ax1, ay1 = self._bounds(a)
+
+        if kind == "d":
+            pair = ((ax1 - 1, ay1 - 1), (ax1, ay1))
+            return [pair] if walkable[pair[0]] and walkable[pair[1]] else []
+        if kind == "a":
+            pair = ((ax1 - 1, ay0), (ax1, ay0 - 1))
+            return [pair] if walkable[pair[0]] and walkable[pair[1]] else []
+
+        if kind == "v":
+            positions = range(ay0, ay1)
+
+            def cells(i: int) -> Tuple[Point, Point]:
+                return (ax1 - 1, i), (ax1, i)
+
+        else:
+            positions = range(ax0, ax1)
+
+            def cells(i: int) -> Tuple[Point, Point]:
+                return (i, ay1 - 1), (i, ay1)
+
+        def walk(point: Point) -> bool:
+            return bool(walkable[point])
+
+        transitions: List[Tuple[Point, Point]] = []
+        run: List[int] = []
+        for i in list(positions) + [None]:
+            if i is not None and all(map(walk, cells(i))):
+                run.append(i)
+                continue
+            if run:
+                if len(run) < MIN_WIDE_ENTRANCE:
+                    transitions.append(cells(run[len(run) // 2]))
+                else:
+                    transitions.append(cells(run[0]))
+                    transitions.append(cells(run[-1]))
+                run = []
+
+        # 斜めにしか通れない箇所（角のすり抜け）
+        for i in positions:
+            inner, outer = cells(i)
+            if not walk(inner) or walk(outer):
+                continue
+            for j in (i - 1, i + 1):
+                if j not in positions:
+                    continue
+                other_inner, other_outer = cells(j)
+                if walk(other_outer) and not walk(other_inner):
+                    transitions.append((inner, other_outer))
+        return transitions
+
+    # --- 変更の反映 ---
+
+    def invalidate(self, x: int, y: int) -> None:
+        """
+        タイルの変更を通知する。変更されたタイルを含むクラスタと境界は、
+        次の探索の前に再構築される。
+        """
+        self._walkable[x, y] = self.game_map.walkable[x, y]
+        self._dirty_clusters.add(self.cluster_of(x, y))
+        self._dirty_borders.update(self._borders_of_tile(x, y))
+
+    def sync(self) -> int:
+        """
+        マップの歩行可能な配列と前回の写しを比較し、変更されたタイルを
+        invalidate する。マップが変更されていなければ何もしない。
+
+        Returns:
+            int: 変更されたタイルの数。
+        """
+        if self._version == self.game_map.version:
+            return 0
+        self._version = self.game_map.version
+        xs, ys = np.nonzero(self._walkable != self.game_map.walkable)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.invalidate(x, y)
+        return len(xs)
+
+    def _refresh(self) -> None:
+        """変更された境界とクラスタを再構築する。"""
+        for key in self._dirty_borders:
+            for a, b in self._borders.get(key, ()):
+                self._inter[a].discard(b)
+                self._inter[b].discard(a)
+            transitions = self._find_transitions(key)
+            self._borders[key] = transitions
+            for a, b in transitions:
+                self._inter.setdefault(a, set()).add(b)
+                self._inter.setdefault(b, set()).add(a)
+            # 出入口が変わると、両側のクラスタのノードも変わる
+            self._dirty_clusters.update(self._border_clusters(key))
+        self._dirty_borders.clear()
+
+        for cluster in self._dirty_clusters:
+            self._build_cluster(cluster)
+        self._dirty_clusters.clear()
+
+    def _cluster_nodes(self, cluster: Cluster) -> List[Point]:
+        """クラスタ内の、遷移に使われているタイルを返す。"""
+        cx, cy = cluster
+        keys = [
+            ("v", cx - 1, cy),
+            ("v", cx, cy),
+            ("h", cx, cy - 1),
+            ("h", cx, cy),
+            ("d", cx - 1, cy - 1),
+            ("d", cx, cy),
+            ("a", cx - 1, cy + 1),
+            ("a", cx, cy),
+        ]
+        nodes: Dict[Point, None] = {}
+        for key in keys:
+            for pair in self._borders.get(key, ()):
+                for node in pair:
+                    if self.cluster_of(*node) == cluster:
+                        nodes[node] = None
+        return list(nodes)
+
+    def _distances_from(self, cluster: Cluster, origin: Point) -> Dict[Point, int]:
+        """クラスタ内だけを通って、origin からクラスタ内の各ノードへ行く歩数を返す。"""
+        x0, y0, x1, y1 = self._bounds(cluster)
+        field = compute_distance_field(
+            self._walkable[x0:x1, y0:y1], (origin[0] - x0, origin[1] - y0)
+        )
+        distances = {}
+        for node in self._intra_nodes.get(cluster, ()):
+            distance = int(field[node[0] - x0, node[1] - y0])
+            if distance != UNREACHABLE and node != origin:
+                distances[node] = distance
+        return distances
+
+    def _build_cluster(self, cluster: Cluster) -> None:
+        """クラスタ内のノード間の距離を計算し直す。"""
+        self.cluster_builds += 1
+        nodes = self._cluster_nodes(cluster)
+        self._intra_nodes[cluster] = nodes
+        if not nodes:
+            self._intra[cluster] = {}
+            return
+
+        # クラスタ内の全ノードからの距離場をまとめて計算する
+        x0, y0, x1, y1 = self._bounds(cluster)
+        fields = compute_distance_fields(
+            self._walkable[x0:x1, y0:y1], [(x - x0, y - y0) for x, y in nodes]
+        )
+        local_x = [x - x0 for x, _ in nodes]
+        local_y = [y - y0 for _, y in nodes]
+        table = fields[:, local_x, local_y].tolist()
+        self._intra[cluster] = {
+            node: {
+                other: distance
+                for other, distance in zip(nodes, row)
+                if distance != UNREACHABLE and other != node
+            }
+            for node, row in zip(nodes, table)
+        }
+
+    # --- 経路探索 ---
+
+    def find_path(self, start: Point, end: Point) -> Optional[List[Point]]:
+        """
+        startからendまでの経路を計算する。
+
+        Args:
+            start (Point): 開始座標 (x, y)。
+            end (Point): 目的地の座標 (x, y)。
+
+        Returns:
+            Optional[List[Point]]: 経路のリスト(startからend)。
+                                   経路が見つからない場合はNone。
+        """
+        self.sync()
+        if self._dirty_borders or self._dirty_clusters:
+            self._refresh()
+        if start == end:
+            return [start]
+
+        # 近い2点は、周囲の範囲だけを直接探索する（抽象グラフの出入口を
+        # 経由すると遠回りになりやすいため）
+        size = self.cluster_size
+        if max(abs(start[0] - end[0]), abs(start[1] - end[1])) <= size:
+            window = (
+                max(min(start[0], end[0]) - size, 0),
+                max(min(start[1], end[1]) - size, 0),
+                min(max(start[0], end[0]) + size + 1, self.game_map.width),
+                min(max(start[1], end[1]) + size + 1, self.game_map.height),
+            )
+            local = self._local_path(window, start, end)
+            if local is not None:
+                return local
+
+        # 開始地点と目的地を一時的なノードとして抽象グラフにつなぐ
+        from_start = self._distances_from(self.cluster_of(*start), start)
+        to_end = self._distances_from(self.cluster_of(*end), end)
+
+        abstract = self._search_abstract(start, end, from_start, to_end)
+        if abstract is None:
+            return None
+        return self._refine(abstract)
+
+    def _search_abstract(
+        self,
+        start: Point,
+        end: Point,
+        from_start: Dict[Point, int],
+        to_end: Dict[Point, int],
+    ) -> Optional[List[Point]]:
+        """抽象グラフ上でA*を行い、経由するノードの列を返す。"""
+        end_x, end_y = end
+        g_score: Dict[Point, int] = {start: 0}
+        came_from: Dict[Point, Point] = {}
+        closed: Set[Point] = set()
+        open_nodes: List[Tuple[int, Point]] = [(0, start)]
+        while open_nodes:
+            _, current = heapq.heappop(open_nodes)
+            if current in closed:
+                continue
+            if current == end:
+                path = [end]
+                while path[-1] in came_from:
+                    path.append(came_from[path[-1]])
+                return path[::-1]
+            closed.add(current)
+
+            if current == start:
+                edges = list(from_start.items())
+                # 開始地点そのものが遷移のタイルであれば、境界をまたいで移動できる
+                edges.extend((neighbor, 1) for neighbor in self._inter.get(start, ()))
+            else:
+                edges = list(self._intra[self.cluster_of(*current)][current].items())
+                edges.extend((neighbor, 1) for neighbor in self._inter[current])
+                if current in to_end:
+                    edges.append((end, to_end[current]))
+
+            for neighbor, cost in edges:
+                if neighbor in closed:
+                    continue
+                tentative_g_score = g_score[current] + cost
+                if tentative_g_score < g_score.get(neighbor, UNREACHABLE):
+                    g_score[neighbor] = tentative_g_score
+                    came_from[neighbor] = current
+                    heuristic_cost = max(
+                        abs(neighbor[0] - end_x), abs(neighbor[1] - end_y)
+                    )
+                    heapq.heappush(
+                        open_nodes, (tentative_g_score + heuristic_cost, neighbor)
+                    )
+        return None
+
+    def _local_path(
+        self, bounds: Tuple[int, int, int, int], start: Point, end: Point
+    ) -> Optional[List[Point]]:
+        """範囲 (x0, y0, x1, y1) の中だけを通る経路を計算する。"""
+        x0, y0, x1, y1 = bounds
+        path = astar_array(
+            self._walkable[x0:x1, y0:y1],
+            (start[0] - x0, start[1] - y0),
+            (end[0] - x0, end[1] - y0),
+        )
+        if path is None:
+            return None
+        return [(x + x0, y + y0) for x, y in path]
+
+    def _refine(self, abstract: List[Point]) -> List[Point]:
+        """抽象経路を、経由するクラスタ内だけの探索で1マスずつの経路に展開する。"""
+        path = [abstract[0]]
+        for current, following in zip(abstract, abstract[1:]):
+            cluster = self.cluster_of(*current)
+            if cluster != self.cluster_of(*following):
+                # クラスタの境界をまたぐ遷移は隣接するタイル同士
+                path.append(following)
+                continue
+            path.extend(self._local_path(self._bounds(cluster), current, following)[1:])
+        return path
@@ -4,12 +4,86 @@
 """
 
 import random
-from typing import Any, List, Tuple
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from itertools import chain
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
 
 from . import tile
+from .bsp import generate_bsp
+from .cave import generate_cave
+from .dijkstra import UNREACHABLE
 from .ecs.world import World
 from .factories import create_enemy, create_item, create_stairs
 from .game_map import GameMap
+from .spawn import AliasTable, SpawnTable, TileSampler
+
+
+class MapGenerator(Enum):
+    """
+    マップの生成方式。
+
+    RECTANGLE: マップ全体を1つの長方形の部屋にする。
+    BSP: 二分空間分割で複数の部屋を配置し、通路でつなぐ。
+    CAVE: セルオートマトンで1つにつながった洞窟を作る。
+    """
+
+    RECTANGLE = auto()
+    BSP = auto()
+    CAVE = auto()
+
+
+# 洞窟を、部屋の代わりの配置領域に区切るときの区画の大きさ
+CAVE_REGION_SIZE = 16
+# 階段（宝物）を置く、開始位置からの歩数の範囲
+# （候補の中で最も遠いタイルの歩数に対する比）
+STAIRS_DISTANCE_BAND = (0.6, 1.0)
+
+
+class SpawnKind(Enum):
+    """フロアに配置するエンティティの種類。"""
+
+    ENEMY = auto()
+    ITEM = auto()
+    STAIRS = auto()
+
+
+@dataclass(frozen=True)
+class Spawn:
+    """
+    フロアに配置するエンティティ1つ分の計画。
+
+    Attributes:
+        kind (SpawnKind): エンティティの種類。
+        x (int): 配置するx座標。
+        y (int): 配置するy座標。
+        data (Optional[dict[str, Any]]): 敵やアイテムのデータ（階段ではNone）。
+    """
+
+    kind: SpawnKind
+    x: int
+    y: int
+    data: Optional[dict[str, Any]] = None
+
+
+@dataclass
+class FloorPlan:
+    """
+    生成したフロアの計画。マップと、プレイヤーの開始位置と、配置する
+    エンティティの一覧からなる。ワールドには触れずに作られるため、
+    別のスレッドで先に作っておき、後から build_floor でワールドに配置できる。
+
+    Attributes:
+        game_map (GameMap): 生成したマップ。
+        player_start (Tuple[int, int]): プレイヤーの開始位置。
+        spawns (List[Spawn]): 配置するエンティティの一覧。
+    """
+
+    game_map: GameMap
+    player_start: Tuple[int, int]
+    spawns: List[Spawn] = field(default_factory=list)
 
 
 def generate_map(
@@ -21,11 +95,135 @@ def generate_map(
     max_items_per_room: int,
     enemy_data: dict[str, Any],
     item_data: dict[str, Any],
+    generator: MapGenerator = MapGenerator.RECTANGLE,
+    enemy_table: Optional[SpawnTable] = None,
+    item_table: Optional[SpawnTable] = None,
+    rng: Optional[random.Random] = None,
 ) -> Tuple[GameMap, Tuple[int, int]]:
     """
     新しいゲームマップを生成し、敵とアイテムを配置する。
     戻り値として、生成されたマップとプレイヤーの安全な開始座標を返す。
+    plan_floor で作った計画を、そのまま build_floor でワールドに配置する。
+    引数は plan_floor と同じである。
+    """
+    plan = plan_floor(
+        map_width=map_width,
+        map_height=map_height,
+        dungeon_level=dungeon_level,
+        max_enemies_per_room=max_enemies_per_room,
+        max_items_per_room=max_items_per_room,
+        enemy_data=enemy_data,
+        item_data=item_data,
+        generator=generator,
+        enemy_table=enemy_table,
+        item_table=item_table,
+        rng=rng,
+    )
+    return build_floor(world, plan)
+
+
+def plan_floor(
+    map_width: int,
+    map_height: int,
+    dungeon_level: int,
+    max_enemies_per_room: int,
+    max_items_per_room: int,
+    enemy_data: dict[str, Any],
+    item_data: dict[str, Any],
+    generator: MapGenerator = MapGenerator.RECTANGLE,
+    enemy_table: Optional[SpawnTable] = None,
+    item_table: Optional[SpawnTable] = None,
+    rng: Optional[random.Random] = None,
+) -> FloorPlan:
     """
+    新しいゲームマップを生成し、敵とアイテムの配置を計画する。
+    敵とアイテムは部屋ごとの配置候補（スポーン領域）に、部屋ごとの上限まで配置する。
+    プレイヤーは最初の部屋から始まる。開始位置からの距離場をマップに保持し、
+    歩いて行けないタイルは配置候補から除く。階段（最終フロアでは宝物）は
+    プレイヤーの部屋以外の、開始位置からの歩数が STAIRS_DISTANCE_BAND に入る
+    タイルに置く。
+    敵とアイテムの種類は、enemy_data と item_data から作った出現表（enemy_table、
+    item_table）でこの階層の重みに従って選ぶ。出現表を省略した場合はその場で作る。
+    rng を渡した場合、乱数はすべて rng から引くため、同じ状態の rng からは
+    同じフロアが生成される。省略時は random モジュールを使う。
+    ワールドには触れないため、別のスレッドから呼んでもよい。
+    """
+    if generator is MapGenerator.BSP:
+        dungeon, regions = _generate_bsp_rooms(map_width, map_height, rng)
+    elif generator is MapGenerator.CAVE:
+        dungeon, regions = _generate_cave(map_width, map_height, rng)
+    else:
+        dungeon, regions = _generate_rectangle(map_width, map_height)
+
+    # プレイヤーの開始位置を決定し、配置候補から削除
+    player_start_pos = TileSampler(regions[0], rng).take()
+
+    # 開始位置からの距離場を計算し、歩いて行けないタイルを配置候補から除く
+    distances = dungeon.set_player_start(player_start_pos)
+    samplers = [
+        TileSampler(reachable_tiles(region, distances), rng) for region in regions
+    ]
+    player_sampler = samplers[0]
+    plan = FloorPlan(dungeon, player_start_pos)
+
+    # 最終フロアかどうかで階段か宝物を、開始位置から離れたタイルに配置
+    goal_samplers = samplers[1:] or samplers
+    goal_tiles = TileSampler(
+        tiles_in_distance_band(
+            [sampler.tiles for sampler in goal_samplers],
+            distances,
+            STAIRS_DISTANCE_BAND,
+        ),
+        rng,
+    )
+    if dungeon_level == 20:
+        goal_pos = place_treasure(plan.spawns, item_data, goal_tiles)
+    else:
+        goal_pos = place_stairs(plan.spawns, goal_tiles)
+    if goal_pos is not None:
+        for sampler in goal_samplers:
+            if sampler.discard(goal_pos):
+                break
+
+    # 敵とアイテムを部屋ごとに配置
+    # 部屋が複数あれば、プレイヤーの開始した部屋には敵を置かない
+    enemy_table = enemy_table or SpawnTable.from_enemies(enemy_data)
+    item_table = item_table or SpawnTable.from_items(item_data)
+    enemies = enemy_table.for_level(dungeon_level)
+    items = item_table.for_level(dungeon_level)
+    for sampler in samplers:
+        if sampler is not player_sampler or len(samplers) == 1:
+            place_enemies(plan.spawns, max_enemies_per_room, enemies, sampler, rng)
+        place_items(plan.spawns, max_items_per_room, items, sampler, rng)
+
+    return plan
+
+
+def build_floor(world: World, plan: FloorPlan) -> Tuple[GameMap, Tuple[int, int]]:
+    """
+    フロアの計画に従って、敵・アイテム・階段をワールドに生成する。
+
+    Args:
+        world (World): エンティティを生成するワールド。
+        plan (FloorPlan): plan_floor で作ったフロアの計画。
+
+    Returns:
+        Tuple[GameMap, Tuple[int, int]]: フロアのマップとプレイヤーの開始位置。
+    """
+    for spawn in plan.spawns:
+        if spawn.kind is SpawnKind.ENEMY:
+            create_enemy(world, spawn.x, spawn.y, spawn.data)
+        elif spawn.kind is SpawnKind.ITEM:
+            create_item(world, spawn.x, spawn.y, spawn.data)
+        else:
+            create_stairs(world, spawn.x, spawn.y)
+    return plan.game_map, plan.player_start
+
+
+def _generate_rectangle(
+    map_width: int, map_height: int
+) -> Tuple[GameMap, List[List[tuple[int, int]]]]:
+    """マップ全体を1つの長方形の部屋にし、部屋の縁を除くタイルを配置候補とする。"""
     dungeon = GameMap(map_width, map_height)
 
     # シンプルな長方形の部屋を作成
@@ -37,115 +235,202 @@ def generate_map(
         tile.FLOOR_TILE
     )
 
-    # 部屋の中の歩行可能なタイルを取得
-    spawnable_tiles: List[tuple[int, int]] = []
-    for x in range(room_x_start + 1, room_x_end):
-        for y in range(room_y_start + 1, room_y_end):
-            spawnable_tiles.append((x, y))
+    # 部屋の中の歩行可能なタイル（部屋の縁を除く）をまとめて取得
+    interior = np.zeros_like(dungeon.walkable)
+    interior[room_x_start + 1 : room_x_end, room_y_start + 1 : room_y_end] = True
+    xs, ys = np.nonzero(interior & dungeon.walkable)
+    return dungeon, [list(zip(xs.tolist(), ys.tolist()))]
 
-    # プレイヤーの開始位置を決定し、配置候補から削除
-    player_start_pos = random.choice(spawnable_tiles)
-    spawnable_tiles.remove(player_start_pos)
 
-    # 敵とアイテムを配置
-    place_enemies(world, max_enemies_per_room, enemy_data, spawnable_tiles)
-    place_items(world, max_items_per_room, item_data, spawnable_tiles)
+def _generate_bsp_rooms(
+    map_width: int, map_height: int, rng: Optional[random.Random] = None
+) -> Tuple[GameMap, List[List[tuple[int, int]]]]:
+    """BSPで部屋と通路を掘り、部屋ごとのタイルを配置候補とする。"""
+    dungeon = GameMap(map_width, map_height)
+    floor, rooms = generate_bsp(map_width, map_height, rng)
+    # 部屋と通路はマスクにまとめて掘り、マップへは1回で書き込む
+    dungeon.set_tile_id(floor, tile.FLOOR_ID)
+    return dungeon, [room.tiles() for room in rooms]
 
-    # 最終フロアかどうかで階段か宝物を配置
-    if dungeon_level == 20:
-        place_treasure(world, item_data, spawnable_tiles)
-    else:
-        place_stairs(world, spawnable_tiles)
 
-    # TODO: より複雑なダンジョン生成アルゴリズム（例：複数の部屋と通路）を実装する
+def _generate_cave(
+    map_width: int, map_height: int, rng: Optional[random.Random] = None
+) -> Tuple[GameMap, List[List[tuple[int, int]]]]:
+    """
+    洞窟を生成し、配置できるタイルを CAVE_REGION_SIZE 四方の区画ごとに分けて、
+    部屋の代わりの配置候補とする。
+    """
+    dungeon = GameMap(map_width, map_height)
+    floor, spawnable = generate_cave(map_width, map_height, rng)
+    dungeon.set_tile_id(floor, tile.FLOOR_ID)
+    return dungeon, spawn_regions(spawnable, CAVE_REGION_SIZE)
+
 
-    return dungeon, player_start_pos
+def spawn_regions(spawnable: np.ndarray, size: int) -> List[List[tuple[int, int]]]:
+    """
+    配置できるタイルのマスクを、size 四方の区画ごとのタイルのリストに分ける。
+    タイルのない区画は含まれない。
+
+    Args:
+        spawnable (np.ndarray): 配置できるタイルの (width, height) のブール配列。
+        size (int): 区画の一辺の長さ。
+
+    Returns:
+        List[List[tuple[int, int]]]: 区画ごとのタイルの座標のリスト（区画の順）。
+    """
+    xs, ys = np.nonzero(spawnable)
+    if len(xs) == 0:
+        return []
+    blocks_y = -(-spawnable.shape[1] // size)
+    keys = (xs // size) * blocks_y + ys // size
+    order = np.argsort(keys, kind="stable")
+    xs, ys, keys = xs[order], ys[order], keys[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    tiles = list(zip(xs.tolist(), ys.tolist()))
+    return [
+        tiles[start:end]
+        for start, end in zip([0, *bounds.tolist()], [*bounds.tolist(), len(tiles)])
+    ]
+
+
+def _tile_distances(tiles: List[tuple[int, int]], distances: np.ndarray) -> np.ndarray:
+    """タイルの座標のリストについて、距離場の値をまとめて取り出す。"""
+    coords = np.fromiter(
+        chain.from_iterable(tiles), dtype=np.intp, count=2 * len(tiles)
+    )
+    return distances[coords[0::2], coords[1::2]]
+
+
+def reachable_tiles(
+    tiles: List[tuple[int, int]], distances: np.ndarray
+) -> List[tuple[int, int]]:
+    """
+    タイルの座標のリストから、距離場で到達できるタイルだけを残したリストを返す。
+
+    Args:
+        tiles (List[tuple[int, int]]): タイルの座標のリスト。
+        distances (np.ndarray): 開始位置からの距離場。
+
+    Returns:
+        List[tuple[int, int]]: 到達できるタイルの座標のリスト（元の順）。
+            すべて到達できる場合は tiles そのものを返す。
+    """
+    reachable = _tile_distances(tiles, distances) != UNREACHABLE
+    if reachable.all():
+        return tiles
+    return [tile_pos for tile_pos, keep in zip(tiles, reachable.tolist()) if keep]
+
+
+def tiles_in_distance_band(
+    regions: List[List[tuple[int, int]]],
+    distances: np.ndarray,
+    band: Tuple[float, float],
+) -> List[tuple[int, int]]:
+    """
+    配置候補のうち、開始位置からの歩数が指定された範囲に入るタイルを返す。
+    範囲は、候補の中で最も遠いタイルの歩数に対する比 (下限, 上限) で指定する。
+
+    Args:
+        regions (List[List[tuple[int, int]]]): 部屋ごとの配置候補。
+        distances (np.ndarray): 開始位置からの距離場。
+        band (Tuple[float, float]): 歩数の範囲（最も遠いタイルの歩数に対する比）。
+
+    Returns:
+        List[tuple[int, int]]: 範囲に入るタイルの座標のリスト。
+            候補に到達できるタイルがなければ空。
+    """
+    tiles = [tile_pos for region in regions for tile_pos in region]
+    steps = _tile_distances(tiles, distances)
+    reachable = steps != UNREACHABLE
+    if not reachable.any():
+        return []
+    farthest = steps[reachable].max()
+    low, high = band
+    in_band = (
+        reachable & (steps >= np.ceil(farthest * low)) & (steps <= farthest * high)
+    )
+    return [tile_pos for tile_pos, keep in zip(tiles, in_band.tolist()) if keep]
 
 
 def place_enemies(
-    world: World,
+    spawns: List[Spawn],
     max_enemies_per_room: int,
-    enemy_data: dict[str, Any],
-    spawnable_tiles: List[tuple[int, int]],
+    enemy_table: Optional[AliasTable[dict[str, Any]]],
+    spawnable_tiles: TileSampler,
+    rng: Optional[random.Random] = None,
 ) -> None:
     """
-    部屋のランダムな位置に敵を配置する。配置したタイルはリストから削除される。
+    部屋のランダムな位置に、抽選表から選んだ敵を配置するよう spawns に追加する。
+    配置したタイルは配置候補から取り除かれる。
     """
-    number_of_enemies = random.randint(0, max_enemies_per_room)
-    enemy_types = list(enemy_data.keys())
+    if enemy_table is None:
+        return
 
+    number_of_enemies = (rng or random).randint(0, max_enemies_per_room)
     for _ in range(number_of_enemies):
-        if not spawnable_tiles:
+        position = spawnable_tiles.take()
+        if position is None:
             break
-
-        x, y = random.choice(spawnable_tiles)
-        spawnable_tiles.remove((x, y))
-
-        enemy_type_key = random.choice(enemy_types)
-        create_enemy(world, x, y, enemy_data[enemy_type_key])
+        x, y = position
+        spawns.append(Spawn(SpawnKind.ENEMY, x, y, enemy_table.sample(rng)))
 
 
 def place_items(
-    world: World,
+    spawns: List[Spawn],
     max_items_per_room: int,
-    item_data: dict[str, Any],
-    spawnable_tiles: List[tuple[int, int]],
+    item_table: Optional[AliasTable[dict[str, Any]]],
+    spawnable_tiles: TileSampler,
+    rng: Optional[random.Random] = None,
 ) -> None:
     """
-    部屋のランダムな位置にアイテムを配置する。配置したタイルはリストから削除される。
+    部屋のランダムな位置に、抽選表から選んだアイテムを配置するよう spawns に追加する。
+    配置したタイルは配置候補から取り除かれる。
     """
-    number_of_items = random.randint(0, max_items_per_room)
-    # 宝物を除くアイテムカテゴリのリストを作成
-    item_categories = [key for key in item_data.keys() if key != "treasure"]
-
-    if not item_categories:
+    if item_table is None:
         return
 
+    number_of_items = (rng or random).randint(0, max_items_per_room)
     for _ in range(number_of_items):
-        if not spawnable_tiles:
+        position = spawnable_tiles.take()
+        if position is None:
             break
-
-        # ランダムなカテゴリと、その中のランダムなアイテムを選択
-        random_category_key = random.choice(item_categories)
-        category_items = item_data[random_category_key]
-        random_item_key = random.choice(list(category_items.keys()))
-        item_to_place = category_items[random_item_key]
-
-        x, y = random.choice(spawnable_tiles)
-        spawnable_tiles.remove((x, y))
-
-        create_item(world, x, y, item_to_place)
+        x, y = position
+        spawns.append(Spawn(SpawnKind.ITEM, x, y, item_table.sample(rng)))
 
 
 def place_stairs(
-    world: World,
-    spawnable_tiles: List[tuple[int, int]],
-) -> None:
+    spawns: List[Spawn],
+    spawnable_tiles: TileSampler,
+) -> Optional[tuple[int, int]]:
     """
-    部屋のランダムな位置に階段を配置する。
+    部屋のランダムな位置に階段を配置するよう spawns に追加し、その座標を返す。
+    配置できるタイルがなければNoneを返す。
     """
-    if not spawnable_tiles:
-        return
+    position = spawnable_tiles.take()
+    if position is None:
+        return None
 
-    x, y = random.choice(spawnable_tiles)
-    spawnable_tiles.remove((x, y))
-    create_stairs(world, x, y)
+    x, y = position
+    spawns.append(Spawn(SpawnKind.STAIRS, x, y))
+    return position
 
 
 def place_treasure(
-    world: World,
+    spawns: List[Spawn],
     item_data: dict[str, Any],
-    spawnable_tiles: List[tuple[int, int]],
-) -> None:
+    spawnable_tiles: TileSampler,
+) -> Optional[tuple[int, int]]:
     """
-    部屋のランダムな位置に宝物を配置する。
+    部屋のランダムな位置に宝物を配置するよう spawns に追加し、その座標を返す。
+    配置できるタイルがなければNoneを返す。
     """
-    if not spawnable_tiles:
-        return
+    position = spawnable_tiles.take()
+    if position is None:
+        return None
 
-    x, y = random.choice(spawnable_tiles)
-    spawnable_tiles.remove((x, y))
+    x, y = position
     # 'treasure'カテゴリから'amulet_of_yendor'を探して配置
     treasure_data = item_data.get("treasure", {}).get("amulet_of_yendor")
     if treasure_data:
-        create_item(world, x, y, treasure_data)
+        spawns.append(Spawn(SpawnKind.ITEM, x, y, treasure_data))
+    return position
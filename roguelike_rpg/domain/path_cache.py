@@ -0,0 +1,204 @@
+# roguelike_rpg/domain/path_cache.py
+"""
+エンティティごとの経路キャッシュ
+前回計算した経路を保持し、目標が1タイル以内しか動いておらず、経路上の
+タイルが変わっていなければ、経路の末尾だけを補修して再利用する。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .pathfinding import UniformCost, find_path
+
+if TYPE_CHECKING:
+    from .ecs.entity import Entity
+    from .game_map import GameMap
+
+Point = Tuple[int, int]
+
+# 塞がれたタイルを避けて経路を計算し直す最大の回数
+MAX_DETOURS = 3
+
+
+@dataclass
+class CachedPath:
+    """
+    キャッシュされた経路。
+
+    Attributes:
+        path (List[Point]): エンティティの現在位置から目標までの経路。
+        game_map (GameMap): 経路を計算したマップ。
+        map_version (int): 経路を計算・検証したときのマップのバージョン。
+    """
+
+    path: List[Point]
+    game_map: "GameMap"
+    map_version: int
+
+
+def _adjacent(a: Point, b: Point) -> bool:
+    """2つのタイルが8方向で隣接している（または同じ）かどうかを返す。"""
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1])) <= 1
+
+
+class PathCache:
+    """
+    エンティティごとに最後に計算した経路を保持し、次のターンで再利用する。
+
+    次の条件をすべて満たす場合、経路を再利用する（ヒット）。
+      - エンティティが経路の先頭か、その次のタイルにいる
+      - 目標の移動が1タイル以内
+      - 経路上のタイルが歩行不可能になっていない
+      - 経路上のタイル（目標を除く）が他のエンティティに塞がれていない
+    目標が動いた場合は、経路全体を計算し直さずに末尾だけを補修する。
+    条件を満たさない場合は経路を計算し直す（ミス）。塞がれていたタイルは、
+    計算し直すときに避ける。
+
+    Attributes:
+        hits (int): 経路を再利用した回数。
+        misses (int): 経路を計算し直した回数。
+        repairs (int): ヒットのうち、経路の末尾を補修した回数。
+    """
+
+    def __init__(self) -> None:
+        self._paths: Dict["Entity", CachedPath] = {}
+        self.hits = 0
+        self.misses = 0
+        self.repairs = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def hit_rate(self) -> float:
+        """経路を再利用できた割合を返す。まだ一度も使われていなければ0。"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def forget(self, entity: "Entity") -> None:
+        """エンティティの経路を破棄する。"""
+        self._paths.pop(entity, None)
+
+    def clear(self) -> None:
+        """すべての経路を破棄する（フロアの移動時など）。"""
+        self._paths.clear()
+
+    def next_step(
+        self,
+        entity: "Entity",
+        game_map: "GameMap",
+        start: Point,
+        goal: Point,
+        is_blocked: Optional[Callable[[int, int], bool]] = None,
+    ) -> Optional[Point]:
+        """
+        エンティティが目標に向かって次に進むタイルを返す。
+
+        Args:
+            entity (Entity): 経路を辿るエンティティ。
+            game_map (GameMap): 対象のマップ。
+            start (Point): エンティティの現在位置。
+            goal (Point): 目標の位置。
+            is_blocked (Optional[Callable[[int, int], bool]]): 指定されたタイルが
+                他のエンティティに塞がれているかどうかを返す関数。
+
+        Returns:
+            Optional[Point]: 次に進むタイルの座標。経路がなければNone。
+        """
+        path, blocked = self._reuse(entity, game_map, start, goal, is_blocked)
+        if path is None:
+            self.misses += 1
+            path = self._plan(game_map, start, goal, blocked, is_blocked)
+            if path is None:
+                self._paths.pop(entity, None)
+                return None
+        else:
+            self.hits += 1
+
+        self._paths[entity] = CachedPath(path, game_map, game_map.version)
+        return path[1] if len(path) > 1 else None
+
+    def _reuse(
+        self,
+        entity: "Entity",
+        game_map: "GameMap",
+        start: Point,
+        goal: Point,
+        is_blocked: Optional[Callable[[int, int], bool]],
+    ) -> Tuple[Optional[List[Point]], List[Point]]:
+        """
+        キャッシュされた経路が再利用できれば、現在位置から目標までの経路を返す。
+        併せて、経路上で塞がれていたタイルを返す。
+        """
+        cached = self._paths.get(entity)
+        if cached is None or cached.game_map is not game_map:
+            return None, []
+
+        path = cached.path
+        # 前回の次のステップに進んでいれば、経路の先頭を進める
+        if len(path) > 1 and path[1] == start:
+            path = path[1:]
+        if path[0] != start or not _adjacent(path[-1], goal):
+            return None, []
+
+        # マップが変更されていれば、経路上のタイルが歩けるままか確認する
+        if cached.map_version != game_map.version:
+            walkable = game_map.walkable
+            if not all(walkable[point] for point in path[1:]):
+                return None, []
+
+        if is_blocked is not None:
+            blocked = [point for point in path[1:-1] if is_blocked(*point)]
+            if blocked:
+                return None, blocked
+
+        if path[-1] != goal:
+            path = self._repair_tail(path, goal, game_map)
+            if path is None:
+                return None, []
+            self.repairs += 1
+        return path, []
+
+    @staticmethod
+    def _repair_tail(
+        path: List[Point], goal: Point, game_map: "GameMap"
+    ) -> Optional[List[Point]]:
+        """1タイル動いた目標に合わせて、経路の末尾だけを付け替える。"""
+        # 目標が経路を引き返してきた場合は、そこで経路を切り詰める
+        if goal in path:
+            return path[: path.index(goal) + 1]
+        if not game_map.walkable[goal]:
+            return None
+        path = path + [goal]
+        # 末尾の1つ手前から直接目標に行けるなら、古い目標を経由しない
+        if len(path) >= 3 and _adjacent(path[-3], goal):
+            del path[-2]
+        return path
+
+    @staticmethod
+    def _plan(
+        game_map: "GameMap",
+        start: Point,
+        goal: Point,
+        blocked: List[Point],
+        is_blocked: Optional[Callable[[int, int], bool]],
+    ) -> Optional[List[Point]]:
+        """
+        経路を計算し直す。塞がれていたタイルは、可能であれば避ける。
+        避けた先の経路も塞がれていれば、MAX_DETOURS 回まで避け直す。
+        """
+        walkable = game_map.walkable
+        if blocked:
+            avoided = walkable.copy()
+            for _ in range(MAX_DETOURS):
+                for point in blocked:
+                    avoided[point] = False
+                path = find_path(game_map, start, goal, UniformCost(avoided))
+                if path is None:
+                    break
+                blocked = [point for point in path[1:-1] if is_blocked(*point)]
+                if not blocked:
+                    return path
+        return find_path(game_map, start, goal, UniformCost(walkable))
@@ -1,6 +1,7 @@
 # roguelike_rpg/domain/pathfinding.py
 """
-A*（エースター）経路探索アルゴリズム
+A*（エースター）経路探索アルゴリズムと、一様コストのグリッド向けの
+ジャンプポイントサーチ（JPS）
 """
 
 from __future__ import annotations
@@ -8,6 +9,8 @@ from __future__ import annotations
 import heapq
 from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
 
+import numpy as np
+
 if TYPE_CHECKING:
     from .game_map import GameMap
 
@@ -101,3 +104,417 @@ def astar(
 
     # 経路が見つからなかった場合
     return None
+
+
+class CostGrid:
+    """
+    移動コストの配列を、A*で使う形（外周を通行不可の番兵で囲んで平坦化した
+    リスト）に変換して保持し、同じマップでの探索に使い回す。
+
+    ノードは平坦化した整数インデックスで表し、g_score・親ノード・探索済みの
+    判定は確保済みの配列で管理する。配列は探索ごとに初期化せず、各要素に
+    書き込んだ探索の世代番号を添えて、現在の世代のものだけを有効とみなす。
+    このため、1回の探索にかかる時間はマップの大きさではなく、
+    展開したノードの数に比例する。
+
+    Attributes:
+        stride (int): 番兵を加えた配列の高さ（平坦化したインデックスの x の刻み）。
+        rebuilds (int): コストのリストを作り直した回数。
+    """
+
+    def __init__(self, cost: Optional[np.ndarray] = None) -> None:
+        """
+        Args:
+            cost (Optional[np.ndarray]): 最初に読み込む移動コストの配列。
+                                         形式は load と同じ。
+        """
+        self.stride = 0
+        self.rebuilds = 0
+        self._costs: List[float] = []
+        self._g_score: List[float] = []
+        self._came_from: List[int] = []
+        # 各ノードの g_score を書き込んだ世代と、展開した世代
+        self._seen: List[int] = []
+        self._closed: List[int] = []
+        self._generation = 0
+        self._game_map: Optional["GameMap"] = None
+        self._map_version = -1
+        if cost is not None:
+            self.load(cost)
+
+    def load(self, cost: np.ndarray) -> None:
+        """
+        移動コストの配列を読み込む。
+
+        Args:
+            cost (np.ndarray): 各タイルの移動コストの (width, height) 配列。
+                               歩行不可能なタイルは無限大。ブール配列の場合は
+                               歩行可能な配列（GameMap.walkable）とみなし、
+                               歩けるタイルのコストを1とする。
+        """
+        inf = float("inf")
+        width, height = cost.shape
+        stride = height + 2
+        padded = np.full((width + 2, stride), inf)
+        if cost.dtype == np.bool_:
+            padded[1:-1, 1:-1] = np.where(cost, 1.0, inf)
+        else:
+            padded[1:-1, 1:-1] = cost
+        self._costs = padded.ravel().tolist()
+        self.stride = stride
+
+        size = len(self._costs)
+        if len(self._seen) != size:
+            self._g_score = [inf] * size
+            self._came_from = [-1] * size
+            self._seen = [0] * size
+            self._closed = [0] * size
+            self._generation = 0
+        self._game_map = None
+        self._map_version = -1
+        self.rebuilds += 1
+
+    def update(self, game_map: "GameMap") -> bool:
+        """
+        マップの歩行可能な配列を、マップが変わった場合だけ読み込み直す。
+
+        Args:
+            game_map (GameMap): 対象のマップ。
+
+        Returns:
+            bool: 読み込み直した場合はTrue、キャッシュを使った場合はFalse。
+        """
+        if self._game_map is game_map and self._map_version == game_map.version:
+            return False
+
+        self.load(game_map.walkable)
+        self._game_map = game_map
+        self._map_version = game_map.version
+        return True
+
+    def find_path(
+        self, start: Tuple[int, int], end: Tuple[int, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        読み込んだコストで、startからendまでの最短経路を計算する。
+        astar と同じ経路を返す。
+
+        優先度付きキューの要素は (f_score, インデックス) で、インデックスは
+        (x, y) の辞書順に並ぶため、同点の場合の順序も astar と一致する。
+
+        Args:
+            start (Tuple[int, int]): 開始座標 (x, y)。
+            end (Tuple[int, int]): 目的地の座標 (x, y)。
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: 経路のリスト(startからend)。
+                                            経路が見つからない場合はNone。
+        """
+        inf = float("inf")
+        stride = self.stride
+        costs = self._costs
+        g_score = self._g_score
+        came_from = self._came_from
+        seen = self._seen
+        closed = self._closed
+        self._generation += 1
+        generation = self._generation
+
+        start_index = (start[0] + 1) * stride + start[1] + 1
+        end_x, end_y = end[0] + 1, end[1] + 1
+        end_index = end_x * stride + end_y
+        # 隣接ノードへのインデックスの差分 (8方向、astar と同じ順序)
+        offsets = [
+            dx * stride + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+        ]
+
+        g_score[start_index] = 0
+        seen[start_index] = generation
+        open_nodes: List[Tuple[float, int]] = [(0, start_index)]
+        while open_nodes:
+            _, current = heapq.heappop(open_nodes)
+            if closed[current] == generation:
+                # 既に展開済みのノード（より良い経路で更新される前の古い要素）
+                continue
+
+            if current == end_index:
+                path = []
+                while current != start_index:
+                    path.append(divmod(current, stride))
+                    current = came_from[current]
+                path.append(divmod(start_index, stride))
+                return [(x - 1, y - 1) for x, y in reversed(path)]
+
+            closed[current] = generation
+            current_g = g_score[current]
+            for offset in offsets:
+                neighbor = current + offset
+                move_cost = costs[neighbor]
+                if closed[neighbor] == generation or move_cost == inf:
+                    continue
+
+                tentative_g_score = current_g + move_cost
+                if (
+                    seen[neighbor] != generation
+                    or tentative_g_score < g_score[neighbor]
+                ):
+                    g_score[neighbor] = tentative_g_score
+                    seen[neighbor] = generation
+                    came_from[neighbor] = current
+                    neighbor_x, neighbor_y = divmod(neighbor, stride)
+                    heuristic_cost = max(
+                        abs(neighbor_x - end_x), abs(neighbor_y - end_y)
+                    )
+                    heapq.heappush(
+                        open_nodes, (tentative_g_score + heuristic_cost, neighbor)
+                    )
+
+        # 経路が見つからなかった場合
+        return None
+
+
+def astar_array(
+    cost: np.ndarray,
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    移動コストの配列を用いるA*アルゴリズム。astar と同じ経路を返す。
+
+    呼び出しごとにコスト配列全体を変換するため、同じマップで繰り返し
+    探索する場合は CostGrid を保持して使い回すこと。
+
+    Args:
+        cost (np.ndarray): 各タイルの移動コストの (width, height) 配列。
+                           形式は CostGrid.load と同じ。
+        start (Tuple[int, int]): 開始座標 (x, y)。
+        end (Tuple[int, int]): 目的地の座標 (x, y)。
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: 経路のリスト(startからend)。
+                                        経路が見つからない場合はNone。
+    """
+    return CostGrid(cost).find_path(start, end)
+
+
+class UniformCost:
+    """
+    歩けるタイルのコストが1、歩けないタイルのコストが無限大となるコスト関数。
+    astar の cost_func としてそのまま使えるほか、find_path はこの型の
+    コスト関数が渡された場合にジャンプポイントサーチを選択する。
+
+    Attributes:
+        walkable (np.ndarray): 各タイルが歩行可能かどうかの (width, height) 配列。
+    """
+
+    def __init__(self, walkable: np.ndarray):
+        self.walkable = walkable
+
+    def __call__(self, x: int, y: int) -> float:
+        return 1.0 if self.walkable[x, y] else float("inf")
+
+
+def _walkable_grid(
+    game_map: "GameMap", cost_func: Callable[[int, int], float]
+) -> np.ndarray:
+    """コスト関数から、各タイルが歩行可能かどうかの配列を得る。"""
+    if isinstance(cost_func, UniformCost):
+        return cost_func.walkable
+    return np.array(
+        [
+            [cost_func(x, y) != float("inf") for y in range(game_map.height)]
+            for x in range(game_map.width)
+        ],
+        dtype=bool,
+    )
+
+
+def jps(
+    game_map: "GameMap",
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    cost_func: Callable[[int, int], float],
+    stats: Optional[dict] = None,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    ジャンプポイントサーチで、startからendまでの最短経路を計算する。
+    astar と同じく8方向に移動し、斜め移動のコストも1とする。
+
+    一様コストのグリッドでは、同じ長さの経路が大量に存在する。JPSは直進・斜め
+    移動を壁の角（強制隣接ノード）に出会うまで一気に進め（ジャンプ）、その
+    ジャンプ先だけを優先度付きキューに積むため、広い部屋では展開するノード数が
+    astar より大幅に少なくなる。返される経路は astar と同じ長さの最短経路だが、
+    同じ長さの経路が複数ある場合にどれを返すかは astar と異なることがある。
+
+    Args:
+        game_map (GameMap): 経路探索を行う対象のマップ。
+        start (Tuple[int, int]): 開始座標 (x, y)。
+        end (Tuple[int, int]): 目的地の座標 (x, y)。
+        cost_func (Callable[[int, int], float]): 指定された座標の移動コストを返す関数。
+                                                歩けるタイルのコストは一様である必要がある
+                                                （UniformCost を推奨）。
+        stats (Optional[dict]): 渡された場合、展開したノード数を "expanded" に記録する。
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: 経路のリスト(startからend)。
+                                        経路が見つからない場合はNone。
+    """
+    walkable = _walkable_grid(game_map, cost_func)
+    width, height = walkable.shape
+    # 外周に番兵（歩行不可）を加え、平坦化したインデックスで扱う
+    stride = height + 2
+    padded = np.zeros((width + 2, stride), dtype=np.uint8)
+    padded[1:-1, 1:-1] = walkable
+    walk = bytearray(padded.ravel().tobytes())
+
+    start_index = (start[0] + 1) * stride + start[1] + 1
+    end_x, end_y = end[0] + 1, end[1] + 1
+    goal = end_x * stride + end_y
+
+    def jump_straight(node: int, step: int, side: int) -> int:
+        """
+        直進方向 step にジャンプし、ジャンプポイントのインデックスを返す。
+        side は進行方向に垂直な方向の差分。見つからなければ -1。
+        """
+        while True:
+            node += step
+            if not walk[node]:
+                return -1
+            if node == goal:
+                return node
+            # 横が壁で、その先の斜め前が歩ける場合は強制隣接ノードがある
+            if (walk[node + side + step] and not walk[node + side]) or (
+                walk[node - side + step] and not walk[node - side]
+            ):
+                return node
+
+    def jump_diagonal(node: int, horizontal: int, vertical: int) -> int:
+        """斜め方向にジャンプし、ジャンプポイントのインデックスを返す。"""
+        step = horizontal + vertical
+        while True:
+            node += step
+            if not walk[node]:
+                return -1
+            if node == goal:
+                return node
+            if (walk[node - horizontal + vertical] and not walk[node - horizontal]) or (
+                walk[node + horizontal - vertical] and not walk[node - vertical]
+            ):
+                return node
+            # 直進方向のジャンプでジャンプポイントが見つかる地点も、ジャンプポイント
+            if (
+                jump_straight(node, horizontal, vertical) != -1
+                or jump_straight(node, vertical, horizontal) != -1
+            ):
+                return node
+
+    def successors(node: int, parent: int) -> List[int]:
+        """ノードから探索する方向を絞り込み、ジャンプ先を列挙する。"""
+        if parent < 0:
+            directions = [
+                (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+            ]
+        else:
+            node_x, node_y = divmod(node, stride)
+            parent_x, parent_y = divmod(parent, stride)
+            dx = (node_x > parent_x) - (node_x < parent_x)
+            dy = (node_y > parent_y) - (node_y < parent_y)
+            if dx and dy:
+                directions = [(dx, 0), (0, dy), (dx, dy)]
+                if not walk[node - dx * stride]:
+                    directions.append((-dx, dy))
+                if not walk[node - dy]:
+                    directions.append((dx, -dy))
+            elif dx:
+                directions = [(dx, 0)]
+                for side in (-1, 1):
+                    if not walk[node + side]:
+                        directions.append((dx, side))
+            else:
+                directions = [(0, dy)]
+                for side in (-1, 1):
+                    if not walk[node + side * stride]:
+                        directions.append((side, dy))
+
+        jump_points = []
+        for dx, dy in directions:
+            if dx and dy:
+                jump_point = jump_diagonal(node, dx * stride, dy)
+            elif dx:
+                jump_point = jump_straight(node, dx * stride, 1)
+            else:
+                jump_point = jump_straight(node, dy, stride)
+            if jump_point != -1:
+                jump_points.append(jump_point)
+        return jump_points
+
+    g_score = {start_index: 0}
+    came_from = {start_index: -1}
+    closed = set()
+    open_nodes: List[Tuple[float, int]] = [(0, start_index)]
+    while open_nodes:
+        _, current = heapq.heappop(open_nodes)
+        if current in closed:
+            continue
+
+        if current == goal:
+            return _expand_jump_path(current, came_from, stride)
+
+        closed.add(current)
+        if stats is not None:
+            stats["expanded"] = stats.get("expanded", 0) + 1
+
+        current_x, current_y = divmod(current, stride)
+        for jump_point in successors(current, came_from[current]):
+            if jump_point in closed:
+                continue
+            jump_x, jump_y = divmod(jump_point, stride)
+            # ジャンプは直線上の移動なので、移動コストはチェビシェフ距離
+            tentative_g_score = g_score[current] + max(
+                abs(jump_x - current_x), abs(jump_y - current_y)
+            )
+            if tentative_g_score < g_score.get(jump_point, float("inf")):
+                g_score[jump_point] = tentative_g_score
+                came_from[jump_point] = current
+                heuristic_cost = max(abs(jump_x - end_x), abs(jump_y - end_y))
+                heapq.heappush(
+                    open_nodes, (tentative_g_score + heuristic_cost, jump_point)
+                )
+
+    # 経路が見つからなかった場合
+    return None
+
+
+def _expand_jump_path(
+    node: int, came_from: dict[int, int], stride: int
+) -> List[Tuple[int, int]]:
+    """ジャンプポイントの列を、1マスずつの経路に展開する（番兵の分の座標を戻す）。"""
+    jump_points = []
+    while node != -1:
+        jump_points.append(divmod(node, stride))
+        node = came_from[node]
+    jump_points.reverse()
+
+    path = [(jump_points[0][0] - 1, jump_points[0][1] - 1)]
+    for (x0, y0), (x1, y1) in zip(jump_points, jump_points[1:]):
+        dx = (x1 > x0) - (x1 < x0)
+        dy = (y1 > y0) - (y1 < y0)
+        for i in range(1, max(abs(x1 - x0), abs(y1 - y0)) + 1):
+            path.append((x0 + dx * i - 1, y0 + dy * i - 1))
+    return path
+
+
+def find_path(
+    game_map: "GameMap",
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    cost_func: Callable[[int, int], float],
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    コスト関数に応じて経路探索アルゴリズムを選び、最短経路を計算する。
+    一様コスト（UniformCost）であればジャンプポイントサーチを、
+    それ以外であれば astar を用いる。引数と戻り値は astar と同じ。
+    """
+    if isinstance(cost_func, UniformCost):
+        return jps(game_map, start, end, cost_func)
+    return astar(game_map, start, end, cost_func)
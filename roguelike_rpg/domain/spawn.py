@@ -0,0 +1,234 @@
+# roguelike_rpg/domain/spawn.py
+"""
+敵やアイテムの出現の抽選
+配置先のタイルは末尾との入れ替えによる非復元抽出で、出現する種類は
+エイリアス法による重み付きの抽選で、いずれも1回あたり O(1) で選ぶ。
+出現表は階層ごとに一度だけ作り、以降の抽選では作り直さない。
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# 出現データで、出現し始める階層を表すキー（省略時は1階から出現する）
+MIN_LEVEL_KEY = "min_level"
+# 出現データで、出現の重みを表すキー（省略時は1）
+WEIGHT_KEY = "weight"
+# 出現表に含めないアイテムのカテゴリ（宝物は最終フロアにだけ配置する）
+EXCLUDED_ITEM_CATEGORIES = ("treasure",)
+
+
+class TileSampler:
+    """
+    タイルの座標のリストから、タイルを重複なくランダムに取り出す。
+    選んだタイルをリストの末尾と入れ替えてから取り除くため、1回の取り出しは O(1)。
+    渡されたリストはそのまま使われ、取り出したタイルはリストからなくなる。
+
+    Attributes:
+        tiles (List[Tuple[int, int]]): まだ取り出されていないタイルの座標（順不同）。
+    """
+
+    def __init__(
+        self, tiles: List[Tuple[int, int]], rng: Optional[random.Random] = None
+    ):
+        self.tiles = tiles
+        self._rng = rng or random
+
+    def __len__(self) -> int:
+        """まだ取り出されていないタイルの数を返す。"""
+        return len(self.tiles)
+
+    def take(self) -> Optional[Tuple[int, int]]:
+        """
+        ランダムなタイルを1つ取り出す。
+
+        Returns:
+            Optional[Tuple[int, int]]: 取り出したタイルの座標。空であればNone。
+        """
+        tiles = self.tiles
+        if not tiles:
+            return None
+        index = self._rng.randrange(len(tiles))
+        tiles[index], tiles[-1] = tiles[-1], tiles[index]
+        return tiles.pop()
+
+    def discard(self, tile: Tuple[int, int]) -> bool:
+        """
+        指定されたタイルを取り除く。タイルを探すため O(n) であり、
+        他の方法で選んだタイル（階段の位置など）を一度だけ取り除くために使う。
+
+        Args:
+            tile (Tuple[int, int]): 取り除くタイルの座標。
+
+        Returns:
+            bool: タイルが含まれていて取り除いた場合はTrue。
+        """
+        tiles = self.tiles
+        try:
+            index = tiles.index(tile)
+        except ValueError:
+            return False
+        tiles[index] = tiles[-1]
+        tiles.pop()
+        return True
+
+
+class AliasTable(Generic[T]):
+    """
+    エイリアス法（Vose の方法）による重み付きの抽選表。
+    作成は O(n)、1回の抽選は乱数2つで O(1) で行える。
+
+    Attributes:
+        values (List[T]): 抽選の対象。
+    """
+
+    def __init__(self, values: Sequence[T], weights: Sequence[float]):
+        """
+        抽選表を作成する。
+
+        Args:
+            values (Sequence[T]): 抽選の対象。
+            weights (Sequence[float]): 各対象の重み（正の数）。
+
+        Raises:
+            ValueError: 対象が空であるか、重みの数が対象の数と異なる場合。
+        """
+        if not values or len(values) != len(weights):
+            raise ValueError("抽選の対象と重みは、同じ数だけ1つ以上必要です")
+        count = len(values)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.values = list(values)
+        self._probability = [1.0] * count
+        self._alias = list(range(count))
+
+        small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            # 重みの足りない枠 less の残りを、重みの余っている more で埋める
+            self._probability[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # 残った枠は浮動小数点の誤差を除けば重みがちょうど1であり、常に自分が選ばれる
+
+    def __len__(self) -> int:
+        """抽選の対象の数を返す。"""
+        return len(self.values)
+
+    def sample(self, rng: Optional[random.Random] = None) -> T:
+        """
+        重みに比例する確率で対象を1つ選ぶ。
+
+        Args:
+            rng (Optional[random.Random]): 乱数生成器。省略時は random モジュール。
+
+        Returns:
+            T: 選ばれた対象。
+        """
+        rng = rng or random
+        index = rng.randrange(len(self.values))
+        if rng.random() >= self._probability[index]:
+            index = self._alias[index]
+        return self.values[index]
+
+
+class SpawnTable:
+    """
+    階層ごとの出現表。出現データのうち、その階層で出現するものを重みに従って選ぶ。
+    各データは省略可能な MIN_LEVEL_KEY（出現し始める階層）と WEIGHT_KEY
+    （出現の重み）を持つ。階層ごとの抽選表は、最初に使われたときに一度だけ作る。
+    フロアの先行生成のワーカースレッドからも使われるため、抽選表の作成はロックで守る。
+    """
+
+    def __init__(self, entries: Sequence[Tuple[Dict[str, Any], int, float]]):
+        """
+        出現表を作成する。
+
+        Args:
+            entries (Sequence[Tuple[Dict[str, Any], int, float]]): 出現データと、
+                出現し始める階層と、重みの組の並び。
+        """
+        self._entries = list(entries)
+        self._tables: Dict[int, Optional[AliasTable[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_enemies(cls, enemy_data: Dict[str, Dict[str, Any]]) -> "SpawnTable":
+        """
+        敵データ（enemies.json の内容）から出現表を作成する。
+
+        Args:
+            enemy_data (Dict[str, Dict[str, Any]]): 敵の種類ごとのデータ。
+
+        Returns:
+            SpawnTable: 敵の出現表。
+        """
+        return cls(
+            [
+                (data, data.get(MIN_LEVEL_KEY, 1), data.get(WEIGHT_KEY, 1.0))
+                for data in enemy_data.values()
+            ]
+        )
+
+    @classmethod
+    def from_items(cls, item_data: Dict[str, Dict[str, Any]]) -> "SpawnTable":
+        """
+        アイテムデータ（items.json の内容）から出現表を作成する。
+        各カテゴリが同じ割合で出現するよう、アイテムの重みはカテゴリ内の
+        アイテムの数で割る。EXCLUDED_ITEM_CATEGORIES のカテゴリは含めない。
+
+        Args:
+            item_data (Dict[str, Dict[str, Any]]): カテゴリごとのアイテムのデータ。
+
+        Returns:
+            SpawnTable: アイテムの出現表。
+        """
+        return cls(
+            [
+                (
+                    data,
+                    data.get(MIN_LEVEL_KEY, 1),
+                    data.get(WEIGHT_KEY, 1.0) / len(category_items),
+                )
+                for category, category_items in item_data.items()
+                if category not in EXCLUDED_ITEM_CATEGORIES
+                for data in category_items.values()
+            ]
+        )
+
+    def for_level(self, dungeon_level: int) -> Optional[AliasTable[Dict[str, Any]]]:
+        """
+        指定された階層の抽選表を返す。
+
+        Args:
+            dungeon_level (int): 階層。
+
+        Returns:
+            Optional[AliasTable[Dict[str, Any]]]: その階層で出現するデータの抽選表。
+                出現するデータがなければNone。
+        """
+        if dungeon_level in self._tables:
+            return self._tables[dungeon_level]
+        with self._lock:
+            if dungeon_level not in self._tables:
+                self._tables[dungeon_level] = self._build_table(dungeon_level)
+            return self._tables[dungeon_level]
+
+    def _build_table(self, dungeon_level: int) -> Optional[AliasTable[Dict[str, Any]]]:
+        """指定された階層で出現するデータから抽選表を作る。"""
+        eligible = [
+            (data, weight)
+            for data, min_level, weight in self._entries
+            if min_level <= dungeon_level and weight > 0
+        ]
+        if not eligible:
+            return None
+        return AliasTable(
+            [data for data, _ in eligible], [weight for _, weight in eligible]
+        )
@@ -3,8 +3,11 @@
 マップタイルに関する定義
 """
 
+import threading
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class Tile:
@@ -33,3 +36,64 @@ FLOOR_TILE = Tile(walkable=True, transparent=True, char=".", color=(150, 150, 15
 # 壁タイルの定義
 # 歩行不可能で、視線も遮る
 WALL_TILE = Tile(walkable=False, transparent=False, char="#", color=(220, 220, 220))
+
+# タイルパレット
+# マップは各タイルを小さな整数IDで保持し、このリストからタイル定義を引く。
+TILE_PALETTE: list[Tile] = [WALL_TILE, FLOOR_TILE]
+WALL_ID = 0
+FLOOR_ID = 1
+
+
+def register_tile(tile: Tile) -> int:
+    """
+    タイルをパレットに登録し、そのIDを返す。既に登録済みであれば既存のIDを返す。
+    フロアの先行生成のワーカースレッドからも呼ばれるため、登録はロックで守る。
+
+    Args:
+        tile (Tile): 登録するタイル。
+
+    Returns:
+        int: タイルのID。
+    """
+    with _palette_lock:
+        for tile_id, registered in enumerate(TILE_PALETTE):
+            if registered is tile or registered == tile:
+                return tile_id
+        TILE_PALETTE.append(tile)
+        return len(TILE_PALETTE) - 1
+
+
+def palette_array(attribute: str) -> np.ndarray:
+    """
+    パレットの各タイルの属性を、IDで添字付けされた配列として返す。
+    tile_ids 配列を添字にすることで、マップ全体の属性を一括で取得できる。
+
+    Args:
+        attribute (str): Tileの属性名（"walkable", "transparent", "char", "color"）。
+
+    Returns:
+        np.ndarray: 属性値の配列。colorの場合は (パレットサイズ, 3) の配列。
+    """
+    key = (attribute, len(TILE_PALETTE))
+    cached = _palette_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with _palette_lock:
+        # パレットへの登録と競合しないよう、ロックを取ってから作り直す
+        key = (attribute, len(TILE_PALETTE))
+        cached = _palette_cache.get(key)
+        if cached is None:
+            values = [getattr(tile, attribute) for tile in TILE_PALETTE]
+            if attribute == "color":
+                cached = np.array(values, dtype=np.uint8)
+            else:
+                cached = np.array(values)
+            _palette_cache[key] = cached
+        return cached
+
+
+# palette_array の結果のキャッシュ {(属性名, パレットサイズ): 配列}
+_palette_cache: dict[tuple[str, int], np.ndarray] = {}
+# TILE_PALETTE と _palette_cache の更新を守るロック
+_palette_lock = threading.Lock()
@@ -0,0 +1,125 @@
+# roguelike_rpg/domain/turn_scheduler.py
+"""
+速さに基づく行動順のスケジューラ
+各アクターの次に行動する時刻を優先度付きキューで管理し、時刻が来た
+アクターだけを取り出す。速いアクターは短い間隔で、遅いアクターは長い間隔で
+再登録されるため、速さの異なるアクターが混在してもそれぞれの頻度で行動する。
+"""
+
+from __future__ import annotations
+
+import heapq
+from itertools import count
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ecs.entity import Entity
+
+# 標準の速さ
+NORMAL_SPEED = 100
+# 標準の速さのアクターが1回の行動に要する時間
+ACTION_COST = 100
+
+
+def action_delay(speed: int) -> int:
+    """
+    指定された速さのアクターが1回の行動に要する時間を返す。
+
+    Args:
+        speed (int): アクターの速さ（NORMAL_SPEED が標準）。
+
+    Returns:
+        int: 次に行動するまでの時間（1以上）。
+    """
+    return max(1, ACTION_COST * NORMAL_SPEED // max(speed, 1))
+
+
+class TurnScheduler:
+    """
+    アクターを次に行動する時刻の順に取り出す優先度付きキュー。
+    登録・取り出しはいずれも O(log n) で行われる。
+    登録を取り消されたアクターの古い項目はキューに残り、取り出すときに読み飛ばす。
+
+    Attributes:
+        time (int): 現在の時刻（最後に取り出した行動の時刻）。
+        visits (int): 行動させるために取り出したアクターの延べ数。
+    """
+
+    def __init__(self) -> None:
+        self.time = 0
+        self.visits = 0
+        # (時刻, 登録番号, アクター) のヒープ
+        self._queue: list[tuple[int, int, Entity]] = []
+        # アクターごとの、有効な項目の登録番号
+        self._tokens: dict[Entity, int] = {}
+        self._counter = count()
+
+    def __len__(self) -> int:
+        """登録されているアクターの数を返す。"""
+        return len(self._tokens)
+
+    def __contains__(self, entity: object) -> bool:
+        """アクターが登録されているかどうかを返す。"""
+        return entity in self._tokens
+
+    def schedule(self, entity: Entity, delay: int) -> None:
+        """
+        アクターを現在の時刻から delay だけ後に行動するよう登録する。
+        既に登録されていれば、以前の登録は取り消される。
+
+        Args:
+            entity (Entity): 登録するアクター。
+            delay (int): 現在の時刻から行動までの時間。
+        """
+        token = next(self._counter)
+        self._tokens[entity] = token
+        heapq.heappush(self._queue, (self.time + delay, token, entity))
+
+    def remove(self, entity: Entity) -> None:
+        """アクターの登録を取り消す。登録されていなければ何もしない。"""
+        self._tokens.pop(entity, None)
+
+    def clear(self) -> None:
+        """すべての登録を取り消す。時刻はそのまま進み続ける。"""
+        self._queue.clear()
+        self._tokens.clear()
+
+    def next_time(self) -> int | None:
+        """次に行動するアクターの時刻を返す。登録がなければNone。"""
+        self._discard_stale()
+        return self._queue[0][0] if self._queue else None
+
+    def pop_due(self, until: int) -> list[Entity]:
+        """
+        時刻 until までに行動するアクターのうち、最も早い時刻のものをすべて取り出す。
+        現在の時刻はその時刻まで進む。取り出したアクターの登録は取り消されるため、
+        行動させた後に schedule で再登録すること。
+
+        Args:
+            until (int): 取り出す行動の時刻の上限（この時刻を含む）。
+
+        Returns:
+            list[Entity]: 同じ時刻に行動するアクター（登録順）。該当がなければ空。
+        """
+        time = self.next_time()
+        if time is None or time > until:
+            return []
+        self.time = time
+        due = []
+        while self._queue and self._queue[0][0] == time:
+            _, token, entity = heapq.heappop(self._queue)
+            if self._tokens.get(entity) == token:
+                del self._tokens[entity]
+                due.append(entity)
+        self.visits += len(due)
+        return due
+
+    def advance_to(self, time: int) -> None:
+        """現在の時刻を進める（プレイヤーの次の行動の時刻など）。"""
+        self.time = max(self.time, time)
+
+    def _discard_stale(self) -> None:
+        """キューの先頭にある、取り消された登録の項目を取り除く。"""
+        queue = self._queue
+        while queue and self._tokens.get(queue[0][2]) != queue[0][1]:
+            heapq.heappop(queue)
@@ -6,6 +6,7 @@
 import os
 from typing import TYPE_CHECKING, List
 
+import numpy as np
 from colorama import Style, init
 
 from roguelike_rpg.domain.ecs.components import (
@@ -25,6 +26,10 @@ if TYPE_CHECKING:
     from roguelike_rpg.domain.message_log import MessageLog
 
 
+# 探索済みだが現在は見えていないタイルを描画するときの明るさの倍率
+EXPLORED_BRIGHTNESS = 0.4
+
+
 # 24-bitカラーをサポートするANSIエスケープシーケンスを生成するヘルパー
 def rgb_fg(r, g, b):
     return f"\x1b[38;2;{r};{g};{b}m"
@@ -62,38 +67,50 @@ class DungeonRenderer:
 
         # 1. 表示用のバッファをマップタイルで初期化
         # バッファは (char, fg_color, bg_color) のタプルを保持
+        # タイルの文字と色はマップ全体の配列からまとめて取得する
+        # 未探索のタイルは描画せず、見えていない探索済みのタイルは暗く描画する
         bg_color = (0, 0, 0)  # デフォルトの背景色
+        visible = self.game_map.visible
+        explored = self.game_map.explored
+        glyphs = np.where(explored, self.game_map.glyphs(), " ")
+        colors = self.game_map.colors()
+        colors = np.where(
+            visible[..., np.newaxis],
+            colors,
+            (colors * EXPLORED_BRIGHTNESS).astype(colors.dtype),
+        )
+        glyphs = glyphs.T.tolist()
+        colors = colors.transpose(1, 0, 2).tolist()
         display_buffer: List[List[tuple[str, tuple, tuple]]] = [
-            [(tile.char, tile.color, bg_color) for tile in row]
-            for row in self.game_map.tiles.T
+            [(char, color, bg_color) for char, color in zip(glyph_row, color_row)]
+            for glyph_row, color_row in zip(glyphs, colors)
         ]
 
         # 2. エンティティを描画バッファに上書き
         # アイテム -> キャラクターの順で描画
-        entities_to_render = self.world.get_entities_with(
-            PositionComponent, RenderableComponent
-        )
+        entities_to_render = self.world.query(PositionComponent, RenderableComponent)
         sorted_entities = sorted(
             entities_to_render,
-            key=lambda e: (
-                0 if self.world.get_component(e, ItemComponent) else 1,
-                self.world.get_component(e, RenderableComponent).char != "@",
+            key=lambda row: (
+                0 if self.world.has_any(row[0], ItemComponent) else 1,
+                row[2].char != "@",
             ),
         )
 
-        for entity in sorted_entities:
+        for entity, pos, renderable in sorted_entities:
             health = self.world.get_component(entity, HealthComponent)
             if health and health.current_hp <= 0:
                 continue  # 死んだキャラクターは描画しない
+            # キャラクターは見えている場所にいるときだけ、アイテムや階段は
+            # 探索済みの場所にあれば描画する
+            if not (visible if health else explored)[pos.x, pos.y]:
+                continue
 
-            pos = self.world.get_component(entity, PositionComponent)
-            renderable = self.world.get_component(entity, RenderableComponent)
-            if pos and renderable:
-                display_buffer[pos.y][pos.x] = (
-                    renderable.char,
-                    renderable.fg,
-                    renderable.bg,
-                )
+            display_buffer[pos.y][pos.x] = (
+                renderable.char,
+                renderable.fg,
+                renderable.bg,
+            )
 
         # 3. ターゲットカーソルをハイライト
         if self.targeting_cursor:
@@ -102,14 +119,15 @@ class DungeonRenderer:
             display_buffer[y][x] = (char, fg, (0, 127, 127))  # 背景をシアンに
 
         # 4. バッファの内容を色付きでコンソールに出力
-        output = ""
-        for y in range(self.game_map.height):
-            for x in range(self.game_map.width):
-                char, fg, bg = display_buffer[y][x]
-                output += (
-                    f"{rgb_fg(fg[0], fg[1], fg[2])}{rgb_bg(bg[0], bg[1], bg[2])}{char}"
-                )
-            output += Style.RESET_ALL + "\n"
+        output = "".join(
+            "".join(
+                f"{rgb_fg(fg[0], fg[1], fg[2])}{rgb_bg(bg[0], bg[1], bg[2])}{char}"
+                for char, fg, bg in row
+            )
+            + Style.RESET_ALL
+            + "\n"
+            for row in display_buffer
+        )
 
         print(output.rstrip())
 
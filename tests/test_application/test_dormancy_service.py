@@ -0,0 +1,83 @@
+# tests/test_application/test_dormancy_service.py
+"""
+敵の休眠を管理するサービスのテスト
+"""
+
+import pytest
+
+from roguelike_rpg.application.dormancy_service import (
+    SLEEP_RADIUS,
+    TURNS_BEFORE_SLEEP,
+    WAKE_RADIUS,
+    DormancyScheduler,
+)
+from roguelike_rpg.domain.ecs.components import AwakeComponent, PositionComponent
+from roguelike_rpg.domain.ecs.world import World
+from roguelike_rpg.domain.factories import create_enemy, create_player
+
+ENEMY_DATA = {
+    "name": "Goblin",
+    "char": "g",
+    "fg_color": [0, 255, 0],
+    "max_hp": 10,
+    "defense": 0,
+    "power": 3,
+}
+
+
+@pytest.fixture
+def dormancy_setup():
+    """プレイヤーの近くと遠くに敵を配置し、すべて休眠させた状態を作る"""
+    world = World(columnar=True)
+    player = create_player(world, 0, 0)
+    near = create_enemy(world, 5, 5, ENEMY_DATA)
+    far = [create_enemy(world, 40 + i, 40, ENEMY_DATA) for i in range(8)]
+    scheduler = DormancyScheduler(interval=4)
+    scheduler.register_floor(world)
+    return world, player, scheduler, near, far
+
+
+def test_wake_near_wakes_only_enemies_in_radius(dormancy_setup):
+    """プレイヤーの周囲の敵だけが起こされることをテストする"""
+    world, _, scheduler, near, far = dormancy_setup
+    assert len(scheduler) == 9
+
+    woken = scheduler.wake_near(world, 0, 0)
+
+    assert woken == [near]
+    assert world.get_component(near, AwakeComponent) is not None
+    assert near not in scheduler
+    assert all(enemy in scheduler for enemy in far)
+    # 起きている敵を再び起こしても何も起きない
+    assert scheduler.wake_near(world, 0, 0, WAKE_RADIUS) == []
+
+
+def test_due_visits_every_dormant_enemy_once_per_interval(dormancy_setup):
+    """休眠中の敵は interval ターンに1度ずつ処理の順番が回ることをテストする"""
+    world, _, scheduler, near, far = dormancy_setup
+    scheduler.wake_near(world, 0, 0)
+
+    visited = [scheduler.due() for _ in range(scheduler.interval)]
+
+    flattened = [enemy for turn in visited for enemy in turn]
+    assert sorted(flattened) == sorted(far)
+    # 1ターンに処理されるのは休眠中の敵の一部だけ
+    assert max(len(turn) for turn in visited) < len(far)
+
+
+def test_rest_puts_far_idle_enemies_to_sleep(dormancy_setup):
+    """遠く離れたまま何もしなかった敵が、数ターン後に休眠することをテストする"""
+    world, player, scheduler, near, far = dormancy_setup
+    scheduler.wake(world, far[:2])
+    # 1体はプレイヤーの近くに移動させる
+    pos = world.get_component(far[1], PositionComponent)
+    pos.x, pos.y = SLEEP_RADIUS, 0
+
+    for _ in range(TURNS_BEFORE_SLEEP - 1):
+        assert scheduler.rest(world, far[:2], player) == []
+    slept = scheduler.rest(world, far[:2], player)
+
+    assert slept == [far[0]]
+    assert world.get_component(far[0], AwakeComponent) is None
+    assert far[0] in scheduler
+    assert world.get_component(far[1], AwakeComponent).idle_turns == 0
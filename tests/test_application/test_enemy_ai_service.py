@@ -7,11 +7,23 @@ import math
 
 import pytest
 
-from roguelike_rpg.application.enemy_ai_service import process_enemy_turn
-from roguelike_rpg.domain.ecs.components import HealthComponent, PositionComponent
+from roguelike_rpg.application.enemy_ai_service import (
+    SIGHT_RADIUS,
+    classify_enemies,
+    plan_enemy_moves,
+    process_enemy_turn,
+)
+from roguelike_rpg.domain.dijkstra import DijkstraMap
+from roguelike_rpg.domain.ecs.components import (
+    ConfusionComponent,
+    HealthComponent,
+    PositionComponent,
+)
 from roguelike_rpg.domain.ecs.world import World
 from roguelike_rpg.domain.factories import create_enemy, create_player
+from roguelike_rpg.domain.fov import FieldOfView
 from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.path_cache import PathCache
 from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
 
 
@@ -113,3 +125,103 @@ def test_enemy_waits_if_path_is_blocked(ai_setup):
     assert enemy_pos_after.x == enemy_x_before
     assert enemy_pos_after.y == enemy_y_before
     assert not logs
+
+
+def test_enemy_follows_shared_chase_map(ai_setup):
+    """距離場が渡された場合、敵がそれを下ってプレイヤーに近づくことをテストする。"""
+    world, game_map, player, enemy = ai_setup
+    chase_map = DijkstraMap()
+
+    logs = process_enemy_turn(world, enemy, player, game_map, chase_map=chase_map)
+
+    enemy_pos = world.get_component(enemy, PositionComponent)
+    # プレイヤーまでの歩数が1歩縮まっていること
+    assert max(abs(enemy_pos.x - 10), abs(enemy_pos.y - 10)) == 4
+    assert chase_map.goal == (10, 10)
+    assert not logs
+
+
+def test_enemy_reuses_cached_path(ai_setup):
+    """経路キャッシュが渡された場合、前回の経路を再利用して追跡することをテストする。"""
+    world, game_map, player, enemy = ai_setup
+    path_cache = PathCache()
+
+    process_enemy_turn(world, enemy, player, game_map, path_cache=path_cache)
+    process_enemy_turn(world, enemy, player, game_map, path_cache=path_cache)
+
+    enemy_pos = world.get_component(enemy, PositionComponent)
+    assert max(abs(enemy_pos.x - 10), abs(enemy_pos.y - 10)) == 3
+    assert (path_cache.hits, path_cache.misses) == (1, 1)
+
+
+def test_planned_moves_let_queued_enemies_advance_together(ai_setup):
+    """まとめて計画した場合、縦に並んだ敵が待機せずに揃って前進することをテストする。"""
+    world, game_map, player, enemy = ai_setup
+    follower_data = {
+        "name": "Orc",
+        "char": "o",
+        "fg_color": [0, 128, 0],
+        "max_hp": 10,
+        "defense": 0,
+        "power": 3,
+    }
+    follower = create_enemy(world, 10, 4, follower_data)
+    # 1列の通路にする
+    game_map.tiles[:, :] = WALL_TILE
+    game_map.tiles[10, 1:19] = FLOOR_TILE
+
+    plan = plan_enemy_moves(world, [follower, enemy], player, game_map, DijkstraMap())
+    assert plan.order == [enemy, follower]
+    for entity in plan.order:
+        process_enemy_turn(world, entity, player, game_map, planned_moves=plan.moves)
+
+    enemy_pos = world.get_component(enemy, PositionComponent)
+    follower_pos = world.get_component(follower, PositionComponent)
+    assert (enemy_pos.y, follower_pos.y) == (6, 5)
+
+
+def test_classify_enemies_sorts_into_buckets(ai_setup):
+    """敵が生死・距離・混乱に応じて行動の種類ごとに振り分けられることをテストする。"""
+    world, game_map, player, chaser = ai_setup
+    enemy_data = {
+        "name": "Goblin",
+        "char": "g",
+        "fg_color": [0, 255, 0],
+        "max_hp": 10,
+        "defense": 0,
+        "power": 3,
+    }
+    attacker = create_enemy(world, 11, 11, enemy_data)
+    idle = create_enemy(world, 19, 19, enemy_data)
+    confused = create_enemy(world, 0, 0, enemy_data)
+    world.add_component(confused, ConfusionComponent(duration=3))
+    dead = create_enemy(world, 9, 9, enemy_data)
+    world.get_component(dead, HealthComponent).current_hp = 0
+
+    buckets = classify_enemies(world, [chaser, attacker, idle, confused, dead], player)
+
+    assert buckets.chase == [chaser]
+    assert buckets.attack == [attacker]
+    assert buckets.idle == [idle]
+    assert buckets.confused == [confused]
+
+
+def test_enemy_behind_wall_does_not_notice_player(ai_setup):
+    """視界が渡された場合、壁の向こうの敵はプレイヤーに気づかないことをテストする。"""
+    world, game_map, player, enemy = ai_setup
+    # 敵(10, 5)とプレイヤー(10, 10)の間に横長の壁を置く
+    game_map.tiles[5:16, 7] = WALL_TILE
+    fov = FieldOfView()
+    fov.update(game_map, (10, 10), SIGHT_RADIUS)
+
+    buckets = classify_enemies(world, [enemy], player, fov.visible)
+    logs = process_enemy_turn(world, enemy, player, game_map, visible=fov.visible)
+
+    assert buckets.idle == [enemy]
+    assert logs == []
+    enemy_pos = world.get_component(enemy, PositionComponent)
+    assert (enemy_pos.x, enemy_pos.y) == (10, 5)
+    # 壁を取り除くと視線が通り、追跡を始める
+    game_map.tiles[5:16, 7] = FLOOR_TILE
+    assert fov.update(game_map, (10, 10), SIGHT_RADIUS)
+    assert classify_enemies(world, [enemy], player, fov.visible).chase == [enemy]
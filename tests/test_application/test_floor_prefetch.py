@@ -0,0 +1,124 @@
+# tests/test_application/test_floor_prefetch.py
+"""
+次のフロアの先行生成のテスト
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from roguelike_rpg.application.floor_prefetch import FloorPrefetcher, floor_seed
+from roguelike_rpg.application.game_loop import GameLoop
+from roguelike_rpg.domain.ecs.components import EnemyComponent, PositionComponent
+from roguelike_rpg.domain.spawn import SpawnTable
+
+
+def _wait_until_ready(prefetcher, dungeon_level, timeout=5.0):
+    """先行生成が終わるまで待つ"""
+    deadline = time.monotonic() + timeout
+    while not prefetcher.is_ready(dungeon_level):
+        assert time.monotonic() < deadline, "先行生成が終わらない"
+        time.sleep(0.001)
+
+
+def _enemy_positions(game_loop):
+    """フロアの敵の位置の集合を返す"""
+    world = game_loop.world
+    return {
+        (pos.x, pos.y)
+        for pos in (
+            world.get_component(enemy, PositionComponent)
+            for enemy in world.get_entities_with(EnemyComponent)
+        )
+    }
+
+
+def _prefetch_threads():
+    """生きている先行生成のワーカースレッドの一覧を返す"""
+    return [
+        thread
+        for thread in threading.enumerate()
+        if thread.name.startswith("floor-prefetch")
+    ]
+
+
+def test_floor_seed_depends_on_game_seed_and_level():
+    """フロアのシードがゲームのシードと階層だけで決まることをテストする"""
+    assert floor_seed(1, 2) == floor_seed(1, 2)
+    assert floor_seed(1, 2) != floor_seed(1, 3)
+    assert floor_seed(1, 2) != floor_seed(2, 2)
+
+
+def test_ready_prefetch_is_a_hit():
+    """先行生成が終わっていれば、その計画が返されてヒットになることをテストする"""
+    calls = []
+    prefetcher = FloorPrefetcher(lambda level: calls.append(level) or f"floor {level}")
+
+    prefetcher.prefetch(2)
+    _wait_until_ready(prefetcher, 2)
+
+    assert prefetcher.take(2) == "floor 2"
+    assert calls == [2]
+    assert (prefetcher.hits, prefetcher.misses) == (1, 0)
+    prefetcher.close()
+
+
+def test_missing_prefetch_falls_back_to_synchronous_generation():
+    """先行生成がない、または別の階層の場合はその場で生成することをテストする"""
+    calls = []
+    prefetcher = FloorPrefetcher(
+        lambda level: calls.append(level) or f"floor {level}", background=False
+    )
+
+    prefetcher.prefetch(2)
+    assert prefetcher.take(2) == "floor 2"
+    assert (prefetcher.hits, prefetcher.misses) == (0, 1)
+
+    background = FloorPrefetcher(lambda level: f"floor {level}")
+    background.prefetch(2)
+    assert background.take(3) == "floor 3"
+    assert background.misses == 1
+    assert "misses: 1" in background.report()
+    background.close()
+
+
+def test_prefetched_floor_matches_synchronous_floor():
+    """先行生成したフロアと、その場で生成したフロアが同じになることをテストする"""
+    with (
+        GameLoop(map_width=50, map_height=30, seed=7) as prefetched,
+        GameLoop(map_width=50, map_height=30, seed=7, prefetch=False) as synchronous,
+    ):
+        _wait_until_ready(prefetched.prefetcher, 2)
+
+        prefetched.next_floor()
+        synchronous.next_floor()
+
+        assert prefetched.prefetcher.hits == 1
+        assert synchronous.prefetcher.misses == 1
+        np.testing.assert_array_equal(
+            prefetched.game_map.tile_ids, synchronous.game_map.tile_ids
+        )
+        assert _enemy_positions(prefetched) == _enemy_positions(synchronous)
+
+
+def test_closing_game_loop_stops_prefetch_worker():
+    """GameLoopを閉じると、生成中の計画を待ってワーカースレッドが終了することをテストする"""
+    with GameLoop(map_width=50, map_height=30, seed=7) as game_loop:
+        assert _prefetch_threads()
+    assert not _prefetch_threads()
+    # 閉じた後に閉じ直しても、先行生成を頼んでも何も起きない
+    game_loop.close()
+    game_loop.prefetcher.prefetch(3)
+    assert not _prefetch_threads()
+
+
+def test_spawn_table_builds_each_level_once_across_threads():
+    """複数のスレッドから同時に使っても、階層ごとの抽選表が1つだけ作られることをテストする"""
+    enemy_data = {"goblin": {"name": "goblin"}, "orc": {"name": "orc", "weight": 3}}
+    spawn_table = SpawnTable.from_enemies(enemy_data)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tables = list(executor.map(spawn_table.for_level, [4] * 64))
+
+    assert all(table is tables[0] for table in tables)
@@ -3,13 +3,17 @@
 GameLoopクラスの統合的なテスト
 """
 
+import math
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from roguelike_rpg.application.dormancy_service import WAKE_RADIUS
 from roguelike_rpg.application.game_loop import GameLoop
 from roguelike_rpg.application.game_state import GameState
 from roguelike_rpg.domain.ecs.components import (
+    AttackPowerComponent,
+    AwakeComponent,
     EnemyComponent,
     HealthComponent,
     InventoryComponent,
@@ -17,18 +21,21 @@ from roguelike_rpg.domain.ecs.components import (
     PositionComponent,
     StairsComponent,
 )
-from roguelike_rpg.domain.factories import create_item
+from roguelike_rpg.domain.factories import create_enemy, create_item
+from roguelike_rpg.domain.mapgen import FloorPlan, MapGenerator
+
+# 1階と2階のどちらにも敵が生成されるシード
+GAME_SEED = 0
 
 
 @pytest.fixture
 def game_loop_setup():
     """
     テスト用のGameLoopインスタンスをセットアップするフィクスチャ。
-    敵とアイテムが必ず1つは生成されるようにrandomをモック化する。
+    フロアはシードから決まるため、1階と2階に敵が生成されるシードを固定する。
     """
-    with patch("roguelike_rpg.domain.mapgen.random.randint", return_value=1):
-        game_loop = GameLoop(map_width=50, map_height=30)
-    return game_loop
+    with GameLoop(map_width=50, map_height=30, seed=GAME_SEED) as game_loop:
+        yield game_loop
 
 
 def test_next_floor_resets_map_and_entities(game_loop_setup):
@@ -48,8 +55,7 @@ def test_next_floor_resets_map_and_entities(game_loop_setup):
     initial_stairs = list(world.get_entities_with(StairsComponent))
 
     # Act
-    with patch("roguelike_rpg.domain.mapgen.random.randint", return_value=1):
-        game_loop.next_floor()
+    game_loop.next_floor()
 
     # Assert
     # 階層レベルが上がっている
@@ -73,30 +79,56 @@ def test_next_floor_resets_map_and_entities(game_loop_setup):
     assert len(list(world.get_entities_with(StairsComponent))) == 1
 
 
-@patch("roguelike_rpg.application.game_loop.generate_map")
-def test_next_floor_increases_difficulty(mock_generate_map):
+@patch("roguelike_rpg.application.game_loop.plan_floor")
+def test_next_floor_increases_difficulty(mock_plan_floor):
     """
     next_floorを呼び出すと、難易度（最大敵数）が上昇することをテストする。
     """
     # Arrange
-    # generate_mapのモックが (map, start_pos) のタプルを返すように設定
-    mock_generate_map.return_value = (MagicMock(), (0, 0))
-    game_loop = GameLoop(map_width=50, map_height=30)
+    # plan_floorのモックが、エンティティのないフロアの計画を返すように設定
+    # 呼び出しの順序が決まるよう、先行生成は行わない
+    mock_plan_floor.return_value = FloorPlan(MagicMock(), (0, 0))
+    game_loop = GameLoop(map_width=50, map_height=30, prefetch=False)
 
     # Act & Assert
     game_loop.next_floor()
-    args, kwargs = mock_generate_map.call_args
+    args, kwargs = mock_plan_floor.call_args
     assert kwargs["max_enemies_per_room"] == 3  # B2F
 
     game_loop.next_floor()
-    args, kwargs = mock_generate_map.call_args
+    args, kwargs = mock_plan_floor.call_args
     assert kwargs["max_enemies_per_room"] == 3  # B3F
 
     game_loop.next_floor()
-    args, kwargs = mock_generate_map.call_args
+    args, kwargs = mock_plan_floor.call_args
     assert kwargs["max_enemies_per_room"] == 4  # B4F
 
 
+@patch("roguelike_rpg.application.game_loop.plan_floor")
+def test_cave_floors_alternate_with_rooms(mock_plan_floor):
+    """
+    生成方式を指定しない場合、一定の階層ごとに洞窟のフロアが生成されることをテストする。
+    """
+    mock_plan_floor.return_value = FloorPlan(MagicMock(), (0, 0))
+    game_loop = GameLoop(map_width=50, map_height=30, prefetch=False)
+    generators = [mock_plan_floor.call_args.kwargs["generator"]]
+    for _ in range(3):
+        game_loop.next_floor()
+        generators.append(mock_plan_floor.call_args.kwargs["generator"])
+
+    assert generators == [
+        MapGenerator.BSP,
+        MapGenerator.BSP,
+        MapGenerator.CAVE,
+        MapGenerator.BSP,
+    ]
+
+    with GameLoop(
+        map_width=50, map_height=30, map_generator=MapGenerator.CAVE
+    ) as forced:
+        assert forced._generator_for(1) == MapGenerator.CAVE
+
+
 def test_dead_enemies_are_cleaned_up(game_loop_setup):
     """
     HPが0になった敵がターン終了時にクリーンアップされることをテストする。
@@ -141,3 +173,70 @@ def test_picking_up_treasure_wins_game(game_loop_setup):
 
     # Assert
     assert game_loop.game_state == GameState.VICTORY
+
+
+def test_far_enemies_stay_dormant(game_loop_setup):
+    """
+    プレイヤーから遠い敵は休眠したままで、近くの敵だけが毎ターン処理されることをテストする。
+    """
+    # Arrange
+    game_loop = game_loop_setup
+    world = game_loop.world
+    player_pos = world.get_component(game_loop.player, PositionComponent)
+    enemies = list(world.get_entities_with(EnemyComponent))
+    assert enemies, "前提条件：テストマップに敵が存在しません"
+
+    # Act
+    game_loop.process_enemy_turns()
+
+    # Assert
+    for enemy in enemies:
+        pos = world.get_component(enemy, PositionComponent)
+        if pos is None:
+            continue
+        distance = max(abs(pos.x - player_pos.x), abs(pos.y - player_pos.y))
+        if distance <= 8:
+            # 敵の視界内にいる敵は必ず起きている
+            assert world.get_component(enemy, AwakeComponent) is not None
+        elif math.dist((pos.x, pos.y), (player_pos.x, player_pos.y)) > WAKE_RADIUS:
+            # 起こす範囲の外にいる敵は休眠したまま
+            assert world.get_component(enemy, AwakeComponent) is None
+            assert enemy in game_loop.dormancy
+
+
+def test_fast_enemies_act_more_often_than_slow_ones(game_loop_setup):
+    """速い敵はプレイヤーの1回の行動の間に2回、遅い敵は2回に1回攻撃することをテストする。"""
+    # Arrange
+    game_loop = game_loop_setup
+    world = game_loop.world
+    player = game_loop.player
+    # 既存の敵は取り除き、プレイヤーの両隣に速い敵と遅い敵を置く
+    world.delete_entities(list(world.get_entities_with(EnemyComponent)))
+    player_pos = world.get_component(player, PositionComponent)
+    player_health = world.get_component(player, HealthComponent)
+    player_health.max_hp = player_health.current_hp = 1000
+    enemy_data = {
+        "name": "Bat",
+        "char": "b",
+        "fg_color": [127, 127, 127],
+        "max_hp": 6,
+        "defense": 0,
+        "power": 12,
+    }
+    create_enemy(world, player_pos.x + 1, player_pos.y, enemy_data | {"speed": 200})
+    golem = create_enemy(
+        world, player_pos.x - 1, player_pos.y, enemy_data | {"speed": 50}
+    )
+    world.get_component(golem, AttackPowerComponent).power = 102
+    game_loop.dormancy.register_floor(world)
+
+    # Act
+    game_loop.process_enemy_turns()
+    after_first = player_health.current_hp
+    game_loop.process_enemy_turns()
+
+    # Assert
+    # コウモリは1ターンに2回攻撃する (ダメージ10 x 2)
+    # ゴーレムは2ターン目に1回だけ攻撃する (ダメージ100)
+    assert after_first == 1000 - 20
+    assert player_health.current_hp == after_first - 20 - 100
@@ -10,9 +10,11 @@ import pytest
 from roguelike_rpg.application.game_state import GameState
 from roguelike_rpg.application.services import (
     attack,
+    attack_all,
     calculate_score,
     move_player,
     pickup_item,
+    remove_stale_items,
     toggle_equipment,
     use_item,
 )
@@ -164,6 +166,36 @@ def test_attack_deals_damage(combat_setup):
 
 
 # --- アイテム関連のテスト ---
+def test_attack_all_matches_sequential_attacks(combat_setup):
+    """まとめた攻撃が、1体ずつ攻撃した場合と同じHPとログになることをテストする。"""
+    world, game_map, player, enemy = combat_setup
+    weak_data = {
+        "name": "Weakling",
+        "char": "w",
+        "fg_color": [255, 0, 0],
+        "max_hp": 5,
+        "defense": 0,
+        "power": 1,
+    }
+    attackers = [enemy, create_enemy(world, 4, 6, weak_data)] + [
+        create_enemy(world, 6, 4 + i, {**weak_data, "power": 40}) for i in range(3)
+    ]
+    player_health = world.get_component(player, HealthComponent)
+    hp_before = player_health.current_hp
+
+    expected_logs = []
+    for attacker in attackers:
+        expected_logs.extend(attack(world, attacker, player))
+    expected_hp = player_health.current_hp
+    player_health.current_hp = hp_before
+
+    logs = attack_all(world, attackers, player)
+
+    assert player_health.current_hp == expected_hp
+    assert logs == expected_logs
+    assert attack_all(world, [], player) == []
+
+
 def test_pickup_item(item_setup):
     world, _, player, potion, _ = item_setup
     logs = pickup_item(world, player)
@@ -185,6 +217,19 @@ def test_use_item_heals(item_setup):
     assert potion not in inventory.items
 
 
+def test_remove_stale_items(item_setup):
+    world, _, player, potion, dagger = item_setup
+    inventory = world.get_component(player, InventoryComponent)
+    equipment = world.get_component(player, EquipmentComponent)
+    inventory.items.append(potion)
+    equipment.slots[EquipmentSlot.WEAPON] = dagger
+    world.delete_entities([potion, dagger])
+
+    remove_stale_items(world, player)
+    assert inventory.items == []
+    assert equipment.slots[EquipmentSlot.WEAPON] is None
+
+
 def test_equip_item_adds_bonus(item_setup):
     world, _, player, _, dagger = item_setup
     inventory = world.get_component(player, InventoryComponent)
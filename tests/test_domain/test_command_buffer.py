@@ -0,0 +1,63 @@
+"""
+コマンドバッファのテスト
+"""
+
+from roguelike_rpg.domain.ecs.command_buffer import CommandBuffer
+from roguelike_rpg.domain.ecs.components import (
+    ConfusionComponent,
+    EnemyComponent,
+    HealthComponent,
+    PositionComponent,
+)
+from roguelike_rpg.domain.ecs.world import World
+
+
+def test_commands_are_applied_only_on_flush():
+    world = World()
+    commands = CommandBuffer(world)
+    enemy = world.create_entity(EnemyComponent(), ConfusionComponent(duration=1))
+
+    created = commands.create_entity(PositionComponent(x=1, y=2), EnemyComponent())
+    commands.remove_component(enemy, ConfusionComponent)
+    commands.add_component(enemy, HealthComponent(max_hp=3, current_hp=3))
+    assert len(commands) == 3
+    assert world.get_component(created, PositionComponent) is None
+    assert world.get_component(enemy, ConfusionComponent) is not None
+
+    commands.flush()
+    assert len(commands) == 0
+    assert world.get_component(created, PositionComponent).y == 2
+    assert world.get_component(enemy, ConfusionComponent) is None
+    assert world.get_component(enemy, HealthComponent).current_hp == 3
+    assert set(world.get_entities_with(EnemyComponent)) == {enemy, created}
+
+
+def test_deletes_can_be_recorded_while_iterating_a_query():
+    world = World()
+    commands = CommandBuffer(world)
+    for hp in (0, 5, 0, 5):
+        world.create_entity(HealthComponent(max_hp=5, current_hp=hp))
+
+    for entity in world.get_entities_with(HealthComponent):
+        if world.get_component(entity, HealthComponent).current_hp <= 0:
+            commands.delete_entity(entity)
+    commands.flush()
+
+    remaining = list(world.get_entities_with(HealthComponent))
+    assert len(remaining) == 2
+    assert all(
+        world.get_component(e, HealthComponent).current_hp == 5 for e in remaining
+    )
+
+
+def test_changes_to_deleted_entities_are_skipped():
+    world = World()
+    commands = CommandBuffer(world)
+    enemy = world.create_entity(EnemyComponent())
+
+    commands.delete_entity(enemy)
+    commands.add_component(enemy, PositionComponent(x=0, y=0))
+    commands.flush()
+
+    assert not world.is_alive(enemy)
+    assert list(world.get_entities_with(PositionComponent)) == []
@@ -0,0 +1,116 @@
+# tests/test_domain/test_cooperative.py
+"""
+予約表を用いた協調経路探索のテスト
+"""
+
+import random
+
+from roguelike_rpg.domain.cooperative import ReservationTable, plan_cooperative
+from roguelike_rpg.domain.dijkstra import DijkstraMap
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.tile import FLOOR_TILE
+
+
+def _open_room(width: int = 30, height: int = 20) -> GameMap:
+    game_map = GameMap(width, height)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    return game_map
+
+
+def _distance_map(game_map, goal):
+    distance_map = DijkstraMap()
+    distance_map.update(game_map, goal)
+    return distance_map
+
+
+def _execute(plan, positions):
+    """計画の順に移動を適用し、移動先が塞がれていた回数を返す。"""
+    occupied = set(positions.values())
+    blocked = 0
+    for agent in plan.order:
+        destination = plan.moves[agent]
+        if destination is None:
+            continue
+        if destination in occupied:
+            blocked += 1
+            continue
+        occupied.discard(positions[agent])
+        occupied.add(destination)
+        positions[agent] = destination
+    return blocked
+
+
+def test_reservation_table_tracks_cells_and_swaps():
+    """予約したマスとすれ違いが検出されること"""
+    table = ReservationTable(static=[(5, 5)])
+    table.reserve_path([(1, 1), (2, 1), (3, 1)], until=4)
+
+    assert not table.is_free(5, 5, 0)
+    assert not table.is_free(2, 1, 1)
+    assert table.is_free(2, 1, 2)
+    assert not table.is_free(3, 1, 4)
+    assert table.crosses((2, 1), (1, 1), 0)
+    assert not table.crosses((1, 1), (2, 1), 0)
+
+
+def test_agents_in_a_corridor_follow_each_other():
+    """一列に並んだエージェントが、前のエージェントの空けたマスに同時に進むこと"""
+    game_map = GameMap(20, 3)
+    game_map.tiles[1:-1, 1] = FLOOR_TILE
+    distance_map = _distance_map(game_map, (18, 1))
+    positions = {"a": (5, 1), "b": (4, 1), "c": (3, 1)}
+
+    plan = plan_cooperative(game_map, distance_map, dict(positions))
+
+    assert plan.order == ["a", "b", "c"]
+    assert plan.moves == {"a": (6, 1), "b": (5, 1), "c": (4, 1)}
+    assert _execute(plan, positions) == 0
+
+
+def test_crowd_moves_without_conflicts():
+    """大勢のエージェントが、移動先の衝突もすれ違いもなく目標に集まること"""
+    game_map = _open_room()
+    goal = (15, 10)
+    distance_map = _distance_map(game_map, goal)
+    rng = random.Random(0)
+    floor = [
+        (x, y)
+        for x in range(1, 29)
+        for y in range(1, 19)
+        if max(abs(x - goal[0]), abs(y - goal[1])) > 1
+    ]
+    positions = dict(enumerate(rng.sample(floor, 100)))
+
+    for _ in range(15):
+        before = dict(positions)
+        plan = plan_cooperative(game_map, distance_map, dict(positions))
+        destinations = [move for move in plan.moves.values() if move is not None]
+        assert len(destinations) == len(set(destinations))
+        for agent, move in plan.moves.items():
+            if move is not None:
+                assert move not in before.values() or any(
+                    before[other] == move and plan.moves[other] is not None
+                    for other in plan.order[: plan.order.index(agent)]
+                )
+        assert _execute(plan, positions) == 0
+        assert len(set(positions.values())) == len(positions)
+
+    # 目標の周囲8マスはすべて埋まっている
+    around = {
+        (goal[0] + dx, goal[1] + dy)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        if dx or dy
+    }
+    assert around <= set(positions.values())
+
+
+def test_obstacles_are_avoided():
+    """動かない障害物のマスには入らないこと"""
+    game_map = GameMap(20, 3)
+    game_map.tiles[1:-1, 1] = FLOOR_TILE
+    distance_map = _distance_map(game_map, (18, 1))
+
+    plan = plan_cooperative(game_map, distance_map, {"a": (5, 1)}, obstacles=[(6, 1)])
+
+    assert plan.moves == {"a": None}
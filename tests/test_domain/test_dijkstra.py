@@ -0,0 +1,100 @@
+# tests/test_domain/test_dijkstra.py
+"""
+ダイクストラマップ（距離場）のテスト
+"""
+
+import numpy as np
+import pytest
+
+from roguelike_rpg.domain.dijkstra import (
+    UNREACHABLE,
+    DijkstraMap,
+    compute_distance_field,
+    compute_distance_fields,
+)
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.pathfinding import astar
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+
+@pytest.fixture
+def game_map() -> GameMap:
+    """中央に縦の壁（下端だけ通れる）があるマップ"""
+    game_map = GameMap(12, 8)
+    game_map.tiles[1:11, 1:7] = FLOOR_TILE
+    game_map.tiles[6, 1:6] = WALL_TILE
+    return game_map
+
+
+def test_distance_field_matches_astar_path_length(game_map):
+    """距離場の値が、A*で求めた経路の歩数と一致すること"""
+    goal = (2, 2)
+    distances = compute_distance_field(game_map.walkable, goal)
+    walkable = game_map.walkable
+
+    for start in [(9, 2), (10, 6), (3, 5), (7, 1)]:
+        path = astar(
+            game_map,
+            start=start,
+            end=goal,
+            cost_func=lambda x, y: 1.0 if walkable[x, y] else float("inf"),
+        )
+        assert distances[start] == len(path) - 1
+
+
+def test_walls_and_disconnected_tiles_are_unreachable(game_map):
+    """壁や孤立したタイルには到達できないこと"""
+    game_map.tiles[8:11, 5:7] = WALL_TILE
+    game_map.tiles[10, 6] = FLOOR_TILE
+    distances = compute_distance_field(game_map.walkable, (2, 2))
+
+    assert distances[0, 0] == UNREACHABLE
+    assert distances[6, 3] == UNREACHABLE
+    assert distances[10, 6] == UNREACHABLE
+    assert distances[2, 2] == 0
+    assert np.all(distances[game_map.walkable] >= 0)
+
+
+def test_single_field_matches_batched_fields():
+    """1つの距離場の計算が、まとめて計算した距離場と一致すること"""
+    rng = np.random.default_rng(0)
+    walkable = rng.random((40, 25)) < 0.7
+    goals = [(0, 0), (39, 24), (20, 12)]
+    for goal in goals:
+        walkable[goal] = True
+
+    batched = compute_distance_fields(walkable, goals)
+    for goal, expected in zip(goals, batched):
+        np.testing.assert_array_equal(compute_distance_field(walkable, goal), expected)
+
+
+def test_next_step_walks_downhill_to_goal(game_map):
+    """next_step を辿ると、壁を回り込んで目標地点に到着すること"""
+    chase_map = DijkstraMap()
+    chase_map.update(game_map, (2, 2))
+
+    position = (9, 2)
+    steps = 0
+    while (step := chase_map.next_step(*position)) is not None:
+        assert chase_map.distance(*step) == chase_map.distance(*position) - 1
+        position = step
+        steps += 1
+    assert position == (2, 2)
+    # 壁の下端 (6, 6) を経由する最短経路の歩数
+    assert steps == chase_map.distance(9, 2) == 8
+
+
+def test_field_is_recomputed_only_when_goal_or_map_changes(game_map):
+    """目標地点かマップが変わったときだけ距離場を再計算すること"""
+    chase_map = DijkstraMap()
+
+    assert chase_map.update(game_map, (2, 2)) is True
+    assert chase_map.update(game_map, (2, 2)) is False
+    assert chase_map.update(game_map, (3, 2)) is True
+
+    game_map.tiles[6, 6] = WALL_TILE
+    assert chase_map.update(game_map, (3, 2)) is True
+    assert chase_map.distance(9, 2) == UNREACHABLE
+
+    assert chase_map.update(GameMap(12, 8), (3, 2)) is True
+    assert chase_map.recomputations == 4
@@ -0,0 +1,65 @@
+# tests/test_domain/test_fov.py
+"""
+視界の計算のテスト
+"""
+
+import numpy as np
+
+from roguelike_rpg.domain.fov import FieldOfView, compute_fov
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+
+def test_open_area_is_fully_visible_within_radius():
+    """遮るもののない場所では、半径内の正方形がすべて見えることをテストする"""
+    transparent = np.ones((21, 21), dtype=bool)
+
+    visible = compute_fov(transparent, (10, 10), 4)
+
+    expected = np.zeros_like(visible)
+    expected[6:15, 6:15] = True
+    np.testing.assert_array_equal(visible, expected)
+
+
+def test_walls_are_visible_but_block_sight():
+    """壁そのものは見えるが、壁の向こうは見えないことをテストする"""
+    transparent = np.ones((21, 21), dtype=bool)
+    transparent[12, 5:16] = False
+
+    visible = compute_fov(transparent, (10, 10), 8)
+
+    assert visible[12, 10]
+    assert not visible[13, 10]
+    assert not visible[18, 10]
+    # 壁の手前と、壁の脇からは見える
+    assert visible[11, 10]
+    assert visible[10, 18]
+    assert visible[2, 10]
+
+
+def test_fov_near_map_edge_stays_in_bounds():
+    """マップの端にいても、マップの外を参照せずに計算できることをテストする"""
+    transparent = np.ones((5, 5), dtype=bool)
+
+    visible = compute_fov(transparent, (0, 0), 8)
+
+    assert visible.all()
+
+
+def test_field_of_view_is_cached_until_origin_or_map_changes():
+    """視点とマップが変わらない限り、視界が再計算されないことをテストする"""
+    game_map = GameMap(width=20, height=20)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    fov = FieldOfView()
+
+    assert fov.update(game_map, (5, 5), 8)
+    assert not fov.update(game_map, (5, 5), 8)
+    assert fov.is_visible(10, 5)
+
+    # 視点が動くと再計算される
+    assert fov.update(game_map, (6, 5), 8)
+    # タイルが変わると再計算される
+    game_map.tiles[8, 1:-1] = WALL_TILE
+    assert fov.update(game_map, (6, 5), 8)
+    assert not fov.is_visible(10, 5)
+    assert fov.recomputations == 3
@@ -0,0 +1,99 @@
+# tests/test_domain/test_game_map.py
+"""
+GameMap のタイル配列に関するテスト
+"""
+
+import numpy as np
+
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.tile import FLOOR_ID, FLOOR_TILE, WALL_ID, WALL_TILE, Tile
+
+
+def test_new_map_is_filled_with_walls():
+    """新しいマップは壁で満たされ、歩行・視線ともに不可であること"""
+    game_map = GameMap(10, 5)
+    assert game_map.tile_ids.shape == (10, 5)
+    assert game_map.tile_ids.dtype == np.uint8
+    assert np.all(game_map.tile_ids == WALL_ID)
+    assert not game_map.walkable.any()
+    assert not game_map.transparent.any()
+    assert game_map.tiles[3, 2] is WALL_TILE
+
+
+def test_setting_tiles_updates_attribute_arrays():
+    """タイルの書き込みで、IDと歩行可能・視線透過の配列が同期されること"""
+    game_map = GameMap(10, 5)
+    game_map.tiles[2:5, 1] = FLOOR_TILE
+
+    assert np.all(game_map.tile_ids[2:5, 1] == FLOOR_ID)
+    assert game_map.walkable[2:5, 1].all()
+    assert game_map.transparent[2:5, 1].all()
+    assert not game_map.walkable[5, 1]
+    assert game_map.tiles[3, 1] is FLOOR_TILE
+    assert list(game_map.tiles[1:3, 1]) == [WALL_TILE, FLOOR_TILE]
+
+
+def test_unknown_tile_is_registered_in_palette():
+    """パレットにないタイルを書き込むと、登録されて読み出せること"""
+    game_map = GameMap(4, 4)
+    glass = Tile(walkable=False, transparent=True, char="=", color=(0, 200, 255))
+    game_map.tiles[1, 1] = glass
+
+    assert game_map.tiles[1, 1] == glass
+    assert not game_map.walkable[1, 1]
+    assert game_map.transparent[1, 1]
+    assert game_map.glyphs()[1, 1] == "="
+    assert tuple(game_map.colors()[1, 1]) == (0, 200, 255)
+
+
+def test_player_start_distance_field_is_stored():
+    """開始位置からの距離場がマップに保持され、到達判定に使えることをテストする"""
+    game_map = GameMap(width=12, height=6)
+    assert not game_map.is_reachable(1, 1)
+
+    game_map.tiles[1:5, 1:5] = FLOOR_TILE
+    game_map.tiles[7:11, 1:5] = FLOOR_TILE
+    distances = game_map.set_player_start((1, 1))
+
+    assert game_map.player_start == (1, 1)
+    assert distances is game_map.start_distances
+    assert distances[4, 4] == 3
+    assert game_map.is_reachable(4, 4)
+    assert not game_map.is_reachable(8, 2)
+
+
+def test_update_fov_tracks_visible_and_explored_tiles():
+    """視界の更新で、見えているタイルと探索済みのタイルが記録されることをテストする"""
+    game_map = GameMap(width=30, height=10)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+
+    assert game_map.update_fov((5, 5), 3)
+    assert not game_map.update_fov((5, 5), 3)
+    assert game_map.is_visible(8, 5) and not game_map.is_visible(9, 5)
+    np.testing.assert_array_equal(game_map.explored, game_map.visible)
+
+    # 視点が動くと、見えなくなったタイルも探索済みとして残る
+    assert game_map.update_fov((20, 5), 3)
+    assert not game_map.is_visible(5, 5)
+    assert game_map.is_explored(5, 5)
+    assert game_map.is_explored(20, 5)
+    assert not game_map.is_explored(12, 5)
+    for x, y in np.ndindex(game_map.width, game_map.height):
+        assert game_map.is_visible(x, y) == game_map.visible[x, y]
+        assert game_map.is_explored(x, y) == game_map.explored[x, y]
+
+    # 視界の計算とキャッシュは FieldOfView が担い、マップはその結果を詰めるだけ
+    assert game_map.fov.recomputations == 2
+    np.testing.assert_array_equal(game_map.visible, game_map.fov.visible)
+    game_map.tiles[12, 5] = FLOOR_TILE
+    assert game_map.update_fov((20, 5), 3)
+    assert game_map.fov.recomputations == 3
+
+
+def test_fov_masks_are_bit_packed():
+    """視界のマスクがタイル8個あたり1バイトで保持されることをテストする"""
+    game_map = GameMap(width=80, height=50)
+
+    assert game_map.visible_bits.nbytes == 80 * 50 // 8
+    assert game_map.explored_bits.nbytes == 80 * 50 // 8
+    assert game_map.visible.shape == (80, 50)
@@ -0,0 +1,93 @@
+# tests/test_domain/test_hpa.py
+"""
+階層的経路探索（HPA*）のテスト
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.hpa import HierarchicalPathfinder
+from roguelike_rpg.domain.pathfinding import astar_array
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+
+def _random_map(seed: int, width: int = 40, height: int = 30) -> GameMap:
+    rng = random.Random(seed)
+    game_map = GameMap(width, height)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    for x in range(1, width - 1):
+        for y in range(1, height - 1):
+            if rng.random() < 0.3:
+                game_map.tiles[x, y] = WALL_TILE
+    return game_map
+
+
+def _assert_valid_path(game_map, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert max(abs(x1 - x0), abs(y1 - y0)) == 1
+        assert game_map.walkable[x1, y1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_paths_are_valid_and_near_optimal(seed):
+    """経路が歩行可能なタイルをつなぎ、到達可能性がA*と一致すること"""
+    game_map = _random_map(seed)
+    pathfinder = HierarchicalPathfinder(game_map, cluster_size=8)
+    rng = random.Random(seed)
+    floor = list(zip(*np.nonzero(game_map.walkable)))
+    for _ in range(30):
+        start, end = (tuple(map(int, p)) for p in rng.sample(floor, 2))
+        expected = astar_array(game_map.walkable, start, end)
+        path = pathfinder.find_path(start, end)
+        if expected is None:
+            assert path is None
+            continue
+        _assert_valid_path(game_map, path, start, end)
+        assert len(path) - 1 <= 1.5 * (len(expected) - 1)
+
+
+def test_interior_tile_change_rebuilds_only_its_cluster():
+    """クラスタ内部のタイルの変更では、そのクラスタだけが再構築されること"""
+    game_map = GameMap(40, 40)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    pathfinder = HierarchicalPathfinder(game_map, cluster_size=10)
+    builds = pathfinder.cluster_builds
+
+    game_map.tiles[15, 15] = WALL_TILE
+    pathfinder.find_path((1, 1), (38, 38))
+
+    assert pathfinder.cluster_builds == builds + 1
+
+
+def test_border_tile_change_rebuilds_neighboring_clusters():
+    """境界上のタイルの変更では、境界に接するクラスタが再構築されること"""
+    game_map = GameMap(40, 40)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    pathfinder = HierarchicalPathfinder(game_map, cluster_size=10)
+    builds = pathfinder.cluster_builds
+
+    game_map.tiles[19, 15] = WALL_TILE
+    pathfinder.find_path((1, 1), (38, 38))
+
+    assert pathfinder.cluster_builds == builds + 2
+
+
+def test_map_changes_are_reflected_in_paths():
+    """壁で分断したり開通させたりすると、経路の有無が変わること"""
+    game_map = GameMap(40, 20)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    pathfinder = HierarchicalPathfinder(game_map, cluster_size=8)
+    start, end = (2, 10), (37, 10)
+    assert pathfinder.find_path(start, end) is not None
+
+    game_map.tiles[20, :] = WALL_TILE
+    assert pathfinder.find_path(start, end) is None
+
+    game_map.tiles[20, 3] = FLOOR_TILE
+    path = pathfinder.find_path(start, end)
+    _assert_valid_path(game_map, path, start, end)
+    assert (20, 3) in path
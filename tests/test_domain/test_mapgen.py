@@ -3,11 +3,32 @@
 マップ生成ロジックのテスト
 """
 
+import random
+
+import numpy as np
 import pytest
 
+from roguelike_rpg.domain.bsp import generate_bsp
+from roguelike_rpg.domain.cave import (
+    generate_cave,
+    largest_component,
+    neighbor_count,
+)
+from roguelike_rpg.domain.dijkstra import UNREACHABLE, compute_distance_field
+from roguelike_rpg.domain.ecs.components import (
+    EnemyComponent,
+    PositionComponent,
+    StairsComponent,
+)
 from roguelike_rpg.domain.ecs.world import World
 from roguelike_rpg.domain.game_map import GameMap
-from roguelike_rpg.domain.mapgen import generate_map
+from roguelike_rpg.domain.mapgen import (
+    STAIRS_DISTANCE_BAND,
+    MapGenerator,
+    generate_map,
+    reachable_tiles,
+    tiles_in_distance_band,
+)
 from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
 
 
@@ -67,3 +88,187 @@ def test_generate_map_has_floor_in_interior(generated_map: GameMap):
     for x in range(1, generated_map.width - 1):
         for y in range(1, generated_map.height - 1):
             assert generated_map.tiles[x, y] is FLOOR_TILE
+
+
+def test_bsp_layout_connects_all_rooms():
+    """BSPで生成した部屋がすべて床で、通路で互いにつながっていることをテストする"""
+    rng = random.Random(0)
+    floor, rooms = generate_bsp(80, 40, rng)
+
+    assert len(rooms) > 1
+    # 外周は壁のまま
+    assert not floor[0, :].any() and not floor[-1, :].any()
+    assert not floor[:, 0].any() and not floor[:, -1].any()
+    for room in rooms:
+        assert floor[room.slices].all()
+    # 最初の部屋から、すべての床タイルに到達できる
+    distances = compute_distance_field(floor, rooms[0].center)
+    assert (distances[floor] != UNREACHABLE).all()
+
+
+def test_bsp_layout_is_reproducible_with_same_rng():
+    """同じ乱数生成器の状態からは同じレイアウトが生成されることをテストする"""
+    floor_a, rooms_a = generate_bsp(60, 30, random.Random(42))
+    floor_b, rooms_b = generate_bsp(60, 30, random.Random(42))
+
+    np.testing.assert_array_equal(floor_a, floor_b)
+    assert rooms_a == rooms_b
+
+
+def test_generate_map_with_bsp_populates_rooms():
+    """BSPのマップで、プレイヤー・階段・敵が部屋ごとに配置されることをテストする"""
+    world = World()
+    enemy_data = {
+        "goblin": {
+            "name": "Goblin",
+            "char": "g",
+            "fg_color": [0, 255, 0],
+            "max_hp": 10,
+            "defense": 0,
+            "power": 3,
+        }
+    }
+    random.seed(1)
+    game_map, (px, py) = generate_map(
+        world=world,
+        map_width=80,
+        map_height=30,
+        dungeon_level=1,
+        max_enemies_per_room=2,
+        max_items_per_room=0,
+        enemy_data=enemy_data,
+        item_data={},
+        generator=MapGenerator.BSP,
+    )
+
+    assert game_map.walkable[px, py]
+    assert len(list(world.get_entities_with(StairsComponent))) == 1
+    for _, pos in world.query(PositionComponent):
+        assert game_map.walkable[pos.x, pos.y]
+        assert (pos.x, pos.y) != (px, py)
+    # 敵はプレイヤーの部屋以外の部屋に配置される
+    assert list(world.get_entities_with(EnemyComponent))
+
+
+def test_cave_is_a_single_connected_area():
+    """洞窟の床がすべてつながっており、配置できるタイルが床の中にあることをテストする"""
+    floor, spawnable = generate_cave(80, 40, random.Random(0))
+
+    assert floor.any()
+    assert not floor[0, :].any() and not floor[-1, :].any()
+    assert not floor[:, 0].any() and not floor[:, -1].any()
+    assert spawnable.any() and not (spawnable & ~floor).any()
+    start = tuple(np.argwhere(floor)[0])
+    distances = compute_distance_field(floor, start)
+    assert (distances[floor] != UNREACHABLE).all()
+
+
+def test_largest_component_keeps_only_biggest_area():
+    """最大の連結成分だけが残り、斜めの隣接もつながりとみなすことをテストする"""
+    mask = np.zeros((10, 10), dtype=bool)
+    mask[1:3, 1:3] = True  # 4タイル
+    mask[3, 3] = True  # 斜めに接しているため、上の成分とつながる
+    mask[6:9, 6:8] = True  # 6タイル
+    mask[0, 9] = True  # 孤立した1タイル
+
+    largest = largest_component(mask)
+
+    expected = np.zeros_like(mask)
+    expected[6:9, 6:8] = True
+    np.testing.assert_array_equal(largest, expected)
+
+    mask[4, 4] = mask[5, 5] = True  # 斜めの連なりで2つの成分がつながる
+    expected = mask.copy()
+    expected[0, 9] = False
+    np.testing.assert_array_equal(largest_component(mask), expected)
+
+
+def test_neighbor_count_counts_3x3_including_outside():
+    """周囲3x3の数を数え、マップの外を True として扱うことをテストする"""
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[1, 1] = True
+
+    counts = neighbor_count(mask)
+
+    assert counts[2, 2] == 1
+    assert counts[3, 3] == 5  # 角のタイルはマップの外の5タイルを数える
+    assert counts[1, 1] == 1
+
+
+def test_generate_map_with_cave_places_player_and_stairs():
+    """洞窟のマップで、プレイヤーと階段が床の上に配置されることをテストする"""
+    world = World()
+    random.seed(2)
+    game_map, (px, py) = generate_map(
+        world=world,
+        map_width=60,
+        map_height=40,
+        dungeon_level=1,
+        max_enemies_per_room=0,
+        max_items_per_room=0,
+        enemy_data={},
+        item_data={},
+        generator=MapGenerator.CAVE,
+    )
+
+    assert game_map.walkable[px, py]
+    (stairs,) = world.get_entities_with(StairsComponent)
+    pos = world.get_component(stairs, PositionComponent)
+    assert game_map.walkable[pos.x, pos.y]
+
+
+@pytest.mark.parametrize("generator", list(MapGenerator))
+def test_stairs_are_placed_far_from_player_start(generator):
+    """階段が、開始位置から到達できる遠いタイルに配置されることをテストする"""
+    world = World()
+    random.seed(5)
+    game_map, start = generate_map(
+        world=world,
+        map_width=60,
+        map_height=40,
+        dungeon_level=1,
+        max_enemies_per_room=2,
+        max_items_per_room=2,
+        enemy_data={
+            "orc": {
+                "name": "Orc",
+                "char": "o",
+                "fg_color": [63, 127, 63],
+                "max_hp": 10,
+                "power": 3,
+                "defense": 0,
+            }
+        },
+        item_data={},
+        generator=generator,
+    )
+
+    distances = game_map.start_distances
+    assert game_map.player_start == start
+    np.testing.assert_array_equal(
+        distances, compute_distance_field(game_map.walkable, start)
+    )
+    (stairs,) = world.get_entities_with(StairsComponent)
+    pos = world.get_component(stairs, PositionComponent)
+    farthest = distances[distances != UNREACHABLE].max()
+    # 候補は部屋の中のタイルに限られるため、マップ全体で最も遠いタイルより少し近い
+    assert distances[pos.x, pos.y] >= STAIRS_DISTANCE_BAND[0] * farthest * 0.8
+    for entity in world.get_entities_with(PositionComponent):
+        entity_pos = world.get_component(entity, PositionComponent)
+        assert game_map.is_reachable(entity_pos.x, entity_pos.y)
+
+
+def test_reachable_tiles_and_distance_band():
+    """到達できないタイルの除外と、歩数の範囲によるタイルの選択をテストする"""
+    distances = np.full((10, 1), UNREACHABLE, dtype=np.int32)
+    distances[:6, 0] = np.arange(6)
+    tiles = [(x, 0) for x in range(10)]
+
+    assert reachable_tiles(tiles, distances) == tiles[:6]
+    assert reachable_tiles([], distances) == []
+    assert tiles_in_distance_band([tiles[:3], tiles[3:]], distances, (0.6, 1.0)) == [
+        (3, 0),
+        (4, 0),
+        (5, 0),
+    ]
+    assert tiles_in_distance_band([tiles[6:]], distances, (0.6, 1.0)) == []
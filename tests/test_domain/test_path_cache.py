@@ -0,0 +1,122 @@
+# tests/test_domain/test_path_cache.py
+"""
+経路キャッシュのテスト
+"""
+
+import pytest
+
+from roguelike_rpg.domain.ecs.entity import Entity
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.path_cache import PathCache
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_TILE
+
+ENEMY = Entity(1)
+
+
+@pytest.fixture
+def game_map() -> GameMap:
+    game_map = GameMap(30, 10)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    return game_map
+
+
+def _follow(cache, game_map, start, goal, turns, **kwargs):
+    """next_step に従ってエンティティを移動させ、最後の位置を返す。"""
+    position = start
+    for _ in range(turns):
+        step = cache.next_step(ENEMY, game_map, position, goal, **kwargs)
+        if step is None:
+            break
+        position = step
+    return position
+
+
+def test_path_is_reused_while_target_stays(game_map):
+    """目標が動かなければ、最初の1回だけ経路を計算すること"""
+    cache = PathCache()
+
+    position = _follow(cache, game_map, (2, 5), (20, 5), turns=5)
+
+    assert position == (7, 5)
+    assert (cache.hits, cache.misses) == (4, 1)
+    assert cache.hit_rate == pytest.approx(0.8)
+
+
+def test_entity_that_did_not_move_reuses_path(game_map):
+    """前回の次のステップに進めなかった場合も、経路を再利用すること"""
+    cache = PathCache()
+    step = cache.next_step(ENEMY, game_map, (2, 5), (20, 5))
+
+    assert cache.next_step(ENEMY, game_map, (2, 5), (20, 5)) == step
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_target_moving_one_tile_repairs_tail(game_map):
+    """目標が1タイル動いた場合は、経路の末尾だけを補修して再利用すること"""
+    cache = PathCache()
+    position = cache.next_step(ENEMY, game_map, (2, 5), (20, 5))
+
+    position = cache.next_step(ENEMY, game_map, position, (21, 6))
+    position = _follow(cache, game_map, position, (21, 6), turns=17)
+
+    assert position == (21, 6)
+    assert cache.misses == 1
+    assert cache.repairs == 1
+
+
+def test_target_jumping_far_triggers_replan(game_map):
+    """目標が2タイル以上動いた場合は、経路を計算し直すこと"""
+    cache = PathCache()
+    position = cache.next_step(ENEMY, game_map, (2, 5), (20, 5))
+
+    cache.next_step(ENEMY, game_map, position, (20, 8))
+
+    assert cache.misses == 2
+
+
+def test_wall_on_path_triggers_replan(game_map):
+    """経路上のタイルが歩けなくなった場合は、経路を計算し直すこと"""
+    cache = PathCache()
+    position = cache.next_step(ENEMY, game_map, (2, 5), (20, 5))
+    game_map.tiles[10, 1:-1] = WALL_TILE
+    game_map.tiles[10, 1] = FLOOR_TILE
+
+    position = _follow(cache, game_map, position, (20, 5), turns=1)
+    assert cache.misses == 2
+
+    position = _follow(cache, game_map, position, (20, 5), turns=30)
+    assert position == (20, 5)
+
+
+def test_occupied_tile_on_path_is_avoided(game_map):
+    """経路上のタイルが塞がれた場合は、そのタイルを避けて計算し直すこと"""
+    cache = PathCache()
+    position = cache.next_step(ENEMY, game_map, (2, 5), (20, 5))
+    occupied = {(5, 5), (5, 4), (5, 6)}
+
+    def is_blocked(x, y):
+        return (x, y) in occupied
+
+    visited = []
+    while position != (20, 5):
+        position = cache.next_step(
+            ENEMY, game_map, position, (20, 5), is_blocked=is_blocked
+        )
+        visited.append(position)
+
+    assert visited[-1] == (20, 5)
+    assert not occupied.intersection(visited)
+    assert cache.misses == 2
+
+
+def test_forget_and_clear_drop_cached_paths(game_map):
+    """forget と clear で経路が破棄されること"""
+    cache = PathCache()
+    cache.next_step(ENEMY, game_map, (2, 5), (20, 5))
+    cache.next_step(Entity(2), game_map, (2, 6), (20, 5))
+    assert len(cache) == 2
+
+    cache.forget(ENEMY)
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
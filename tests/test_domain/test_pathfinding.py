@@ -0,0 +1,143 @@
+# tests/test_domain/test_pathfinding.py
+"""
+経路探索のテスト
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from roguelike_rpg.domain.game_map import GameMap
+from roguelike_rpg.domain.pathfinding import (
+    CostGrid,
+    UniformCost,
+    astar,
+    astar_array,
+    find_path,
+    jps,
+)
+from roguelike_rpg.domain.tile import FLOOR_TILE, WALL_ID, WALL_TILE
+
+
+def _random_map(seed: int, width: int = 30, height: int = 20) -> GameMap:
+    """内側の約3割が壁のランダムなマップを作る。"""
+    rng = random.Random(seed)
+    game_map = GameMap(width, height)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    for x in range(1, width - 1):
+        for y in range(1, height - 1):
+            if rng.random() < 0.3:
+                game_map.tiles[x, y] = WALL_TILE
+    return game_map
+
+
+def _astar_walkable(game_map, start, end):
+    walkable = game_map.walkable
+    return astar(
+        game_map,
+        start=start,
+        end=end,
+        cost_func=lambda x, y: 1.0 if walkable[x, y] else float("inf"),
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_astar_array_returns_same_paths_as_astar(seed):
+    """配列版のA*が、既存のA*と同じ経路（経路なしを含む）を返すこと"""
+    game_map = _random_map(seed)
+    rng = random.Random(seed)
+    floor = list(zip(*np.nonzero(game_map.walkable)))
+    for _ in range(20):
+        start, end = (tuple(map(int, p)) for p in rng.sample(floor, 2))
+        expected = _astar_walkable(game_map, start, end)
+        assert astar_array(game_map.walkable, start, end) == expected
+
+
+def test_astar_array_accepts_weighted_cost_grid():
+    """コスト配列を渡した場合、コストの高いタイルを避ける経路を返すこと"""
+    cost = np.ones((5, 3))
+    cost[1:4, 1] = 10.0
+    cost[2, 0] = float("inf")
+
+    path = astar_array(cost, (0, 1), (4, 1))
+
+    assert path[0] == (0, 1) and path[-1] == (4, 1)
+    assert (2, 2) in path
+    assert path == astar(
+        GameMap(5, 3), (0, 1), (4, 1), cost_func=lambda x, y: cost[x, y]
+    )
+
+
+def test_astar_array_start_equals_end():
+    """開始地点と目的地が同じ場合、その1点だけの経路を返すこと"""
+    walkable = np.ones((3, 3), dtype=bool)
+    assert astar_array(walkable, (1, 1), (1, 1)) == [(1, 1)]
+
+
+def test_cost_grid_reuses_costs_until_map_changes():
+    """同じマップでは変換済みのコストを使い回し、タイルが変わると作り直すこと"""
+    game_map = _random_map(3)
+    grid = CostGrid()
+    rng = random.Random(3)
+    floor = list(zip(*np.nonzero(game_map.walkable)))
+
+    for query in range(20):
+        assert grid.update(game_map) == (query == 0)
+        start, end = (tuple(map(int, p)) for p in rng.sample(floor, 2))
+        assert grid.find_path(start, end) == _astar_walkable(game_map, start, end)
+    assert grid.rebuilds == 1
+
+    game_map.set_tile_id(np.ones_like(game_map.walkable), WALL_ID)
+    assert grid.update(game_map)
+    assert grid.rebuilds == 2
+    assert grid.find_path(start, end) is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_jps_finds_paths_as_short_as_astar(seed):
+    """JPSの経路が、連続した歩行可能なタイルからなり、A*と同じ長さであること"""
+    game_map = _random_map(seed)
+    cost = UniformCost(game_map.walkable)
+    rng = random.Random(seed)
+    floor = list(zip(*np.nonzero(game_map.walkable)))
+    for _ in range(20):
+        start, end = (tuple(map(int, p)) for p in rng.sample(floor, 2))
+        expected = astar(game_map, start, end, cost)
+        path = jps(game_map, start, end, cost)
+        if expected is None:
+            assert path is None
+            continue
+        assert len(path) == len(expected)
+        assert path[0] == start and path[-1] == end
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            assert max(abs(x1 - x0), abs(y1 - y0)) == 1
+            assert game_map.walkable[x1, y1]
+
+
+def test_jps_expands_few_nodes_in_open_room():
+    """広い部屋では、JPSが展開するノードがごく少数であること"""
+    game_map = GameMap(60, 40)
+    game_map.tiles[1:-1, 1:-1] = FLOOR_TILE
+    stats = {}
+
+    path = jps(game_map, (1, 1), (58, 30), UniformCost(game_map.walkable), stats)
+
+    assert len(path) == 58
+    assert stats["expanded"] <= 5
+
+
+def test_find_path_selects_algorithm_by_cost_function():
+    """一様コストではJPSを、それ以外ではA*を使うこと"""
+    game_map = _random_map(0)
+    walkable = game_map.walkable
+    start, end = (1, 1), (28, 18)
+    game_map.tiles[start] = game_map.tiles[end] = FLOOR_TILE
+
+    uniform = find_path(game_map, start, end, UniformCost(walkable))
+    custom = find_path(
+        game_map, start, end, lambda x, y: 1.0 if walkable[x, y] else float("inf")
+    )
+
+    assert uniform == jps(game_map, start, end, UniformCost(walkable))
+    assert custom == _astar_walkable(game_map, start, end)
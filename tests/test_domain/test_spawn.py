@@ -0,0 +1,97 @@
+# tests/test_domain/test_spawn.py
+"""
+敵やアイテムの出現の抽選のテスト
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from roguelike_rpg.domain.spawn import AliasTable, SpawnTable, TileSampler
+from roguelike_rpg.infrastructure.data_loader import load_json_data
+
+
+def test_tile_sampler_takes_each_tile_once():
+    """タイルが重複なくすべて取り出され、その後はNoneになることをテストする"""
+    tiles = [(x, y) for x in range(5) for y in range(4)]
+    sampler = TileSampler(list(tiles), random.Random(0))
+
+    taken = [sampler.take() for _ in range(len(tiles))]
+
+    assert sorted(taken) == tiles
+    assert len(sampler) == 0
+    assert sampler.take() is None
+
+
+def test_tile_sampler_discard_removes_given_tile():
+    """指定したタイルを取り除けることをテストする"""
+    sampler = TileSampler([(0, 0), (1, 0), (2, 0)], random.Random(0))
+
+    assert sampler.discard((0, 0))
+    assert not sampler.discard((0, 0))
+    assert sorted(sampler.tiles) == [(1, 0), (2, 0)]
+
+
+def test_alias_table_follows_weights():
+    """抽選の頻度が重みに比例することをテストする"""
+    table = AliasTable(["a", "b", "c", "d"], [1, 2, 3, 0])
+    rng = random.Random(1)
+
+    counts = Counter(table.sample(rng) for _ in range(60000))
+
+    assert counts["d"] == 0
+    for value, weight in (("a", 1), ("b", 2), ("c", 3)):
+        assert counts[value] / 60000 == pytest.approx(weight / 6, abs=0.01)
+
+
+def test_alias_table_rejects_empty_values():
+    """抽選の対象が空の場合にエラーになることをテストする"""
+    with pytest.raises(ValueError):
+        AliasTable([], [])
+
+
+def test_spawn_table_filters_by_level_and_caches_tables():
+    """出現し始める階層より浅い階層では出現せず、抽選表が使い回されることをテストする"""
+    enemy_data = {
+        "goblin": {"name": "goblin"},
+        "dragon": {"name": "dragon", "min_level": 5, "weight": 2},
+    }
+    spawn_table = SpawnTable.from_enemies(enemy_data)
+
+    shallow = spawn_table.for_level(1)
+    deep = spawn_table.for_level(5)
+
+    assert [data["name"] for data in shallow.values] == ["goblin"]
+    assert sorted(data["name"] for data in deep.values) == ["dragon", "goblin"]
+    assert spawn_table.for_level(1) is shallow
+    assert SpawnTable.from_enemies({}).for_level(1) is None
+
+
+def test_item_spawn_table_balances_categories_and_skips_treasure():
+    """アイテムのカテゴリが同じ割合で選ばれ、宝物が含まれないことをテストする"""
+    item_data = {
+        "potions": {"a": {"name": "a"}, "b": {"name": "b"}, "c": {"name": "c"}},
+        "weapons": {"d": {"name": "d"}},
+        "treasure": {"amulet_of_yendor": {"name": "amulet"}},
+    }
+    table = SpawnTable.from_items(item_data).for_level(1)
+    rng = random.Random(2)
+
+    counts = Counter(table.sample(rng)["name"] for _ in range(20000))
+
+    assert "amulet" not in counts
+    assert counts["d"] / 20000 == pytest.approx(0.5, abs=0.02)
+
+
+def test_strong_enemies_do_not_appear_on_first_floor():
+    """ゲームのデータで、1階には強い敵が出現しないことをテストする"""
+    enemy_data = load_json_data("assets/enemies.json")
+    spawn_table = SpawnTable.from_enemies(enemy_data)
+
+    first_floor = {data["name"] for data in spawn_table.for_level(1).values}
+    last_floor = {data["name"] for data in spawn_table.for_level(20).values}
+
+    assert enemy_data["dragon"]["name"] not in first_floor
+    assert enemy_data["goblin"]["name"] in first_floor
+    assert last_floor == {data["name"] for data in enemy_data.values()}
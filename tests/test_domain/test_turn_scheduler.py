@@ -0,0 +1,75 @@
+# tests/test_domain/test_turn_scheduler.py
+"""
+速さに基づく行動順のスケジューラのテスト
+"""
+
+from collections import Counter
+
+from roguelike_rpg.domain.turn_scheduler import (
+    ACTION_COST,
+    NORMAL_SPEED,
+    TurnScheduler,
+    action_delay,
+)
+
+
+def _run(scheduler, speeds, until):
+    """時刻 until まで行動させ、アクターごとの行動回数を返す"""
+    acted = Counter()
+    while actors := scheduler.pop_due(until):
+        for actor in actors:
+            acted[actor] += 1
+            scheduler.schedule(actor, action_delay(speeds[actor]))
+    return acted
+
+
+def test_action_delay_scales_inversely_with_speed():
+    """速さが2倍なら行動の間隔は半分になることをテストする"""
+    assert action_delay(NORMAL_SPEED) == ACTION_COST
+    assert action_delay(NORMAL_SPEED * 2) == ACTION_COST // 2
+    assert action_delay(NORMAL_SPEED // 2) == ACTION_COST * 2
+    # 速さが0以下でも時刻は必ず進む
+    assert action_delay(0) >= 1
+    assert action_delay(10**9) == 1
+
+
+def test_mixed_speeds_act_at_their_own_rates():
+    """速さの異なるアクターが、それぞれの頻度で行動することをテストする"""
+    scheduler = TurnScheduler()
+    speeds = {"bat": 200, "goblin": 100, "golem": 50}
+    for actor, speed in speeds.items():
+        scheduler.schedule(actor, action_delay(speed))
+
+    acted = _run(scheduler, speeds, until=ACTION_COST * 10)
+
+    assert acted == {"bat": 20, "goblin": 10, "golem": 5}
+    assert scheduler.time == ACTION_COST * 10
+    assert scheduler.visits == 35
+
+
+def test_pop_due_returns_actors_in_time_order():
+    """同じ時刻のアクターがまとめて、時刻の順に取り出されることをテストする"""
+    scheduler = TurnScheduler()
+    scheduler.schedule("slow", 30)
+    scheduler.schedule("a", 10)
+    scheduler.schedule("b", 10)
+
+    assert scheduler.pop_due(5) == []
+    assert scheduler.pop_due(100) == ["a", "b"]
+    assert scheduler.time == 10
+    assert scheduler.pop_due(100) == ["slow"]
+    assert len(scheduler) == 0
+
+
+def test_removed_and_rescheduled_actors_are_not_duplicated():
+    """登録の取り消しや再登録の後に、古い項目が取り出されないことをテストする"""
+    scheduler = TurnScheduler()
+    scheduler.schedule("a", 10)
+    scheduler.schedule("b", 10)
+    scheduler.remove("a")
+    scheduler.schedule("b", 20)
+
+    assert "a" not in scheduler
+    assert scheduler.next_time() == 20
+    assert scheduler.pop_due(100) == ["b"]
+    assert scheduler.pop_due(100) == []
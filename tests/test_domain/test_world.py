@@ -0,0 +1,395 @@
+"""
+ECSワールドのテスト
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from roguelike_rpg.domain.ecs.components import (
+    EnemyComponent,
+    HealthComponent,
+    NameComponent,
+    PositionComponent,
+)
+from roguelike_rpg.domain.ecs.entity import entity_index
+from roguelike_rpg.domain.ecs.storage import StorageMode
+from roguelike_rpg.domain.ecs.world import World
+
+
+@pytest.fixture(
+    params=[(mode, cache, False) for mode in StorageMode for cache in (True, False)]
+    + [(mode, True, True) for mode in StorageMode]
+)
+def world(request) -> World:
+    """すべての格納方式と設定の組み合わせでテストするためのワールドを返すフィクスチャ"""
+    storage_mode, cache_queries, columnar = request.param
+    return World(
+        storage_mode=storage_mode, cache_queries=cache_queries, columnar=columnar
+    )
+
+
+def test_add_and_get_component(world: World):
+    entity = world.create_entity(PositionComponent(x=1, y=2))
+    pos = world.get_component(entity, PositionComponent)
+    assert pos.x == 1 and pos.y == 2
+    assert world.get_component(entity, HealthComponent) is None
+
+
+def test_add_component_replaces_existing(world: World):
+    entity = world.create_entity(PositionComponent(x=1, y=2))
+    world.add_component(entity, PositionComponent(x=3, y=4))
+    assert world.get_component(entity, PositionComponent).x == 3
+
+
+def test_remove_component_keeps_other_components(world: World):
+    entity = world.create_entity(
+        PositionComponent(x=1, y=2), NameComponent(name="ゴブリン")
+    )
+    world.remove_component(entity, PositionComponent)
+    assert world.get_component(entity, PositionComponent) is None
+    assert world.get_component(entity, NameComponent).name == "ゴブリン"
+    assert list(world.get_entities_with(PositionComponent)) == []
+
+
+def test_delete_entity_removes_all_components(world: World):
+    entity = world.create_entity(PositionComponent(x=1, y=2), EnemyComponent())
+    other = world.create_entity(PositionComponent(x=5, y=5), EnemyComponent())
+    world.delete_entity(entity)
+    assert world.get_component(entity, PositionComponent) is None
+    assert world.get_component(entity, EnemyComponent) is None
+    # 同じアーキタイプに属する他のエンティティは影響を受けない
+    assert world.get_component(other, PositionComponent).x == 5
+
+
+def test_get_entities_with_multiple_types(world: World):
+    enemy = world.create_entity(PositionComponent(x=0, y=0), EnemyComponent())
+    world.create_entity(PositionComponent(x=1, y=1))
+    world.create_entity(EnemyComponent())
+    enemy_with_hp = world.create_entity(
+        PositionComponent(x=2, y=2),
+        EnemyComponent(),
+        HealthComponent(max_hp=5, current_hp=5),
+    )
+    found = set(world.get_entities_with(PositionComponent, EnemyComponent))
+    assert found == {enemy, enemy_with_hp}
+    assert list(world.get_entities_with()) == []
+
+
+def test_get_entities_with_tolerates_deletion_during_iteration(world: World):
+    entities = [
+        world.create_entity(PositionComponent(x=i, y=0), EnemyComponent())
+        for i in range(10)
+    ]
+    visited = []
+    for entity in world.get_entities_with(PositionComponent, EnemyComponent):
+        visited.append(entity)
+        world.delete_entity(entity)
+    assert sorted(visited) == entities
+    assert list(world.get_entities_with(EnemyComponent)) == []
+
+
+def test_view_is_updated_incrementally(world: World):
+    view = world.view(PositionComponent, EnemyComponent)
+    enemy = world.create_entity(PositionComponent(x=0, y=0))
+    assert enemy not in view
+
+    world.add_component(enemy, EnemyComponent())
+    assert enemy in view and len(view) == 1
+
+    world.remove_component(enemy, PositionComponent)
+    assert enemy not in view
+
+    world.add_component(enemy, PositionComponent(x=1, y=1))
+    assert enemy in view
+    world.delete_entity(enemy)
+    assert len(view) == 0
+
+
+def test_view_is_shared_between_queries(world: World):
+    world.create_entity(PositionComponent(x=0, y=0), EnemyComponent())
+    assert world.view(EnemyComponent, PositionComponent) is world.view(
+        PositionComponent, EnemyComponent
+    )
+
+
+def test_view_iteration_tolerates_structural_changes(world: World):
+    entities = [
+        world.create_entity(HealthComponent(max_hp=1, current_hp=0)) for _ in range(5)
+    ]
+    view = world.view(HealthComponent)
+    visited = []
+    for entity in view:
+        visited.append(entity)
+        world.delete_entity(entity)
+        # 走査中に追加されたエンティティは、現在の走査には現れない
+        world.create_entity(HealthComponent(max_hp=1, current_hp=1))
+    assert sorted(visited) == entities
+    assert len(view) == 5
+    assert not any(entity in view for entity in entities)
+
+
+def test_gather_collects_field_values(world: World):
+    entities = [
+        world.create_entity(
+            PositionComponent(x=i, y=i * 2), HealthComponent(max_hp=9, current_hp=i)
+        )
+        for i in range(5)
+    ]
+    reordered = entities[::-1]
+    assert list(world.gather(reordered, PositionComponent, "y")) == [8, 6, 4, 2, 0]
+    assert list(world.gather(reordered, HealthComponent, "current_hp")) == [
+        4,
+        3,
+        2,
+        1,
+        0,
+    ]
+
+
+def test_columnar_proxy_reads_and_writes_arrays():
+    world = World(columnar=True)
+    enemy = world.create_entity(
+        PositionComponent(x=3, y=4), HealthComponent(max_hp=10, current_hp=10)
+    )
+    health = world.get_component(enemy, HealthComponent)
+    assert isinstance(health, HealthComponent)
+    assert health.max_hp == 10 and health.current_hp == 10
+
+    # プロキシへの書き込みは配列に反映される
+    health.current_hp -= 4
+    slot = world.columns.slot_of(enemy)
+    assert world.columns.column(HealthComponent, "current_hp")[slot] == 6
+
+    # 配列への一括書き込みはプロキシから読める
+    slots = world.columns.slots([enemy])
+    world.columns.column(PositionComponent, "x")[slots] += 1
+    assert world.get_component(enemy, PositionComponent).x == 4
+
+
+def test_columnar_proxy_keeps_values_after_removal():
+    world = World(columnar=True)
+    enemy = world.create_entity(HealthComponent(max_hp=10, current_hp=7))
+    health = world.get_component(enemy, HealthComponent)
+    world.delete_entity(enemy)
+    assert not world.columns.present[HealthComponent].any()
+
+    # 同じスロットを別のエンティティが使っても、取り外し済みの値は変わらない
+    world.columns.attach(enemy, HealthComponent(max_hp=1, current_hp=1))
+    assert health.current_hp == 7
+    assert np.count_nonzero(world.columns.present[HealthComponent]) == 1
+
+
+@pytest.mark.parametrize("storage_mode", list(StorageMode))
+def test_columnar_proxy_can_be_added_to_another_entity(storage_mode):
+    world = World(storage_mode=storage_mode, columnar=True)
+    source = world.create_entity(PositionComponent(x=1, y=2))
+    target = world.create_entity()
+    proxy = world.get_component(source, PositionComponent)
+    world.add_component(target, proxy)
+
+    assert world.component_types(target) == {PositionComponent}
+    copied = world.get_component(target, PositionComponent)
+    assert (copied.x, copied.y) == (1, 2)
+    assert set(world.entities_at(1, 2)) == {source, target}
+
+    # 追加した先の値は、元のエンティティの値と連動しない
+    copied.x = 5
+    assert world.get_component(source, PositionComponent).x == 1
+
+    # 取り外されたプロキシも、元の型として追加し直せる
+    world.remove_component(source, PositionComponent)
+    world.add_component(source, proxy)
+    assert world.component_types(source) == {PositionComponent}
+    assert world.get_component(source, PositionComponent) == PositionComponent(1, 2)
+
+
+def test_columnar_proxy_compares_by_value():
+    world = World(columnar=True)
+    enemy = world.create_entity(
+        PositionComponent(x=1, y=2), HealthComponent(max_hp=10, current_hp=7)
+    )
+    pos = world.get_component(enemy, PositionComponent)
+    health = world.get_component(enemy, HealthComponent)
+
+    assert pos == PositionComponent(1, 2)
+    assert PositionComponent(1, 2) == pos
+    assert pos != PositionComponent(1, 3)
+    assert health == HealthComponent(max_hp=10, current_hp=7)
+    assert pos != HealthComponent(max_hp=1, current_hp=2)
+
+    world.delete_entity(enemy)
+    assert pos == PositionComponent(1, 2)
+
+
+def test_delete_entities_removes_all_in_one_call(world: World):
+    view = world.view(PositionComponent, EnemyComponent)
+    doomed = [
+        world.create_entity(PositionComponent(x=i, y=0), EnemyComponent())
+        for i in range(8)
+    ]
+    survivor = world.create_entity(PositionComponent(x=9, y=9), EnemyComponent())
+    world.delete_entities(doomed)
+
+    assert list(world.get_entities_with(PositionComponent)) == [survivor]
+    assert list(view) == [survivor]
+    assert world.get_component(survivor, PositionComponent).x == 9
+    for entity in doomed:
+        assert world.component_types(entity) == frozenset()
+
+
+def test_component_introspection(world: World):
+    entity = world.create_entity(PositionComponent(x=1, y=1), EnemyComponent())
+    assert world.component_types(entity) == {PositionComponent, EnemyComponent}
+    assert world.has_any(entity, HealthComponent, EnemyComponent)
+    assert not world.has_any(entity, HealthComponent, NameComponent)
+
+    components = world.components_of(entity)
+    assert set(components) == {PositionComponent, EnemyComponent}
+    assert components[PositionComponent].x == 1
+
+    world.remove_component(entity, EnemyComponent)
+    assert world.component_types(entity) == {PositionComponent}
+
+
+def test_deleted_entity_ids_are_recycled_with_new_generation(world: World):
+    first = world.create_entity(PositionComponent(x=1, y=1))
+    world.delete_entity(first)
+    second = world.create_entity(PositionComponent(x=2, y=2))
+
+    assert entity_index(second) == entity_index(first)
+    assert second != first
+    assert not world.is_alive(first)
+    assert world.is_alive(second)
+
+    # 古いハンドルからは新しいエンティティのコンポーネントが見えない
+    assert world.get_component(first, PositionComponent) is None
+    # 古いハンドルの削除は新しいエンティティに影響しない
+    world.delete_entity(first)
+    world.delete_entities([first])
+    assert world.get_component(second, PositionComponent).x == 2
+
+
+def test_adding_components_to_deleted_entity_is_ignored(world: World):
+    view = world.view(HealthComponent)
+    stale = world.create_entity(PositionComponent(x=1, y=1))
+    world.delete_entity(stale)
+
+    world.add_component(stale, HealthComponent(max_hp=5, current_hp=5))
+    world.add_components(stale, PositionComponent(x=2, y=2), EnemyComponent())
+
+    assert list(world.get_entities_with(HealthComponent)) == []
+    assert list(view) == []
+    assert world.component_types(stale) == frozenset()
+    assert world.entities_at(2, 2) == ()
+
+    # インデックスは再利用され、新しいエンティティには古いハンドルの追加が残らない
+    fresh = world.create_entity(NameComponent(name="fresh"))
+    assert entity_index(fresh) == entity_index(stale)
+    assert world.component_types(fresh) == {NameComponent}
+
+
+def test_entity_indices_stay_compact(world: World):
+    for _ in range(20):
+        entities = [world.create_entity(EnemyComponent()) for _ in range(10)]
+        world.delete_entities(entities)
+    survivors = [world.create_entity(EnemyComponent()) for _ in range(10)]
+    assert max(entity_index(e) for e in survivors) < 10
+
+
+def test_query_yields_entity_and_component_tuples(world: World):
+    enemy = world.create_entity(
+        PositionComponent(x=1, y=2),
+        EnemyComponent(),
+        HealthComponent(max_hp=5, current_hp=4),
+    )
+    world.create_entity(PositionComponent(x=3, y=3))
+
+    rows = list(world.query(PositionComponent, HealthComponent))
+    assert len(rows) == 1
+    entity, pos, health = rows[0]
+    assert entity == enemy
+    assert (pos.x, pos.y, health.current_hp) == (1, 2, 4)
+    assert pos is world.get_component(enemy, PositionComponent)
+    assert list(world.query()) == []
+
+
+def test_query_tolerates_deletion_during_iteration(world: World):
+    for i in range(6):
+        world.create_entity(PositionComponent(x=i, y=0), EnemyComponent())
+    visited = 0
+    for entity, pos, _ in world.query(PositionComponent, EnemyComponent):
+        visited += 1
+        world.delete_entity(entity)
+    assert visited == 6
+    assert list(world.query(PositionComponent)) == []
+
+
+def test_spatial_index_follows_position_changes(world: World):
+    enemy = world.create_entity(PositionComponent(x=1, y=1), EnemyComponent())
+    item = world.create_entity(PositionComponent(x=1, y=1))
+    assert set(world.entities_at(1, 1)) == {enemy, item}
+
+    # コンポーネントの座標を直接変更しても索引に反映される
+    pos = world.get_component(enemy, PositionComponent)
+    pos.x, pos.y = 4, 5
+    assert world.entities_at(1, 1) == (item,)
+    assert world.entities_at(4, 5) == (enemy,)
+
+    world.remove_component(item, PositionComponent)
+    assert world.entities_at(1, 1) == ()
+
+    world.add_component(enemy, PositionComponent(x=7, y=7))
+    assert world.entities_at(4, 5) == ()
+    assert world.entities_at(7, 7) == (enemy,)
+    # 置き換えられた古いコンポーネントの変更は索引に影響しない
+    pos.x = 0
+    assert world.entities_at(0, 5) == ()
+
+    world.delete_entity(enemy)
+    assert world.entities_at(7, 7) == ()
+    assert len(world.spatial) == 0
+
+
+def test_shared_position_instance_tracks_each_entity(world: World):
+    shared = PositionComponent(x=0, y=0)
+    first = world.create_entity(shared)
+    second = world.create_entity(shared)
+    assert set(world.entities_at(0, 0)) == {first, second}
+
+    first_pos = world.get_component(first, PositionComponent)
+    second_pos = world.get_component(second, PositionComponent)
+    assert first_pos is not second_pos
+    second_pos.x, second_pos.y = 3, 3
+    assert world.entities_at(0, 0) == (first,)
+    assert world.entities_at(3, 3) == (second,)
+
+    # 複製した位置は通知先を引き継がず、変更しても索引に影響しない
+    clone = copy.copy(first_pos)
+    clone.x = 9
+    assert world.entities_at(0, 0) == (first,)
+    assert world.entities_at(9, 0) == ()
+
+    # 取り外された位置は通知をやめ、別のエンティティに追加し直せる
+    world.remove_component(first, PositionComponent)
+    first_pos.x = 5
+    assert world.entities_at(5, 0) == ()
+    if world.columns is None:
+        assert first_pos._on_move is None
+    world.add_component(second, first_pos)
+    assert world.entities_at(5, 0) == (second,)
+    assert world.entities_at(3, 3) == ()
+
+
+def test_entities_in_radius(world: World):
+    for x in range(10):
+        for y in range(10):
+            world.create_entity(PositionComponent(x=x, y=y))
+    center = world.entities_at(5, 5)[0]
+
+    near = world.entities_in_radius(5, 5, 1)
+    assert len(near) == 5  # 中心と上下左右
+    assert center in near
+    assert len(world.entities_in_radius(5, 5, 1.5)) == 9
+    assert len(world.entities_in_radius(0, 0, 100)) == 100